@@ -0,0 +1,56 @@
+"""Denormalize channel_id onto chunks.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-12-29
+
+A chunk's channel is fixed by its episode, so storing it on the row lets
+keyword search select and filter by channel without joining episodes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = "005"
+down_revision = "004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "chunks",
+        sa.Column("channel_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+
+    # Backfill from the owning episode
+    op.execute("""
+        UPDATE chunks
+        SET channel_id = e.channel_id
+        FROM episodes e
+        WHERE chunks.episode_id = e.id
+    """)
+
+    op.alter_column("chunks", "channel_id", nullable=False)
+    op.create_foreign_key(
+        "fk_chunks_channel_id",
+        "chunks",
+        "channels",
+        ["channel_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        "idx_chunks_channel",
+        "chunks",
+        ["channel_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_chunks_channel", table_name="chunks", if_exists=True)
+    op.drop_constraint("fk_chunks_channel_id", "chunks", type_="foreignkey")
+    op.drop_column("chunks", "channel_id")
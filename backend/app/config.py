@@ -16,6 +16,12 @@ class Settings(BaseSettings):
         """
         errors = []
 
+        # The webhook rejects every delivery without one
+        if self.DEEPGRAM_CALLBACK_URL and not self.DEEPGRAM_CALLBACK_SECRET:
+            errors.append(
+                "DEEPGRAM_CALLBACK_SECRET must be set when DEEPGRAM_CALLBACK_URL is"
+            )
+
         if self.ENVIRONMENT == "production":
             # Check admin secret is not default
             if self.ADMIN_SECRET == "change-me-in-production":
@@ -47,10 +53,13 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str | None = None
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     EMBEDDING_DIMENSIONS: int = 1536
+    QUERY_EMBEDDING_LRU_SIZE: int = 4096  # in-process cache of query vectors
+    QUERY_EMBEDDING_BLOOM_REFRESH: int = 300  # re-SCAN key filter (s); 0 = off
 
     # Anthropic (optional for testing, required for production)
     ANTHROPIC_API_KEY: str | None = None
     ANTHROPIC_MODEL: str = "claude-sonnet-4-20250514"
+    ANTHROPIC_MODEL_SPEAKER_ID: str = "claude-3-5-haiku-20241022"  # cheap + fast
 
     # Transcription - AssemblyAI
     ASSEMBLYAI_API_KEY: str | None = None
@@ -59,6 +68,9 @@ class Settings(BaseSettings):
     # Transcription - Deepgram
     DEEPGRAM_API_KEY: str | None = None
     DEEPGRAM_MAX_CONCURRENT: int = 50
+    # Public URL of /api/webhooks/deepgram; enables callback mode when set
+    DEEPGRAM_CALLBACK_URL: str | None = None
+    DEEPGRAM_CALLBACK_SECRET: str | None = None
 
     # Transcription - Whisper (original OpenAI)
     WHISPER_MODEL: str = "large-v3"
@@ -72,11 +84,14 @@ class Settings(BaseSettings):
         "auto"  # "auto", "float16", "int8", "int8_float16"
     )
     FASTER_WHISPER_MAX_CONCURRENT: int = 2
+    FASTER_WHISPER_BATCH_SIZE: int = 16  # batched GPU inference (0 = sequential)
+    FASTER_WHISPER_BEAM_SIZE: int = 1  # 1 = fast (greedy), 5 = accurate
 
     # Transcription - Modal Cloud (serverless GPU)
     MODAL_WHISPER_MODEL: str = "large-v3"
     MODAL_GPU_TYPE: str = "A10G"  # T4, A10G, A100
     MODAL_MAX_CONCURRENT: int = 10
+    MODAL_COMPUTE_TYPE: str = "int8_float16"  # "int8_float16" or "float16"
 
     # HuggingFace (for pyannote diarization)
     HF_TOKEN: str | None = None
@@ -85,6 +100,8 @@ class Settings(BaseSettings):
     DEFAULT_TRANSCRIPTION_PROVIDER: Literal[
         "assemblyai", "deepgram", "whisper", "faster-whisper", "modal-cloud"
     ] = "assemblyai"
+    # Load the default provider's local model (faster-whisper) at API startup
+    TRANSCRIPTION_WARMUP: bool = True
 
     # Application
     ENVIRONMENT: Literal["development", "production"] = "development"
@@ -123,6 +140,24 @@ class Settings(BaseSettings):
     CHUNK_SIZE: int = 500  # words
     CHUNK_OVERLAP: int = 50  # words
 
+    # Hybrid search
+    SEARCH_SQL_FUSION: bool = False  # Fuse rankings in Postgres, not Python
+    ENRICHMENT_CACHE_SIZE: int = 10_000  # episodes/channels kept in-process
+    ENRICHMENT_CACHE_TTL: int = 300  # seconds
+
+    # RAG chat
+    RAG_SEMANTIC_CACHE: bool = True  # Reuse answers to paraphrased questions
+    RAG_SEMANTIC_CACHE_THRESHOLD: float = 0.9  # Min cosine similarity for a hit
+
+    # Re-ranking
+    RERANKER_USE_ONNX: bool = True  # int8 ONNX cross-encoder when available
+    RERANKER_ONNX_DIR: str = "/app/data/models/reranker"
+    RERANKER_MAX_LENGTH: int = 256  # tokens per (query, chunk) pair
+    RERANKER_THREADS: int = 0  # inference threads (0 = runtime default)
+    RERANKER_WARMUP: bool = True  # load + prime the model at API startup
+    RERANKER_SKIP_GAP: float = 0.15  # skip when top cosine leads runner-up by this
+    RERANKER_MAX_BATCH: int = 32  # pairs coalesced across concurrent requests
+
     # Paths
     TRANSCRIPTS_DIR: str = "/app/data/transcripts"
     AUDIO_DIR: str = "/app/data/audio"
@@ -1,8 +1,10 @@
 import uuid as uuid_module
-from sqlalchemy import create_engine, TypeDecorator, CHAR
+import orjson
+from sqlalchemy import create_engine, TypeDecorator, CHAR, Text, Computed
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, TSVECTOR
 from app.config import settings
 
 
@@ -45,11 +47,39 @@ class GUID(TypeDecorator):
             return uuid_module.UUID(value)
 
 
+class TSVector(TypeDecorator):
+    """Platform-independent tsvector type.
+
+    Uses PostgreSQL's TSVECTOR natively, and TEXT for other databases so
+    models with full-text search columns can still be created in SQLite.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(TSVECTOR())
+        return dialect.type_descriptor(Text())
+
+
+@compiles(Computed, "sqlite")
+def _compile_computed_sqlite(element, compiler, **kw):
+    """Skip generated column expressions in SQLite (no Postgres FTS functions)."""
+    return ""
+
+
 # Convert postgresql:// to postgresql+asyncpg:// for async
 ASYNC_DATABASE_URL = settings.DATABASE_URL.replace(
     "postgresql://", "postgresql+asyncpg://"
 )
 
+
+def _json_dumps(value) -> str:
+    # Non-str keys are stringified, as the stdlib json serializer does
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Async engine for FastAPI
 # Pool size must accommodate batch concurrency + API requests
 async_engine = create_async_engine(
@@ -59,6 +89,8 @@ async_engine = create_async_engine(
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verify connections are alive
     pool_recycle=3600,  # Recycle connections after 1 hour
+    # JSON columns hold whole provider responses (Episode.transcript_raw)
+    json_serializer=_json_dumps,
 )
 
 # Async session factory
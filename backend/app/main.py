@@ -1,5 +1,7 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 import sys
@@ -7,6 +9,10 @@ import sys
 from app.config import settings
 from app.database import init_db
 from app.routers import api_router
+from app.services.cache import QueryEmbeddingCache
+from app.services.reranker import RerankerService
+from app.services.transcription import prewarm_provider
+from app.services.transcription.base import close_http_clients
 from app.services.vector_store import VectorStoreService
 from app.services.websocket_manager import manager as ws_manager
 from app.middleware.request_id import RequestIDMiddleware
@@ -49,14 +55,41 @@ async def lifespan(app: FastAPI):
     await vector_store.ensure_collection()
     logger.info("Vector store initialized")
 
+    # Seed the query embedding key filter so cold lookups skip Redis, and
+    # re-seed it periodically to pick up keys other workers wrote
+    bloom_task = None
+    if settings.REDIS_URL and settings.QUERY_EMBEDDING_BLOOM_REFRESH > 0:
+        await QueryEmbeddingCache.warm_bloom()
+        bloom_task = asyncio.create_task(
+            QueryEmbeddingCache.refresh_bloom(settings.QUERY_EMBEDDING_BLOOM_REFRESH)
+        )
+
+    # Load the shared cross-encoder so the first search doesn't pay for it
+    if settings.RERANKER_WARMUP:
+        await RerankerService.warmup()
+
+    # Load a local transcription model in the background: it can take
+    # tens of seconds, and in-process batch jobs wait on the same instance
+    prewarm_task = None
+    if settings.TRANSCRIPTION_WARMUP:
+        prewarm_task = asyncio.create_task(prewarm_provider())
+
     # Start WebSocket pubsub listener
     await ws_manager.start_pubsub_listener()
     logger.info("WebSocket manager initialized")
 
     yield
 
+    if prewarm_task and not prewarm_task.done():
+        prewarm_task.cancel()
+    if bloom_task:
+        bloom_task.cancel()
+
     # Stop WebSocket pubsub listener
     await ws_manager.stop_pubsub_listener()
+
+    # Close pooled provider connections used by in-process batch jobs
+    await close_http_clients()
     logger.info("Shutting down Podcast Search API...")
 
 
@@ -65,6 +98,9 @@ app = FastAPI(
     description="API for searching and chatting with podcast transcripts",
     version="1.0.0",
     lifespan=lifespan,
+    # Transcripts and search results are large; orjson encodes them several
+    # times faster than the stdlib json FastAPI uses by default
+    default_response_class=ORJSONResponse,
 )
 
 # Request ID middleware - must be added first (outermost)
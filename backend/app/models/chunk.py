@@ -1,9 +1,19 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    JSON,
+    Computed,
+)
+from sqlalchemy.orm import relationship, deferred
 
-from app.database import Base, GUID
+from app.database import Base, GUID, TSVector
 
 
 class Chunk(Base):
@@ -13,6 +23,10 @@ class Chunk(Base):
     episode_id = Column(
         GUID(), ForeignKey("episodes.id", ondelete="CASCADE"), nullable=False
     )
+    # Denormalized from the episode so search can filter without a join
+    channel_id = Column(
+        GUID(), ForeignKey("channels.id", ondelete="CASCADE"), nullable=False
+    )
 
     # Link to vector store
     qdrant_point_id = Column(GUID(), nullable=False, index=True)
@@ -20,6 +34,15 @@ class Chunk(Base):
     # Content
     text = Column(Text, nullable=False)
 
+    # Full-text search vector, generated by Postgres at write time
+    # (added in migration 002, indexed by idx_chunks_text_search)
+    text_search_vector = deferred(
+        Column(
+            TSVector(),
+            Computed("to_tsvector('english', COALESCE(text, ''))", persisted=True),
+        )
+    )
+
     # Speaker info
     primary_speaker = Column(String(200), nullable=True, index=True)
     speakers = Column(JSON, default=list)  # List of speaker names
@@ -41,8 +64,10 @@ class Chunk(Base):
     # Indexes
     __table_args__ = (
         Index("idx_chunks_episode", "episode_id"),
+        Index("idx_chunks_channel", "channel_id"),
         Index("idx_chunks_speaker", "primary_speaker"),
         Index("idx_chunks_qdrant", "qdrant_point_id"),
+        Index("idx_chunks_text_search", "text_search_vector", postgresql_using="gin"),
     )
 
     def __repr__(self):
@@ -10,6 +10,7 @@ from app.routers import (
     providers,
     websocket,
     settings,
+    webhooks,
 )
 
 api_router = APIRouter()
@@ -22,4 +23,5 @@ api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(chat.router, prefix="/chat", tags=["chat"])
 api_router.include_router(providers.router, prefix="/providers", tags=["providers"])
 api_router.include_router(settings.router, prefix="/settings", tags=["settings"])
+api_router.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 api_router.include_router(websocket.router, tags=["websocket"])
@@ -16,6 +16,7 @@ from app.schemas.channel import (
     ChannelFetchResponse,
     EpisodePreview,
 )
+from app.services.search_enrichment import SearchEnrichmentService
 from app.services.youtube import YouTubeService
 
 
@@ -331,6 +332,9 @@ async def update_channel(
     await db.commit()
     await db.refresh(channel)
 
+    # Search results show the channel name from the enrichment cache
+    SearchEnrichmentService.evict(channel_id=channel_id)
+
     return ChannelResponse.model_validate(channel)
 
 
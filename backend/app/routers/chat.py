@@ -1,5 +1,9 @@
+import json
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 
+from app.database import AsyncSessionLocal
 from app.dependencies import DB
 from app.schemas.chat import ChatRequest, ChatResponse
 from app.services.search import SearchService
@@ -53,6 +57,48 @@ async def chat(
     return response
 
 
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    RAG-powered chat, streamed as Server-Sent Events.
+
+    Takes the same body as POST /chat. Emits a `delta` event per chunk of
+    answer text as Claude generates it, then a single `done` event carrying
+    the full ChatResponse (answer, citations, timing). Disconnecting stops
+    the generation.
+    """
+    filters = request.filters
+
+    async def events():
+        # The search runs while the body streams, after request-scoped
+        # dependencies (get_db included) have been torn down, so the
+        # stream opens and owns its session
+        async with AsyncSessionLocal() as db:
+            search_service = SearchService(
+                db=db,
+                embedding_service=EmbeddingService(),
+                vector_store=VectorStoreService(),
+            )
+            rag_service = RAGService(search_service=search_service)
+
+            async for event in rag_service.chat_stream(
+                message=request.message,
+                conversation_id=request.conversation_id,
+                speaker=filters.speaker if filters else None,
+                channel_id=filters.channel_id if filters else None,
+                channel_slug=filters.channel_slug if filters else None,
+                date_from=filters.date_from if filters else None,
+                date_to=filters.date_to if filters else None,
+                max_context_chunks=request.max_context_chunks,
+            ):
+                if isinstance(event, str):
+                    yield f"event: delta\ndata: {json.dumps({'text': event})}\n\n"
+                else:
+                    yield f"event: done\ndata: {event.model_dump_json()}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.post("/simple")
 async def simple_chat(
     message: str,
@@ -0,0 +1,47 @@
+import secrets
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from loguru import logger
+
+from app.config import settings
+from app.services.transcription.deepgram import DeepgramProvider
+
+router = APIRouter()
+
+
+@router.post("/deepgram", status_code=status.HTTP_204_NO_CONTENT)
+async def deepgram_callback(request: Request, token: str = Query(default="")):
+    """
+    Receive a finished transcript from Deepgram's callback mode.
+
+    The body is stored as-is for the waiting worker to parse; only the
+    request_id is read here.
+    """
+    if not settings.DEEPGRAM_CALLBACK_URL:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Callbacks disabled"
+        )
+
+    expected = settings.DEEPGRAM_CALLBACK_SECRET
+    if not expected:
+        # Without a secret anyone could plant a transcript under any job
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Callback secret not configured",
+        )
+    if not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+
+    body = await request.body()
+    try:
+        request_id = orjson.loads(body)["metadata"]["request_id"]
+    except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Missing request_id"
+        ) from e
+
+    await DeepgramProvider.store_callback(request_id, body)
+    logger.info(f"Deepgram callback stored: {request_id}")
@@ -2,6 +2,16 @@ from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, Field
 
+# Citation snippets show at most this many characters of a chunk
+TEXT_PREVIEW_CHARS = 500
+
+
+def text_preview(text: str) -> str:
+    """Citation-length preview of chunk text."""
+    if len(text) > TEXT_PREVIEW_CHARS:
+        return text[:TEXT_PREVIEW_CHARS] + "..."
+    return text
+
 
 class SearchFilters(BaseModel):
     speaker: str | None = None
@@ -58,6 +68,8 @@ class SearchResult(BaseModel):
     score: float
     context_before: list[ContextUtterance] = []
     context_after: list[ContextUtterance] = []
+    # Precomputed at ingest for citations; internal, not part of the API
+    text_preview: str | None = Field(default=None, exclude=True)
 
 
 class SearchResponse(BaseModel):
@@ -1,9 +1,14 @@
 """Redis caching service with retry logic."""
 
 import json
+import math
+import time
+import base64
 import hashlib
 import asyncio
+from collections import OrderedDict
 from typing import Any, Optional
+import numpy as np
 from loguru import logger
 import redis.asyncio as redis
 
@@ -25,6 +30,86 @@ async def _retry_redis(func, max_retries: int = 2, delay: float = 0.5):
     raise last_error
 
 
+class BloomFilter:
+    """
+    Fixed-size in-process bloom filter over string keys.
+
+    Answers "definitely absent" or "maybe present"; sized from the expected
+    capacity and target false-positive rate. Uses double hashing over one
+    blake2b digest to derive the bit positions.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key: str) -> None:
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TTLCache:
+    """
+    Bounded in-process cache whose entries expire ``ttl`` seconds after
+    being set. Evicts the oldest entry once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._data.pop(key, None)
+        while len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_MISSING = object()
+
+
 class CacheService:
     """Redis-based caching for embeddings and search results."""
 
@@ -78,6 +163,15 @@ class CacheService:
             logger.warning(f"Cache delete error: {e}")
             return False
 
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer counter."""
+        try:
+            r = await self._get_redis()
+            return await r.incr(key)
+        except Exception as e:
+            logger.warning(f"Cache incr error: {e}")
+            return None
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         try:
@@ -200,6 +294,154 @@ class EmbeddingCache:
             return 0
 
 
+class QueryEmbeddingCache(EmbeddingCache):
+    """
+    Compact cache for search query embeddings.
+
+    Vectors are stored int8-quantized with a per-vector scale (symmetric
+    quantization), base64-encoded: ~2 KB per 1536-d vector instead of
+    ~30 KB of JSON floats. The precision loss is negligible for ranking
+    query vectors against the collection, but too lossy for stored chunk
+    embeddings, which keep using EmbeddingCache.
+    """
+
+    def __init__(self, cache: CacheService = None):
+        super().__init__(cache)
+        self.prefix = "qemb"
+        self.ttl = 86400  # 1 day
+
+    @staticmethod
+    def _encode(embedding: list[float]) -> str:
+        """Quantize to int8 and pack as base64(float32 scale + int8 values)."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        max_abs = float(np.abs(vec).max()) if vec.size else 0.0
+        scale = np.float32(max_abs / 127.0 if max_abs else 1.0)
+        quantized = np.round(vec / scale).astype(np.int8)
+        return base64.b64encode(scale.tobytes() + quantized.tobytes()).decode("ascii")
+
+    @staticmethod
+    def _decode(payload: str) -> list[float]:
+        """Unpack and dequantize a payload produced by _encode."""
+        raw = base64.b64decode(payload)
+        scale = np.frombuffer(raw[:4], dtype=np.float32)[0]
+        quantized = np.frombuffer(raw[4:], dtype=np.int8)
+        return (quantized.astype(np.float32) * scale).tolist()
+
+    # Process-wide filter of query keys known to be in Redis. Until it has
+    # been warmed from Redis (warm_bloom), lookups always go to Redis. Keys
+    # written by other workers and replicas only show up at the next
+    # refresh, so without one the filter would hide them for good.
+    _bloom: Optional[BloomFilter] = None
+    _bloom_ready = False
+    _bloom_building: Optional[BloomFilter] = None
+
+    @classmethod
+    async def warm_bloom(cls, cache: CacheService = None) -> int:
+        """Build the key filter from a SCAN of existing query embeddings."""
+        cache = cache or CacheService()
+        # Keys set locally during the SCAN are added here too (see _remember)
+        bloom = cls._bloom_building = BloomFilter()
+        count = 0
+        try:
+            r = await cache._get_redis()
+            async for key in r.scan_iter(match="qemb:*", count=1000):
+                bloom.add(key)
+                count += 1
+        except Exception as e:
+            # A stale filter would keep hiding new keys; go to Redis instead
+            logger.warning(f"Query embedding bloom warmup failed: {e}")
+            cls._bloom_ready = False
+            return 0
+        finally:
+            cls._bloom_building = None
+
+        cls._bloom = bloom
+        cls._bloom_ready = True
+        logger.info(f"Query embedding bloom filter warmed with {count} keys")
+        return count
+
+    @classmethod
+    async def refresh_bloom(cls, interval: float, cache: CacheService = None) -> None:
+        """Re-warm the key filter every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await cls.warm_bloom(cache)
+
+    @classmethod
+    def _remember(cls, keys) -> None:
+        """Add keys just written to Redis to the filter(s)."""
+        for bloom in (cls._bloom, cls._bloom_building):
+            if bloom is not None:
+                for key in keys:
+                    bloom.add(key)
+
+    async def get(self, text: str) -> Optional[list[float]]:
+        """Get cached query embedding."""
+        key = self._key(text)
+        if self._bloom_ready and key not in self._bloom:
+            # Definite miss: skip the Redis round-trip
+            return None
+
+        value = await self.cache.get(key)
+        if value:
+            try:
+                return self._decode(value)
+            except (ValueError, IndexError):
+                return None
+        return None
+
+    async def set(self, text: str, embedding: list[float]) -> bool:
+        """Cache query embedding."""
+        key = self._key(text)
+        stored = await self.cache.set(key, self._encode(embedding), self.ttl)
+        if stored:
+            self._remember([key])
+        return stored
+
+    async def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """Get multiple cached query embeddings using batch MGET."""
+        keys = {self._key(text): text for text in texts}
+        if self._bloom_ready:
+            keys = {k: t for k, t in keys.items() if k in self._bloom}
+        if not keys:
+            return {}
+
+        try:
+            r = await self.cache._get_redis()
+            values = await r.mget(list(keys))
+        except Exception as e:
+            logger.warning(f"Batch cache get error: {e}")
+            return {}
+
+        results = {}
+        for text, value in zip(keys.values(), values):
+            if value:
+                try:
+                    results[text] = self._decode(value)
+                except (ValueError, IndexError):
+                    pass
+        return results
+
+    async def set_many(self, embeddings: dict[str, list[float]]) -> int:
+        """Cache multiple query embeddings using pipeline."""
+        if not embeddings:
+            return 0
+
+        keys = [self._key(text) for text in embeddings]
+        try:
+            r = await self.cache._get_redis()
+            pipe = r.pipeline()
+            for key, emb in zip(keys, embeddings.values()):
+                pipe.setex(key, self.ttl, self._encode(emb))
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Batch cache set error: {e}")
+            return 0
+
+        self._remember(keys)
+        return len(embeddings)
+
+
 class SearchCache:
     """Specialized cache for search results."""
 
@@ -208,19 +450,27 @@ class SearchCache:
         self.prefix = "search"
         self.ttl = 300  # 5 minutes
 
+    # Bump to invalidate cached results when ranking behaviour changes
+    VERSION = "v2"
+
     def _key(
         self,
         query: str,
         filters: dict = None,
         limit: int = 10,
     ) -> str:
-        """Generate cache key for search query."""
-        parts = [query, str(limit)]
+        """
+        Generate cache key for search query.
+
+        The query is whitespace/case-normalized and filters are serialized
+        with sorted keys, so equivalent searches share one entry.
+        """
+        parts = [" ".join(query.split()).lower(), str(limit)]
         if filters:
-            parts.append(json.dumps(filters, sort_keys=True))
+            parts.append(json.dumps(filters, sort_keys=True, default=str))
         key_str = ":".join(parts)
-        key_hash = hashlib.sha256(key_str.encode()).hexdigest()[:32]
-        return f"{self.prefix}:{key_hash}"
+        key_hash = hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+        return f"{self.prefix}:{self.VERSION}:{key_hash}"
 
     async def get(
         self,
@@ -232,6 +482,16 @@ class SearchCache:
         key = self._key(query, filters, limit)
         return await self.cache.get_json(key)
 
+    async def get_raw(
+        self,
+        query: str,
+        filters: dict = None,
+        limit: int = 10,
+    ) -> Optional[str]:
+        """Get cached search results as the raw JSON string."""
+        key = self._key(query, filters, limit)
+        return await self.cache.get(key)
+
     async def set(
         self,
         query: str,
@@ -243,6 +503,165 @@ class SearchCache:
         key = self._key(query, filters, limit)
         return await self.cache.set_json(key, results, self.ttl)
 
+    async def set_raw(
+        self,
+        query: str,
+        payload: str,
+        filters: dict = None,
+        limit: int = 10,
+    ) -> bool:
+        """Cache search results already serialized to a JSON string."""
+        key = self._key(query, filters, limit)
+        return await self.cache.set(key, payload, self.ttl)
+
     async def invalidate(self) -> int:
         """Invalidate all search cache."""
         return await self.cache.clear_pattern(f"{self.prefix}:*")
+
+
+class SpeakerMappingCache:
+    """
+    Cache of Claude speaker-label mappings.
+
+    Keyed by channel, known hosts, and the opening lines each diarized
+    speaker says, so reprocessing an episode reuses its mapping. The
+    evidence is part of the key because diarization labels aren't stable
+    across episodes: "A" is whoever spoke first, not a fixed person.
+    """
+
+    EVIDENCE_PER_SPEAKER = 5
+
+    def __init__(self, cache: CacheService = None):
+        self.cache = cache or CacheService()
+        self.prefix = "spk"
+        self.ttl = 86400 * 30  # 30 days
+
+    def _key(
+        self,
+        channel_id: str | None,
+        known_speakers: list[str],
+        evidence: dict[str, list[str]],
+    ) -> str:
+        """Generate cache key from the channel, hosts and per-speaker lines."""
+        parts = [channel_id or "", "|".join(known_speakers)]
+        parts.extend(
+            f"{speaker}:{'|'.join(evidence[speaker])}" for speaker in sorted(evidence)
+        )
+        key_hash = hashlib.blake2b("\n".join(parts).encode(), digest_size=16)
+        return f"{self.prefix}:{key_hash.hexdigest()}"
+
+    async def get(
+        self,
+        channel_id: str | None,
+        known_speakers: list[str],
+        evidence: dict[str, list[str]],
+    ) -> Optional[dict[str, str]]:
+        """Get a cached speaker mapping."""
+        key = self._key(channel_id, known_speakers, evidence)
+        return await self.cache.get_json(key)
+
+    async def set(
+        self,
+        channel_id: str | None,
+        known_speakers: list[str],
+        evidence: dict[str, list[str]],
+        mapping: dict[str, str],
+    ) -> bool:
+        """Cache a speaker mapping."""
+        key = self._key(channel_id, known_speakers, evidence)
+        return await self.cache.set_json(key, mapping, self.ttl)
+
+
+class SemanticResponseCache:
+    """
+    In-process semantic cache for RAG answers.
+
+    Entries are keyed by the (unit-normalized) query embedding plus a
+    fingerprint of the filters; a lookup returns the stored payload of the
+    most similar entry with the same fingerprint if its cosine similarity
+    clears the threshold, so paraphrased repeat questions skip search and
+    generation. Vectors live in one float32 matrix so a lookup is a single
+    matrix-vector product.
+
+    New ingests bump a generation counter in Redis (bump_generation); a
+    process that sees a new generation drops its entries, since answers may
+    now be missing fresh sources.
+    """
+
+    GENERATION_KEY = "rag:generation"
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        max_entries: int = 1000,
+        ttl: int = 3600,
+        cache: CacheService = None,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache = cache or CacheService()
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._entries: list[tuple[str, float, str]] = []  # fingerprint, expiry, payload
+        self._generation: Optional[str] = None
+
+    @staticmethod
+    def fingerprint(**filters) -> str:
+        """Stable hash of the filters an answer was generated under."""
+        key_str = json.dumps(filters, sort_keys=True, default=str)
+        return hashlib.blake2b(key_str.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    async def _check_generation(self) -> None:
+        """Drop all entries if content was ingested since they were stored."""
+        if not settings.REDIS_URL:
+            return
+        generation = await self.cache.get(self.GENERATION_KEY)
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+    def clear(self) -> None:
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._entries = []
+
+    async def get(self, vector: list[float], fingerprint: str) -> Optional[str]:
+        """Get the payload of the closest cached query, if close enough."""
+        await self._check_generation()
+        if not self._entries:
+            return None
+
+        similarities = self._vectors @ self._normalize(vector)
+        now = time.time()
+        for i in np.argsort(similarities)[::-1]:
+            if similarities[i] < self.threshold:
+                break
+            entry_fingerprint, expires_at, payload = self._entries[i]
+            if entry_fingerprint == fingerprint and expires_at > now:
+                return payload
+        return None
+
+    async def set(self, vector: list[float], fingerprint: str, payload: str) -> None:
+        """Cache a payload for a query embedding, evicting the oldest entry."""
+        await self._check_generation()
+        row = self._normalize(vector)[np.newaxis, :]
+        if not self._entries:
+            self._vectors = row
+        else:
+            self._vectors = np.vstack([self._vectors, row])
+        self._entries.append((fingerprint, time.time() + self.ttl, payload))
+
+        if len(self._entries) > self.max_entries:
+            self._vectors = self._vectors[1:]
+            self._entries.pop(0)
+
+    @classmethod
+    async def bump_generation(cls, cache: CacheService = None) -> None:
+        """Invalidate semantic caches in every process after new content."""
+        if settings.REDIS_URL:
+            await (cache or CacheService()).incr(cls.GENERATION_KEY)
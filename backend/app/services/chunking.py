@@ -84,20 +84,20 @@ class ChunkingService:
             # Check if we should start a new chunk
             should_break = False
 
-            if current_word_count >= self.target_chunk_size:
+            if current_word_count < self.target_chunk_size * 0.5:
+                # Fast path: too small to break, skip the heuristic scans
+                pass
+            elif current_word_count >= self.target_chunk_size:
                 should_break = True
-            elif (
-                current_word_count >= self.target_chunk_size * 0.7
-                and self._is_good_break_point(current_chunk_utterances, utt)
-            ):
-                # Break at speaker change or pause if we're close to target
-                should_break = True
-            elif (
-                current_word_count >= self.target_chunk_size * 0.5
-                and self._detect_topic_shift(current_chunk_utterances, utt)
-            ):
+            elif current_word_count >= self.target_chunk_size * 0.7:
+                # Break at speaker change or pause if we're close to target,
+                # otherwise fall back to topic shift detection
+                should_break = self._is_good_break_point(
+                    current_chunk_utterances, utt
+                ) or self._detect_topic_shift(current_chunk_utterances, utt)
+            else:
                 # Break at topic shift even if smaller (min 50% of target)
-                should_break = True
+                should_break = self._detect_topic_shift(current_chunk_utterances, utt)
 
             if should_break and current_chunk_utterances:
                 # Create chunk from accumulated utterances
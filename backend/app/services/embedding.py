@@ -1,10 +1,17 @@
 import asyncio
+import unicodedata
+from collections import OrderedDict
 from loguru import logger
+import numpy as np
 import openai
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import settings
 
+# Recent query embeddings, shared by every EmbeddingService in the process
+# (~6KB per 1536-dim vector, so 4096 entries is ~25MB)
+_query_embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+
 
 class EmbeddingService:
     """Generate embeddings using OpenAI."""
@@ -63,19 +70,38 @@ class EmbeddingService:
         logger.info(f"Generated {len(all_embeddings)} embeddings")
         return all_embeddings
 
-    @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     async def embed_query(self, query: str) -> list[float]:
         """
         Embed a single search query.
 
+        Exact repeats (after NFKC/case/whitespace normalization) are served
+        from a process-wide LRU instead of the API.
+
         Args:
             query: Search query text
 
         Returns:
             Embedding vector
         """
+        key = unicodedata.normalize("NFKC", query).strip().casefold()
+        cached = _query_embeddings.get(key)
+        if cached is not None:
+            _query_embeddings.move_to_end(key)
+            return cached.tolist()
+
+        embedding = await self._create_query_embedding(query)
+
+        # float32 keeps entries ~8x smaller than a list of Python floats
+        _query_embeddings[key] = np.asarray(embedding, dtype=np.float32)
+        if len(_query_embeddings) > settings.QUERY_EMBEDDING_LRU_SIZE:
+            _query_embeddings.popitem(last=False)
+        return embedding
+
+    @retry(
+        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    async def _create_query_embedding(self, query: str) -> list[float]:
+        """Embed a single query via the API."""
         response = await self.client.embeddings.create(
             model=self.model,
             input=query,
@@ -1,22 +1,31 @@
 """Hybrid search combining semantic and keyword search with re-ranking."""
 
+import asyncio
+import heapq
 import time
+from operator import itemgetter
 from datetime import datetime
 from uuid import UUID
 from typing import Optional
+import numpy as np
 from loguru import logger
+from pydantic import TypeAdapter
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models import Channel
 from app.services.embedding import EmbeddingService
 from app.services.vector_store import VectorStoreService
-from app.services.cache import CacheService, EmbeddingCache, SearchCache
+from app.services.cache import CacheService, QueryEmbeddingCache, SearchCache
 from app.services.reranker import RerankerService
 from app.services.postgres_search import PostgresSearchService
 from app.services.search_enrichment import SearchEnrichmentService
 from app.schemas.search import SearchResult
 
+# Serializes/validates cached result lists in a single pass over the JSON
+_search_results_adapter = TypeAdapter(list[SearchResult])
+
 
 class HybridSearchService:
     """
@@ -26,6 +35,13 @@ class HybridSearchService:
     3. Re-ranking with cross-encoder
     """
 
+    # Query embeddings currently being computed, shared across instances so
+    # concurrent cache misses for the same query trigger a single API call
+    _inflight_embeds: dict[str, asyncio.Future] = {}
+
+    # Largest semantic candidate list sent to Postgres as a VALUES clause
+    SQL_FUSION_MAX_IDS = 500
+
     def __init__(
         self,
         db: AsyncSession,
@@ -46,7 +62,7 @@ class HybridSearchService:
 
         if use_cache:
             self.cache = CacheService()
-            self.embedding_cache = EmbeddingCache(self.cache)
+            self.embedding_cache = QueryEmbeddingCache(self.cache)
             self.search_cache = SearchCache(self.cache)
         else:
             self.cache = None
@@ -67,6 +83,9 @@ class HybridSearchService:
         use_reranking: bool = True,
         semantic_weight: float = 0.7,
         keyword_weight: float = 0.3,
+        rerank_pool: int = 50,
+        rerank_batch_size: int = 32,
+        query_vector: list[float] | None = None,
     ) -> tuple[list[SearchResult], int]:
         """
         Hybrid search with semantic + keyword matching.
@@ -84,6 +103,10 @@ class HybridSearchService:
             use_reranking: Apply cross-encoder re-ranking
             semantic_weight: Weight for semantic search (0-1)
             keyword_weight: Weight for keyword search (0-1)
+            rerank_pool: Number of fused candidates passed to the re-ranker
+                (~100 is a good quality/latency balance for MiniLM models)
+            rerank_batch_size: Cross-encoder batch size per forward pass
+            query_vector: Precomputed embedding of the query, if available
 
         Returns:
             Tuple of (results list, processing time in ms)
@@ -93,16 +116,25 @@ class HybridSearchService:
 
         # Check cache first
         if self.search_cache:
-            filters = {
-                "speaker": speaker,
-                "channel_id": str(channel_id) if channel_id else None,
-                "channel_slug": channel_slug,
-            }
-            cached = await self.search_cache.get(query, filters, limit)
+            cache_params = self._cache_params(
+                speaker=speaker,
+                channel_id=channel_id,
+                channel_slug=channel_slug,
+                date_from=date_from,
+                date_to=date_to,
+                include_context=include_context,
+                context_utterances=context_utterances,
+                use_reranking=use_reranking,
+                semantic_weight=semantic_weight,
+                keyword_weight=keyword_weight,
+                rerank_pool=rerank_pool,
+            )
+            cached = await self.search_cache.get_raw(query, cache_params, limit)
             if cached:
                 logger.info("Search cache hit")
+                results = _search_results_adapter.validate_json(cached)
                 processing_time = int((time.time() - start_time) * 1000)
-                return [SearchResult(**r) for r in cached], processing_time
+                return results, processing_time
 
         # Resolve channel_slug to channel_id
         if channel_slug and not channel_id:
@@ -110,37 +142,77 @@ class HybridSearchService:
             if channel:
                 channel_id = channel.id
 
-        # Get candidate pool (3x limit for re-ranking)
-        candidate_limit = limit * 3 if use_reranking else limit
-
-        # Run semantic and keyword search in parallel
-        semantic_results = await self._semantic_search(
-            query=query,
-            limit=candidate_limit,
-            speaker=speaker,
-            channel_id=channel_id,
-            date_from=date_from,
-            date_to=date_to,
+        # Get candidate pool (at least 3x limit, enough to fill the rerank pool)
+        candidate_limit = (
+            limit * max(3, rerank_pool // limit) if use_reranking else limit
         )
 
-        keyword_results = await self._keyword_search(
-            query=query,
-            limit=candidate_limit,
-            speaker=speaker,
-            channel_id=channel_id,
-        )
+        if settings.SEARCH_SQL_FUSION and candidate_limit <= self.SQL_FUSION_MAX_IDS:
+            # Keyword search + RRF in one Postgres round-trip
+            combined = await self._sql_fused_search(
+                query=query,
+                query_vector=query_vector,
+                limit=candidate_limit,
+                top_n=max(rerank_pool, limit),
+                speaker=speaker,
+                channel_id=channel_id,
+                date_from=date_from,
+                date_to=date_to,
+                semantic_weight=semantic_weight,
+                keyword_weight=keyword_weight,
+            )
+        else:
+            # Run semantic and keyword search in parallel.
+            # Only the keyword branch touches self.db, so the shared session is
+            # never used by both coroutines at once.
+            semantic_results, keyword_results = await asyncio.gather(
+                self._semantic_search(
+                    query=query,
+                    query_vector=query_vector,
+                    limit=candidate_limit,
+                    speaker=speaker,
+                    channel_id=channel_id,
+                    date_from=date_from,
+                    date_to=date_to,
+                ),
+                self._keyword_search(
+                    query=query,
+                    limit=candidate_limit,
+                    speaker=speaker,
+                    channel_id=channel_id,
+                ),
+                return_exceptions=True,
+            )
 
-        # Combine with Reciprocal Rank Fusion
-        combined = self._reciprocal_rank_fusion(
-            semantic_results,
-            keyword_results,
-            semantic_weight=semantic_weight,
-            keyword_weight=keyword_weight,
-        )
+            # Cancellation is not a search failure; let it propagate
+            for outcome in (semantic_results, keyword_results):
+                if isinstance(outcome, BaseException) and not isinstance(
+                    outcome, Exception
+                ):
+                    raise outcome
+
+            if isinstance(semantic_results, Exception):
+                logger.warning(f"Semantic search failed: {semantic_results}")
+                semantic_results = []
+            if isinstance(keyword_results, Exception):
+                logger.warning(f"Keyword search failed: {keyword_results}")
+                # A failed statement aborts the transaction; reset it so
+                # enrichment can still use the session
+                await self.db.rollback()
+                keyword_results = []
+
+            # Combine with Reciprocal Rank Fusion
+            combined = self._reciprocal_rank_fusion(
+                semantic_results,
+                keyword_results,
+                semantic_weight=semantic_weight,
+                keyword_weight=keyword_weight,
+                top_n=max(rerank_pool, limit),
+            )
 
-        logger.info(
-            f"Combined {len(semantic_results)} semantic + {len(keyword_results)} keyword = {len(combined)} candidates"
-        )
+            logger.info(
+                f"Combined {len(semantic_results)} semantic + {len(keyword_results)} keyword = {len(combined)} candidates"
+            )
 
         # Apply MMR diversity to prevent redundant results from same minute
         # Do this before reranking to ensure diverse candidates
@@ -148,10 +220,12 @@ class HybridSearchService:
 
         # Re-rank with cross-encoder (increased pool size for better quality)
         if use_reranking and combined:
-            # Rerank top 50 candidates for better quality
-            rerank_pool = min(50, len(combined))
+            # Rerank the top `rerank_pool` candidates in batched forward passes
             combined = await self.reranker.rerank(
-                query, combined[:rerank_pool], top_k=limit
+                query,
+                combined[:rerank_pool],
+                top_k=limit,
+                batch_size=rerank_batch_size,
             )
         else:
             combined = combined[:limit]
@@ -165,23 +239,47 @@ class HybridSearchService:
 
         processing_time = int((time.time() - start_time) * 1000)
 
-        # Cache results
+        # Cache results (under the key computed before slug resolution)
         if self.search_cache:
-            filters = {
-                "speaker": speaker,
-                "channel_id": str(channel_id) if channel_id else None,
-                "channel_slug": channel_slug,
-            }
-            await self.search_cache.set(
+            await self.search_cache.set_raw(
                 query,
-                [r.model_dump() for r in results],
-                filters,
+                _search_results_adapter.dump_json(results).decode(),
+                cache_params,
                 limit,
             )
 
         logger.info(f"Found {len(results)} results in {processing_time}ms")
         return results, processing_time
 
+    def _cache_params(
+        self,
+        speaker: str,
+        channel_id: UUID,
+        channel_slug: str,
+        date_from: datetime,
+        date_to: datetime,
+        include_context: bool,
+        context_utterances: int,
+        use_reranking: bool,
+        semantic_weight: float,
+        keyword_weight: float,
+        rerank_pool: int,
+    ) -> dict:
+        """Canonical, JSON-serializable view of every result-affecting arg."""
+        return {
+            "speaker": speaker,
+            "channel_id": str(channel_id) if channel_id else None,
+            "channel_slug": channel_slug,
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+            "include_context": include_context,
+            "context_utterances": context_utterances if include_context else 0,
+            "reranker": self.reranker.model_name if use_reranking else None,
+            "rerank_pool": rerank_pool if use_reranking else 0,
+            "semantic_weight": round(semantic_weight, 2),
+            "keyword_weight": round(keyword_weight, 2),
+        }
+
     async def _semantic_search(
         self,
         query: str,
@@ -190,16 +288,14 @@ class HybridSearchService:
         channel_id: UUID = None,
         date_from: datetime = None,
         date_to: datetime = None,
+        query_vector: list[float] | None = None,
     ) -> list[dict]:
         """Semantic search using Qdrant."""
-        # Get query embedding (with caching)
-        if self.embedding_cache:
+        # Get query embedding (with caching), unless the caller has it
+        if not query_vector and self.embedding_cache:
             query_vector = await self.embedding_cache.get(query)
-            if not query_vector:
-                query_vector = await self.embedding_service.embed_query(query)
-                await self.embedding_cache.set(query, query_vector)
-        else:
-            query_vector = await self.embedding_service.embed_query(query)
+        if not query_vector:
+            query_vector = await self._embed_query_single_flight(query)
 
         # Search Qdrant
         results = await self.vector_store.search(
@@ -214,6 +310,29 @@ class HybridSearchService:
 
         return results
 
+    async def _embed_query_single_flight(self, query: str) -> list[float]:
+        """
+        Embed a query, coalescing concurrent requests for the same text.
+
+        The first caller starts the computation; later callers await the
+        same future instead of issuing duplicate embedding API calls.
+        """
+        future = self._inflight_embeds.get(query)
+        if future is None:
+            future = asyncio.ensure_future(self._compute_and_cache_embedding(query))
+            self._inflight_embeds[query] = future
+            future.add_done_callback(lambda _: self._inflight_embeds.pop(query, None))
+
+        # Shield so one cancelled request doesn't cancel the shared work
+        return await asyncio.shield(future)
+
+    async def _compute_and_cache_embedding(self, query: str) -> list[float]:
+        """Embed a query and write it back to the embedding cache."""
+        query_vector = await self.embedding_service.embed_query(query)
+        if self.embedding_cache:
+            await self.embedding_cache.set(query, query_vector)
+        return query_vector
+
     async def _keyword_search(
         self,
         query: str,
@@ -256,6 +375,99 @@ class HybridSearchService:
 
         return results
 
+    async def _sql_fused_search(
+        self,
+        query: str,
+        limit: int,
+        top_n: int,
+        speaker: str = None,
+        channel_id: UUID = None,
+        date_from: datetime = None,
+        date_to: datetime = None,
+        semantic_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        query_vector: list[float] | None = None,
+    ) -> list[dict]:
+        """
+        Semantic search, then keyword search + RRF fused server-side.
+
+        Returns the same dict shape as _reciprocal_rank_fusion. Semantic hits
+        keep their vector store payload; keyword-only hits are built from
+        the fused rows.
+        """
+        try:
+            semantic_results = await self._semantic_search(
+                query=query,
+                query_vector=query_vector,
+                limit=limit,
+                speaker=speaker,
+                channel_id=channel_id,
+                date_from=date_from,
+                date_to=date_to,
+            )
+        except Exception as e:
+            logger.warning(f"Semantic search failed: {e}")
+            semantic_results = []
+
+        semantic_by_id = {r.get("chunk_id") or r.get("id"): r for r in semantic_results}
+
+        try:
+            fused = await self.postgres_search.fused_search(
+                query=query,
+                semantic_ranks=[
+                    (UUID(doc_id), rank)
+                    for rank, doc_id in enumerate(semantic_by_id, 1)
+                ],
+                limit=limit,
+                top_n=top_n,
+                channel_id=channel_id,
+                speaker=speaker,
+                semantic_weight=semantic_weight,
+                keyword_weight=keyword_weight,
+            )
+        except Exception as e:
+            logger.warning(f"SQL fusion failed, using semantic results only: {e}")
+            await self.db.rollback()
+            return self._reciprocal_rank_fusion(
+                semantic_results,
+                [],
+                semantic_weight=semantic_weight,
+                keyword_weight=keyword_weight,
+                top_n=top_n,
+            )
+
+        combined = []
+        for row in fused:
+            chunk_id = str(row.chunk_id)
+            result = semantic_by_id.get(chunk_id)
+            if result is not None:
+                result["semantic_rank"] = row.semantic_rank
+                result["semantic_score"] = result.get("score", 0)
+            else:
+                result = {
+                    "id": chunk_id,
+                    "chunk_id": chunk_id,
+                    "episode_id": str(row.episode_id),
+                    "channel_id": str(row.channel_id),
+                    "text": row.text,
+                    "speaker": row.primary_speaker,
+                    "speakers": row.speakers,
+                    "start_ms": row.start_ms,
+                    "end_ms": row.end_ms,
+                    "search_type": "keyword",
+                }
+            if row.keyword_rank is not None:
+                result["keyword_rank"] = row.keyword_rank
+                result["keyword_score"] = row.keyword_score
+            result["rrf_score"] = row.rrf_score
+            result["score"] = row.rrf_score
+            combined.append(result)
+
+        logger.info(
+            f"SQL-fused {len(semantic_results)} semantic results = {len(combined)} candidates"
+        )
+        return combined
+
     def _reciprocal_rank_fusion(
         self,
         semantic_results: list[dict],
@@ -263,44 +475,58 @@ class HybridSearchService:
         semantic_weight: float = 0.7,
         keyword_weight: float = 0.3,
         k: int = 60,
+        top_n: int = 200,
     ) -> list[dict]:
         """
         Combine results using Reciprocal Rank Fusion (RRF).
 
         RRF score = sum(weight / (k + rank)) for each result list
+
+        Only the top_n fused results are returned; selecting them with a
+        heap avoids sorting the whole candidate set.
         """
-        scores = {}
-        results_map = {}
-
-        # Process semantic results
-        for rank, result in enumerate(semantic_results, 1):
-            doc_id = result.get("chunk_id") or result.get("id")
-            if doc_id not in scores:
-                scores[doc_id] = 0
-                results_map[doc_id] = result
-            scores[doc_id] += semantic_weight / (k + rank)
-            results_map[doc_id]["semantic_rank"] = rank
-            results_map[doc_id]["semantic_score"] = result.get("score", 0)
-
-        # Process keyword results
-        for rank, result in enumerate(keyword_results, 1):
-            doc_id = result.get("chunk_id") or result.get("id")
-            if doc_id not in scores:
-                scores[doc_id] = 0
-                results_map[doc_id] = result
-            scores[doc_id] += keyword_weight / (k + rank)
-            results_map[doc_id]["keyword_rank"] = rank
-            results_map[doc_id]["keyword_score"] = result.get("score", 0)
-
-        # Sort by combined score
-        sorted_ids = sorted(scores.keys(), key=lambda x: scores[x], reverse=True)
-
-        # Build final results
+        # Single id -> slot map over a flat list of entries:
+        # [result, rrf_score, semantic_rank, semantic_score, keyword_rank, keyword_score]
+        index: dict[str, int] = {}
+        entries: list[list] = []
+
+        def _ingest(
+            results, weight, rank_slot, index_get=index.get, append=entries.append
+        ):
+            # Hot loop: dict lookups and appends are bound to locals
+            score_slot = rank_slot + 1
+            for rank, result in enumerate(results, 1):
+                doc_id = result.get("chunk_id") or result.get("id")
+                contribution = weight / (k + rank)
+                i = index_get(doc_id)
+                if i is None:
+                    index[doc_id] = len(entries)
+                    entry = [result, contribution, None, None, None, None]
+                    append(entry)
+                else:
+                    entry = entries[i]
+                    entry[1] += contribution
+                entry[rank_slot] = rank
+                entry[score_slot] = result.get("score", 0)
+
+        _ingest(semantic_results, semantic_weight, 2)
+        _ingest(keyword_results, keyword_weight, 4)
+
+        # Select the top_n by combined score
+        top = heapq.nlargest(top_n, entries, key=itemgetter(1))
+
+        # Build final results for the winners only (result dicts are
+        # updated in place since they are not reused by the caller)
         combined = []
-        for doc_id in sorted_ids:
-            result = results_map[doc_id].copy()
-            result["rrf_score"] = scores[doc_id]
-            result["score"] = scores[doc_id]  # Use RRF score as primary
+        for result, score, sem_rank, sem_score, kw_rank, kw_score in top:
+            if sem_rank is not None:
+                result["semantic_rank"] = sem_rank
+                result["semantic_score"] = sem_score
+            if kw_rank is not None:
+                result["keyword_rank"] = kw_rank
+                result["keyword_score"] = kw_score
+            result["rrf_score"] = score
+            result["score"] = score  # Use RRF score as primary
             combined.append(result)
 
         return combined
@@ -328,64 +554,80 @@ class HybridSearchService:
         if not results or len(results) <= 1:
             return results
 
-        selected = [results[0]]  # Always include top result
-        remaining = results[1:]
-
-        while remaining and len(selected) < len(results):
-            best_idx = 0
-            best_score = float("-inf")
+        # Fast path: with no two candidates in the same segment, every
+        # diversity penalty is zero and MMR keeps the relevance order
+        if self._is_already_diverse(results, time_window_ms):
+            logger.debug(f"MMR skipped: {len(results)} candidates already diverse")
+            return results
 
-            for i, candidate in enumerate(remaining):
-                # Relevance score (from RRF)
-                relevance = candidate.get("score", 0)
+        n = len(results)
+
+        # Precompute candidate features once as flat arrays
+        episode_index: dict = {}
+        ep_ids = np.fromiter(
+            (
+                episode_index.setdefault(r.get("episode_id"), len(episode_index))
+                for r in results
+            ),
+            dtype=np.int64,
+            count=n,
+        )
+        starts = np.fromiter(
+            (r.get("start_ms", 0) or 0 for r in results), dtype=np.int64, count=n
+        )
+        relevance = np.fromiter(
+            (r.get("score", 0) or 0 for r in results), dtype=np.float64, count=n
+        )
 
-                # Diversity penalty: check overlap with selected results
-                max_similarity = 0
-                for sel in selected:
-                    similarity = self._compute_temporal_similarity(
-                        candidate, sel, time_window_ms
-                    )
-                    max_similarity = max(max_similarity, similarity)
+        # Max temporal similarity of each candidate to anything selected so far
+        max_sim = np.zeros(n, dtype=np.float64)
+        available = np.ones(n, dtype=bool)
+        order = []
 
-                # MMR score: balance relevance with diversity
-                mmr_score = (
-                    lambda_param * relevance - (1 - lambda_param) * max_similarity
-                )
+        idx = 0  # Always include top result
+        while True:
+            order.append(idx)
+            available[idx] = False
+            if len(order) == n:
+                break
 
-                if mmr_score > best_score:
-                    best_score = mmr_score
-                    best_idx = i
+            # Similarity: 1 - diff/window within the same episode and window
+            diff = np.abs(starts - starts[idx])
+            same_segment = (ep_ids == ep_ids[idx]) & (diff < time_window_ms)
+            sim = np.where(same_segment, 1.0 - diff / time_window_ms, 0.0)
+            np.maximum(max_sim, sim, out=max_sim)
 
-            selected.append(remaining.pop(best_idx))
+            # MMR score: balance relevance with diversity
+            mmr = lambda_param * relevance - (1 - lambda_param) * max_sim
+            idx = int(np.argmax(np.where(available, mmr, -np.inf)))
 
-        return selected
+        return [results[i] for i in order]
 
-    def _compute_temporal_similarity(
-        self,
-        result1: dict,
-        result2: dict,
-        time_window_ms: int,
-    ) -> float:
+    @staticmethod
+    def _is_already_diverse(results: list[dict], time_window_ms: int) -> bool:
         """
-        Compute similarity based on temporal/episode overlap.
+        Check whether MMR would leave the results untouched.
 
-        Returns 1.0 if same episode and within time window, 0.0 otherwise.
+        True when results are sorted by score and no two of them share an
+        episode within time_window_ms of each other.
         """
-        # Different episodes = no similarity
-        if result1.get("episode_id") != result2.get("episode_id"):
-            return 0.0
-
-        # Same episode - check time overlap
-        start1 = result1.get("start_ms", 0)
-        start2 = result2.get("start_ms", 0)
-
-        time_diff = abs(start1 - start2)
+        scores = [r.get("score", 0) or 0 for r in results]
+        if any(a < b for a, b in zip(scores, scores[1:])):
+            return False
+
+        starts_by_episode: dict = {}
+        for r in results:
+            starts_by_episode.setdefault(r.get("episode_id"), []).append(
+                r.get("start_ms", 0) or 0
+            )
 
-        if time_diff < time_window_ms:
-            # High similarity if within 1 minute
-            return 1.0 - (time_diff / time_window_ms)
+        for starts in starts_by_episode.values():
+            if len(starts) > 1:
+                starts.sort()
+                if any(b - a < time_window_ms for a, b in zip(starts, starts[1:])):
+                    return False
 
-        return 0.0
+        return True
 
     async def _get_channel_by_slug(self, slug: str) -> Optional[Channel]:
         """Get channel by slug."""
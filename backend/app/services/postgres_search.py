@@ -11,13 +11,33 @@ Benefits over in-memory BM25:
 - Supports phrase search, stemming, ranking
 """
 
+import re
 from uuid import UUID
 from typing import Optional
 from dataclasses import dataclass
-from sqlalchemy import select, func, or_
+from functools import lru_cache
+from sqlalchemy import (
+    Float,
+    Integer,
+    column,
+    desc,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    union_all,
+    values,
+)
+from sqlalchemy.sql.selectable import CTE
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Chunk, Episode
+from app.models import Chunk
+
+# Query parsing patterns (compiled once at import)
+_PHRASE_RE = re.compile(r'"([^"]+)"')
+_STRIP_PHRASES_RE = re.compile(r'"[^"]+"')
+_NONWORD_RE = re.compile(r"[^\w]")
 
 
 @dataclass
@@ -35,12 +55,30 @@ class KeywordSearchResult:
     rank: float  # ts_rank score
 
 
+@dataclass
+class FusedSearchResult:
+    """Result from server-side Reciprocal Rank Fusion."""
+
+    chunk_id: UUID
+    episode_id: UUID
+    channel_id: UUID
+    text: str
+    primary_speaker: str
+    speakers: list[str]
+    start_ms: int
+    end_ms: int
+    rrf_score: float
+    semantic_rank: Optional[int]
+    keyword_rank: Optional[int]
+    keyword_score: Optional[float]
+
+
 class PostgresSearchService:
     """
     Full-text search using PostgreSQL's built-in capabilities.
 
     Uses:
-    - to_tsvector: Converts text to searchable tokens
+    - text_search_vector: Stored tsvector column, tokenized once at write time
     - to_tsquery: Parses search query
     - ts_rank: Ranks results by relevance
     - GIN index: Fast lookups (idx_chunks_text_search)
@@ -65,7 +103,7 @@ class PostgresSearchService:
             limit: Maximum results to return
             channel_id: Filter by channel
             speaker: Filter by speaker
-            min_rank: Minimum relevance score
+            min_rank: Minimum relevance score (applied to the top ranked rows)
 
         Returns:
             List of KeywordSearchResult sorted by relevance
@@ -76,39 +114,31 @@ class PostgresSearchService:
         # Convert query to tsquery format
         # "hello world" -> 'hello' & 'world'
         # Handles phrases in quotes: "exact phrase" -> 'exact' <-> 'phrase'
-        ts_query = self._build_tsquery(query)
-
-        # Build the search query with ranking
-        # Uses ts_rank_cd for better ranking of close matches
-        rank_expr = func.ts_rank_cd(
-            func.to_tsvector("english", Chunk.text),
-            func.to_tsquery("english", ts_query),
-        )
+        tsq = self._tsquery_cte(self._build_tsquery(query))
 
+        # Rank every GIN-indexed match with ts_rank_cd (better for close
+        # matches) and cap only after ranking, so no relevant chunk is cut
+        # before it is scored. ORDER BY ... LIMIT runs as a bounded top-N
+        # sort, and ordering by the output column evaluates the rank once
         stmt = (
             select(
                 Chunk.id,
                 Chunk.episode_id,
+                Chunk.channel_id,
                 Chunk.text,
                 Chunk.primary_speaker,
                 Chunk.speakers,
                 Chunk.start_ms,
                 Chunk.end_ms,
-                rank_expr.label("rank"),
-            )
-            .where(
-                func.to_tsvector("english", Chunk.text).op("@@")(
-                    func.to_tsquery("english", ts_query)
-                )
+                func.ts_rank_cd(Chunk.text_search_vector, tsq.c.q).label("rank"),
             )
-            .where(rank_expr >= min_rank)
+            .join(tsq, true())
+            .where(Chunk.text_search_vector.op("@@")(tsq.c.q))
         )
 
         # Apply filters
         if channel_id:
-            # Join with Episode to filter by channel
-            stmt = stmt.join(Episode, Chunk.episode_id == Episode.id)
-            stmt = stmt.where(Episode.channel_id == channel_id)
+            stmt = stmt.where(Chunk.channel_id == channel_id)
 
         if speaker:
             stmt = stmt.where(
@@ -118,29 +148,15 @@ class PostgresSearchService:
                 )
             )
 
-        # Order by rank and limit
-        stmt = stmt.order_by(rank_expr.desc()).limit(limit)
+        stmt = stmt.order_by(desc("rank")).limit(limit)
 
         result = await self.db.execute(stmt)
-        rows = result.all()
-
-        # Get channel_ids for results
-        episode_ids = [row.episode_id for row in rows]
-        if episode_ids:
-            ep_result = await self.db.execute(
-                select(Episode.id, Episode.channel_id).where(
-                    Episode.id.in_(episode_ids)
-                )
-            )
-            episode_channels = {row.id: row.channel_id for row in ep_result.all()}
-        else:
-            episode_channels = {}
 
         return [
             KeywordSearchResult(
                 chunk_id=row.id,
                 episode_id=row.episode_id,
-                channel_id=episode_channels.get(row.episode_id),
+                channel_id=row.channel_id,
                 text=row.text,
                 primary_speaker=row.primary_speaker,
                 speakers=row.speakers or [],
@@ -148,7 +164,135 @@ class PostgresSearchService:
                 end_ms=row.end_ms,
                 rank=float(row.rank),
             )
-            for row in rows
+            for row in result.all()
+            if row.rank >= min_rank
+        ]
+
+    async def fused_search(
+        self,
+        query: str,
+        semantic_ranks: list[tuple[UUID, int]],
+        limit: int = 20,
+        top_n: int = 150,
+        channel_id: Optional[UUID] = None,
+        speaker: Optional[str] = None,
+        semantic_weight: float = 0.7,
+        keyword_weight: float = 0.3,
+        k: int = 60,
+    ) -> list[FusedSearchResult]:
+        """
+        Keyword search + Reciprocal Rank Fusion in a single statement.
+
+        The semantic ranking (already retrieved from the vector store) is
+        sent as a VALUES list and fused with the full-text ranking using
+        sum(weight / (k + rank)), so chunk rows come back pre-sorted in one
+        round-trip instead of a keyword query plus a Python-side merge.
+
+        Args:
+            query: Search query (same syntax as keyword_search)
+            semantic_ranks: (chunk_id, rank) pairs from semantic search
+            limit: Maximum keyword candidates to fuse
+            top_n: Maximum fused results to return
+            channel_id: Filter keyword candidates by channel
+            speaker: Filter keyword candidates by speaker
+            semantic_weight: RRF weight of the semantic ranking
+            keyword_weight: RRF weight of the keyword ranking
+            k: RRF rank constant
+
+        Returns:
+            List of FusedSearchResult sorted by fused score
+        """
+        tsq = self._tsquery_cte(self._build_tsquery(query or ""))
+        rank_expr = func.ts_rank_cd(Chunk.text_search_vector, tsq.c.q)
+
+        kw = (
+            select(
+                Chunk.id.label("id"),
+                func.row_number().over(order_by=rank_expr.desc()).label("rn"),
+                rank_expr.label("kw_score"),
+            )
+            .join(tsq, true())
+            .where(Chunk.text_search_vector.op("@@")(tsq.c.q))
+        )
+        if channel_id:
+            kw = kw.where(Chunk.channel_id == channel_id)
+        if speaker:
+            kw = kw.where(
+                or_(
+                    Chunk.primary_speaker == speaker,
+                    Chunk.speakers.contains([speaker]),
+                )
+            )
+        kw = kw.order_by(rank_expr.desc()).limit(limit).cte("kw")
+
+        def contribution(rn, weight: float):
+            return (literal(weight, Float) / (k + rn)).label("s")
+
+        sem = None
+        parts = [select(kw.c.id, contribution(kw.c.rn, keyword_weight))]
+        if semantic_ranks:
+            sem_values = values(
+                column("id", Chunk.id.type),
+                column("rn", Integer),
+                name="sem_values",
+            ).data(semantic_ranks)
+            sem = select(sem_values).cte("sem")
+            parts.append(select(sem.c.id, contribution(sem.c.rn, semantic_weight)))
+        hits = union_all(*parts).subquery("hits")
+
+        fused = (
+            select(hits.c.id, func.sum(hits.c.s).label("score"))
+            .group_by(hits.c.id)
+            .order_by(func.sum(hits.c.s).desc())
+            .limit(top_n)
+            .cte("fused")
+        )
+
+        stmt = (
+            select(
+                Chunk.id,
+                Chunk.episode_id,
+                Chunk.channel_id,
+                Chunk.text,
+                Chunk.primary_speaker,
+                Chunk.speakers,
+                Chunk.start_ms,
+                Chunk.end_ms,
+                fused.c.score,
+                (sem.c.rn if sem is not None else literal(None, Integer)).label(
+                    "semantic_rank"
+                ),
+                kw.c.rn.label("keyword_rank"),
+                kw.c.kw_score,
+            )
+            .select_from(fused)
+            .join(Chunk, Chunk.id == fused.c.id)
+            .outerjoin(kw, kw.c.id == fused.c.id)
+        )
+        if sem is not None:
+            stmt = stmt.outerjoin(sem, sem.c.id == fused.c.id)
+        stmt = stmt.order_by(fused.c.score.desc())
+
+        result = await self.db.execute(stmt)
+
+        return [
+            FusedSearchResult(
+                chunk_id=row.id,
+                episode_id=row.episode_id,
+                channel_id=row.channel_id,
+                text=row.text,
+                primary_speaker=row.primary_speaker,
+                speakers=row.speakers or [],
+                start_ms=row.start_ms,
+                end_ms=row.end_ms,
+                rrf_score=float(row.score),
+                semantic_rank=row.semantic_rank,
+                keyword_rank=row.keyword_rank,
+                keyword_score=(
+                    float(row.kw_score) if row.kw_score is not None else None
+                ),
+            )
+            for row in result.all()
         ]
 
     async def headline_search(
@@ -165,20 +309,17 @@ class PostgresSearchService:
         if not query or not query.strip():
             return []
 
-        ts_query = self._build_tsquery(query)
+        tsq = self._tsquery_cte(self._build_tsquery(query))
 
         # ts_headline highlights matching terms
         headline_expr = func.ts_headline(
             "english",
             Chunk.text,
-            func.to_tsquery("english", ts_query),
+            tsq.c.q,
             "StartSel=<mark>, StopSel=</mark>, MaxWords=50, MinWords=20",
         )
 
-        rank_expr = func.ts_rank_cd(
-            func.to_tsvector("english", Chunk.text),
-            func.to_tsquery("english", ts_query),
-        )
+        rank_expr = func.ts_rank_cd(Chunk.text_search_vector, tsq.c.q)
 
         stmt = (
             select(
@@ -187,11 +328,8 @@ class PostgresSearchService:
                 headline_expr.label("headline"),
                 rank_expr.label("rank"),
             )
-            .where(
-                func.to_tsvector("english", Chunk.text).op("@@")(
-                    func.to_tsquery("english", ts_query)
-                )
-            )
+            .join(tsq, true())
+            .where(Chunk.text_search_vector.op("@@")(tsq.c.q))
             .order_by(rank_expr.desc())
             .limit(limit)
         )
@@ -208,7 +346,14 @@ class PostgresSearchService:
             for row in result.all()
         ]
 
-    def _build_tsquery(self, query: str) -> str:
+    @staticmethod
+    def _tsquery_cte(ts_query: str) -> CTE:
+        """Parse the tsquery once and expose it to the statement as tsq.q."""
+        return select(func.to_tsquery("english", ts_query).label("q")).cte("tsq")
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _build_tsquery(query: str) -> str:
         """
         Convert user query to PostgreSQL tsquery format.
 
@@ -222,36 +367,30 @@ class PostgresSearchService:
         - Limits query length
         - Validates word characters only
         """
-        import re
-
         # Limit query length to prevent DoS
         query = query[:500]
 
         # Extract quoted phrases first
-        phrases = re.findall(r'"([^"]+)"', query)
-        remaining = re.sub(r'"[^"]+"', "", query)
+        phrases = _PHRASE_RE.findall(query)
+        remaining = _STRIP_PHRASES_RE.sub("", query)
 
         parts = []
 
         # Add phrase queries (adjacent words)
         for phrase in phrases:
             words = []
-            for w in phrase.strip().split():
+            for w in phrase.split():
                 # Only allow alphanumeric characters
-                clean = re.sub(r"[^\w]", "", w)
+                clean = _NONWORD_RE.sub("", w).lower()
                 if clean and len(clean) <= 50:
-                    # Escape single quotes
-                    words.append(clean.lower().replace("'", "''"))
+                    words.append(clean)
 
             if words:
                 phrase_query = " <-> ".join(f"'{w}'" for w in words)
                 parts.append(f"({phrase_query})")
 
         # Add remaining words
-        remaining_words = remaining.strip().split()
-        for word in remaining_words:
-            word = word.strip()
-
+        for word in remaining.split():
             if word.upper() == "OR":
                 if parts:
                     parts[-1] = parts[-1] + " |"
@@ -259,13 +398,10 @@ class PostgresSearchService:
             elif word.upper() == "AND":
                 continue  # AND is default
 
-            # Sanitize: only alphanumeric
-            clean_word = re.sub(r"[^\w]", "", word)
-
-            if clean_word and len(clean_word) <= 50:
-                # Escape single quotes
-                safe_word = clean_word.lower().replace("'", "''")
+            # Sanitize: only alphanumeric (this also strips quotes)
+            safe_word = _NONWORD_RE.sub("", word).lower()
 
+            if safe_word and len(safe_word) <= 50:
                 if parts and parts[-1].endswith("|"):
                     parts[-1] = parts[-1] + f" '{safe_word}'"
                 else:
@@ -1,23 +1,79 @@
 import time
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime
 from uuid import UUID
 from loguru import logger
 import anthropic
 
 from app.config import settings
+from app.services.cache import SemanticResponseCache
 from app.services.search import SearchService
-from app.schemas.search import SearchResult
+from app.schemas.search import SearchResult, text_preview
 from app.schemas.chat import ChatResponse, Citation
-from app.utils.retry import retry_async, anthropic_circuit
+from app.utils.retry import (
+    CircuitOpenError,
+    CircuitState,
+    retry_async,
+    anthropic_circuit,
+)
+
+# Kept byte-stable at module level so Anthropic can cache it as a prefix
+SYSTEM_PROMPT = """You are an assistant that answers questions about podcasts based on their transcripts.
+
+You have access to transcript excerpts that will be provided as context. Use this context to answer questions accurately.
+
+## STRICT GROUNDING RULES (CRITICAL):
+1. Base your answers ONLY on the provided transcript excerpts - never make up information
+2. For EVERY claim you make, include a short quoted span (5-15 words) from the transcript
+3. Format quotes as: "quoted text" [Source N]
+4. If the context doesn't contain enough information, say "I couldn't find information about this in the transcripts" and suggest a better query
+5. Never hallucinate or infer beyond what's explicitly stated
+
+## CITATION FORMAT:
+- Use inline citations: "quoted text" [1]
+- At the end, list sources: [1] Speaker Name, Episode Title, Timestamp
+- Quote the most relevant 5-15 word spans that support your answer
+
+## QUALITY GUIDELINES:
+- Distinguish between what different speakers said
+- If asked about opinions, attribute them: "According to [Speaker], ..."
+- If multiple sources support a point, cite all of them
+- Be concise but thorough
+- If confidence is low, acknowledge uncertainty
+
+## EXAMPLE RESPONSE:
+The speaker discusses how "compound interest is the eighth wonder of the world" [1] and emphasizes that "starting early is more important than starting big" [2].
+
+Sources:
+[1] Ray Dalio, WTF Is Wealth?, 12:34
+[2] Nikhil Kamath, WTF Is Wealth?, 15:22"""
+
+# Beta header enabling cache_control blocks on this SDK version
+PROMPT_CACHING_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+# Conversation history replay window (see RAGService._history_window)
+HISTORY_MAX_MESSAGES = 20
+HISTORY_COMPACT_STEP = 10
+
+
+# Shared across requests so answers outlive a single RAGService instance
+_response_cache = SemanticResponseCache(threshold=settings.RAG_SEMANTIC_CACHE_THRESHOLD)
 
 
 class RAGService:
     """RAG-powered chat using Claude with podcast transcripts as context."""
 
-    def __init__(self, search_service: SearchService):
+    def __init__(
+        self,
+        search_service: SearchService,
+        response_cache: SemanticResponseCache | None = None,
+    ):
         self.search_service = search_service
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.response_cache = response_cache or (
+            _response_cache if settings.RAG_SEMANTIC_CACHE else None
+        )
+        self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.model = settings.ANTHROPIC_MODEL
 
     async def chat(
@@ -49,6 +105,69 @@ class RAGService:
         Returns:
             ChatResponse with answer and citations
         """
+        async for event in self._answer(
+            message=message,
+            conversation_id=conversation_id,
+            conversation_history=conversation_history,
+            speaker=speaker,
+            channel_id=channel_id,
+            channel_slug=channel_slug,
+            date_from=date_from,
+            date_to=date_to,
+            max_context_chunks=max_context_chunks,
+            stream=False,
+        ):
+            response = event
+        return response
+
+    async def chat_stream(
+        self,
+        message: str,
+        conversation_id: UUID | None = None,
+        conversation_history: list[dict] | None = None,
+        speaker: str | None = None,
+        channel_id: UUID | None = None,
+        channel_slug: str | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        max_context_chunks: int = 10,
+    ) -> AsyncIterator[str | ChatResponse]:
+        """
+        Answer questions using RAG, streaming the answer as it's generated.
+
+        Takes the same arguments as chat(). Yields answer text deltas as
+        they arrive from Claude, then the complete ChatResponse (with
+        citations) as the final item. Closing the generator early cancels
+        the generation.
+        """
+        async for event in self._answer(
+            message=message,
+            conversation_id=conversation_id,
+            conversation_history=conversation_history,
+            speaker=speaker,
+            channel_id=channel_id,
+            channel_slug=channel_slug,
+            date_from=date_from,
+            date_to=date_to,
+            max_context_chunks=max_context_chunks,
+            stream=True,
+        ):
+            yield event
+
+    async def _answer(
+        self,
+        message: str,
+        conversation_id: UUID | None = None,
+        conversation_history: list[dict] | None = None,
+        speaker: str | None = None,
+        channel_id: UUID | None = None,
+        channel_slug: str | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+        max_context_chunks: int = 10,
+        stream: bool = False,
+    ) -> AsyncIterator[str | ChatResponse]:
+        """Shared chat pipeline: text deltas (when streaming), then the response."""
         start_time = time.time()
 
         logger.info(f"RAG query: {message}")
@@ -56,6 +175,30 @@ class RAGService:
         # Generate or use existing conversation ID
         conv_id = conversation_id or uuid.uuid4()
 
+        # Embed once: the same vector feeds the response cache and the search
+        query_vector = await self.search_service.embedding_service.embed_query(message)
+
+        # Semantic response cache: a paraphrase of an earlier first-turn
+        # question reuses its answer (follow-ups depend on the history)
+        cache_key = None
+        if self.response_cache and not conversation_history:
+            cache_key = SemanticResponseCache.fingerprint(
+                speaker=speaker,
+                channel_id=channel_id,
+                channel_slug=channel_slug,
+                date_from=date_from,
+                date_to=date_to,
+                max_context_chunks=max_context_chunks,
+            )
+            cached = await self.response_cache.get(query_vector, cache_key)
+            if cached:
+                logger.info("Semantic response cache hit")
+                response = ChatResponse.model_validate_json(cached)
+                response.conversation_id = conv_id
+                response.processing_time_ms = int((time.time() - start_time) * 1000)
+                yield response
+                return
+
         # Search for relevant chunks
         search_results, _ = await self.search_service.search(
             query=message,
@@ -66,17 +209,19 @@ class RAGService:
             date_from=date_from,
             date_to=date_to,
             include_context=False,  # We'll use chunks directly
+            query_vector=query_vector,
         )
 
         if not search_results:
             # No relevant content found
-            return ChatResponse(
+            yield ChatResponse(
                 answer="I couldn't find any relevant information in the podcast transcripts to answer your question. Try rephrasing your question or broadening your search filters.",
                 citations=[],
                 conversation_id=conv_id,
                 search_results_used=0,
                 processing_time_ms=int((time.time() - start_time) * 1000),
             )
+            return
 
         # Build context from search results
         context = self._build_context(search_results)
@@ -88,27 +233,34 @@ class RAGService:
             conversation_history=conversation_history or [],
         )
 
-        # Call Claude with retry and circuit breaker
+        # Call Claude: streamed token by token, or in one call with retries
         try:
-            answer = await self._call_claude_with_retry(messages)
+            if stream:
+                parts = []
+                async for text in self._stream_claude(messages):
+                    parts.append(text)
+                    yield text
+                answer = "".join(parts)
+            else:
+                answer = await self._call_claude_with_retry(messages)
 
         except Exception as e:
             logger.error(f"Claude API error: {e}")
-            return ChatResponse(
+            yield ChatResponse(
                 answer="I encountered an error while generating a response. Please try again.",
                 citations=[],
                 conversation_id=conv_id,
                 search_results_used=len(search_results),
                 processing_time_ms=int((time.time() - start_time) * 1000),
             )
+            return
 
-        # Build citations
         citations = self._build_citations(search_results)
 
         processing_time = int((time.time() - start_time) * 1000)
         logger.info(f"RAG response generated in {processing_time}ms")
 
-        return ChatResponse(
+        response = ChatResponse(
             answer=answer,
             citations=citations,
             conversation_id=conv_id,
@@ -116,6 +268,13 @@ class RAGService:
             processing_time_ms=processing_time,
         )
 
+        if cache_key:
+            await self.response_cache.set(
+                query_vector, cache_key, response.model_dump_json()
+            )
+
+        yield response
+
     @retry_async(
         max_retries=3,
         initial_delay=1.0,
@@ -124,71 +283,58 @@ class RAGService:
     @anthropic_circuit
     async def _call_claude_with_retry(self, messages: list[dict]) -> str:
         """Call Claude API with retry and circuit breaker."""
-        import asyncio
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=2048,
+            system=self._get_system_prompt(),
+            messages=messages,
+            extra_headers=PROMPT_CACHING_HEADERS,
+        )
+        return response.content[0].text
+
+    async def _stream_claude(self, messages: list[dict]) -> AsyncIterator[str]:
+        """Stream Claude's answer text, tracked by the Anthropic circuit breaker."""
+        if anthropic_circuit.state == CircuitState.OPEN:
+            raise CircuitOpenError(f"Circuit {anthropic_circuit.name} is open")
 
-        # Run sync client in thread pool
-        def _call():
-            response = self.client.messages.create(
+        try:
+            async with self.client.messages.stream(
                 model=self.model,
                 max_tokens=2048,
                 system=self._get_system_prompt(),
                 messages=messages,
-            )
-            return response.content[0].text
-
-        return await asyncio.get_event_loop().run_in_executor(None, _call)
-
-    def _get_system_prompt(self) -> str:
-        """System prompt for RAG with strict grounding."""
-        return """You are an assistant that answers questions about podcasts based on their transcripts.
-
-You have access to transcript excerpts that will be provided as context. Use this context to answer questions accurately.
-
-## STRICT GROUNDING RULES (CRITICAL):
-1. Base your answers ONLY on the provided transcript excerpts - never make up information
-2. For EVERY claim you make, include a short quoted span (5-15 words) from the transcript
-3. Format quotes as: "quoted text" [Source N]
-4. If the context doesn't contain enough information, say "I couldn't find information about this in the transcripts" and suggest a better query
-5. Never hallucinate or infer beyond what's explicitly stated
-
-## CITATION FORMAT:
-- Use inline citations: "quoted text" [1]
-- At the end, list sources: [1] Speaker Name, Episode Title, Timestamp
-- Quote the most relevant 5-15 word spans that support your answer
-
-## QUALITY GUIDELINES:
-- Distinguish between what different speakers said
-- If asked about opinions, attribute them: "According to [Speaker], ..."
-- If multiple sources support a point, cite all of them
-- Be concise but thorough
-- If confidence is low, acknowledge uncertainty
-
-## EXAMPLE RESPONSE:
-The speaker discusses how "compound interest is the eighth wonder of the world" [1] and emphasizes that "starting early is more important than starting big" [2].
-
-Sources:
-[1] Ray Dalio, WTF Is Wealth?, 12:34
-[2] Nikhil Kamath, WTF Is Wealth?, 15:22"""
+                extra_headers=PROMPT_CACHING_HEADERS,
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+        except Exception:
+            anthropic_circuit.record_failure()
+            raise
+        anthropic_circuit.record_success()
+
+    def _get_system_prompt(self) -> list[dict]:
+        """System prompt for RAG with strict grounding, as a cacheable block."""
+        return [
+            {
+                "type": "text",
+                "text": SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
 
     def _build_context(self, search_results: list[SearchResult]) -> str:
         """Build context string from search results."""
-        context_parts = []
-
-        for i, result in enumerate(search_results, 1):
-            context_parts.append(
-                f"""
-[Source {i}]
-Episode: {result.episode_title}
-Speaker: {result.speaker or "Unknown"}
-Channel: {result.channel_name}
-Timestamp: {result.timestamp}
----
-{result.text}
----
-"""
-            )
-
-        return "\n".join(context_parts)
+        # Adjacent f-strings compile to a single string build per source, and
+        # the sources are joined once
+        return "\n".join(
+            f"\n[Source {i}]\n"
+            f"Episode: {result.episode_title}\n"
+            f"Speaker: {result.speaker or 'Unknown'}\n"
+            f"Channel: {result.channel_name}\n"
+            f"Timestamp: {result.timestamp}\n"
+            f"---\n{result.text}\n---\n"
+            for i, result in enumerate(search_results, 1)
+        )
 
     def _build_messages(
         self,
@@ -196,11 +342,17 @@ Timestamp: {result.timestamp}
         context: str,
         conversation_history: list[dict],
     ) -> list[dict]:
-        """Build message list for Claude API."""
+        """
+        Build message list for Claude API.
+
+        Order is [system] -> [history] -> [fresh context + question], so the
+        system prompt and history form a prefix that stays byte-identical
+        from one turn to the next and can be served from the prompt cache.
+        """
         messages = []
 
-        # Add conversation history
-        for msg in conversation_history[-10:]:  # Keep last 10 messages
+        # Add conversation history from a stepped window (see _history_window)
+        for msg in self._history_window(conversation_history):
             messages.append(
                 {
                     "role": msg.get("role", "user"),
@@ -208,7 +360,19 @@ Timestamp: {result.timestamp}
                 }
             )
 
-        # Add current message with context
+        # Cache breakpoint after the history: the next turn replays the same
+        # prefix (plus two new messages) and reads it from cache
+        if messages:
+            messages[-1]["content"] = [
+                {
+                    "type": "text",
+                    "text": messages[-1]["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
+
+        # Add current message with context. It changes every turn, so it
+        # carries no cache breakpoint; only the stable prefix above does
         user_message = f"""Based on the following podcast transcript excerpts, please answer my question.
 
 CONTEXT:
@@ -228,6 +392,24 @@ Remember to cite the specific episode and speaker when referencing information f
 
         return messages
 
+    @staticmethod
+    def _history_window(conversation_history: list[dict]) -> list[dict]:
+        """
+        Select history to replay, compacting in fixed steps.
+
+        A sliding tail window shifts the first message every turn, which
+        breaks prompt-cache prefixes. Instead the window start is anchored
+        to the conversation start and only advances in HISTORY_COMPACT_STEP
+        jumps once HISTORY_MAX_MESSAGES is exceeded, so the replayed prefix
+        is identical across most turns. The start is derived from the
+        history length alone, so no state needs to be stored.
+        """
+        overflow = len(conversation_history) - HISTORY_MAX_MESSAGES
+        if overflow <= 0:
+            return conversation_history
+        start = (overflow // HISTORY_COMPACT_STEP + 1) * HISTORY_COMPACT_STEP
+        return conversation_history[start:]
+
     def _build_citations(self, search_results: list[SearchResult]) -> list[Citation]:
         """Build citation list from search results."""
         citations = []
@@ -241,11 +423,8 @@ Remember to cite the specific episode and speaker when referencing information f
                     channel_name=result.channel_name,
                     channel_slug=result.channel_slug,
                     speaker=result.speaker,
-                    text=(
-                        result.text[:500] + "..."
-                        if len(result.text) > 500
-                        else result.text
-                    ),
+                    # Older points and keyword-only hits carry no preview
+                    text=result.text_preview or text_preview(result.text),
                     timestamp=result.timestamp,
                     timestamp_ms=result.timestamp_ms,
                     published_at=result.published_at,
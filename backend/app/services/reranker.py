@@ -1,8 +1,16 @@
 """Re-ranking service using cross-encoder."""
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
+
+import numpy as np
 from loguru import logger
 
+from app.config import settings
+
 try:
     from sentence_transformers import CrossEncoder
 
@@ -11,6 +19,182 @@ except ImportError:
     CROSS_ENCODER_AVAILABLE = False
     logger.warning("sentence-transformers not installed, re-ranking disabled")
 
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+class OnnxCrossEncoder:
+    """
+    ONNX export of a cross-encoder: int8-quantized on CPU, FP32 on CUDA.
+
+    Exposes the same ``predict(pairs, batch_size)`` contract as
+    sentence-transformers' CrossEncoder so RerankerService can use either.
+    The export + dynamic quantization runs once (needs ``optimum``) and is
+    cached under ``cache_dir``; later loads only need onnxruntime.
+    """
+
+    MODEL_FILE = "model.onnx"
+    QUANTIZED_FILE = "model_quantized.onnx"
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: str,
+        max_length: int = 256,
+        num_threads: int = 0,
+    ):
+        model_dir = Path(cache_dir) / model_name.replace("/", "__")
+        if not (model_dir / self.QUANTIZED_FILE).exists():
+            self._export(model_name, model_dir)
+
+        # int8 dynamic quantization only pays off on CPU; on a GPU run the
+        # unquantized graph with the CUDA provider
+        if "CUDAExecutionProvider" in ort.get_available_providers():
+            model_path = model_dir / self.MODEL_FILE
+            providers = ["CUDAExecutionProvider", "CPUExecutionProvider"]
+        else:
+            model_path = model_dir / self.QUANTIZED_FILE
+            providers = ["CPUExecutionProvider"]
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.max_length = max_length
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.session = ort.InferenceSession(
+            str(model_path), sess_options=options, providers=providers
+        )
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+    @staticmethod
+    def _export(model_name: str, model_dir: Path):
+        """Export the HF model to ONNX and quantize weights to int8."""
+        from optimum.onnxruntime import (
+            ORTModelForSequenceClassification,
+            ORTQuantizer,
+        )
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        logger.info(f"Exporting {model_name} to int8 ONNX in {model_dir}")
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, export=True
+        )
+        model.save_pretrained(model_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+
+        quantizer = ORTQuantizer.from_pretrained(model)
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=True)
+        quantizer.quantize(save_dir=model_dir, quantization_config=qconfig)
+
+    def predict(self, pairs: list[tuple[str, str]], batch_size: int = 32):
+        """Score (query, document) pairs, padding to the longest pair per batch."""
+        scores = []
+        for start in range(0, len(pairs), batch_size):
+            batch = pairs[start : start + batch_size]
+            encoded = self.tokenizer(
+                [q for q, _ in batch],
+                [d for _, d in batch],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feeds = {
+                name: value.astype(np.int64)
+                for name, value in encoded.items()
+                if name in self._input_names
+            }
+            logits = self.session.run(None, feeds)[0]
+            scores.append(logits[:, 0])
+
+        # Single-logit MS MARCO models: match CrossEncoder's sigmoid activation
+        return 1.0 / (1.0 + np.exp(-np.concatenate(scores)))
+
+
+def _best_window(ids: np.ndarray, query_ids: np.ndarray, size: int) -> int:
+    """Start of the ``size``-token window of ``ids`` with the most query tokens."""
+    hits = np.concatenate(([0], np.cumsum(np.isin(ids, query_ids))))
+    # Window sums via prefix sums; argmax keeps the earliest best window
+    return int(np.argmax(hits[size:] - hits[:-size]))
+
+
+# Loaded models are shared process-wide, keyed by (model_name, use_onnx), so
+# per-request RerankerService instances don't each pay the model load
+_MODELS: dict[tuple[str, bool], "CrossEncoder | OnnxCrossEncoder"] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+# A single inference thread: forward passes from concurrent requests run one
+# at a time (each already uses all intra-op threads) and never on the loop
+_INFERENCE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="reranker")
+
+
+class _PredictBatcher:
+    """
+    Coalesce concurrent rerank calls on one model into shared forward passes.
+
+    Requests queue on the event loop and a single consumer scores them with
+    one ``predict`` on the inference thread, resolving each caller's future
+    with its own slice of the scores. A request that finds the model idle
+    is dispatched at once; requests arriving while a pass is in flight wait
+    for it and then go out together (up to ``max_batch`` pairs).
+    """
+
+    def __init__(self, service: "RerankerService", max_batch: int):
+        self.model = service._model
+        self.loop = asyncio.get_running_loop()
+        self._service = service
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, query: str, documents: list[str], batch_size: int):
+        """Queue one request and wait for its scores."""
+        future = self.loop.create_future()
+        self._queue.put_nowait((query, documents, batch_size, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        while not self._queue.empty():
+            # Everything that queued up while the last pass ran, no waiting
+            batch, pairs = [], 0
+            while not self._queue.empty() and pairs < self._max_batch:
+                item = self._queue.get_nowait()
+                batch.append(item)
+                pairs += len(item[1])
+
+            requests = [(query, documents) for query, documents, _, _ in batch]
+            batch_size = max(item[2] for item in batch)
+            try:
+                results = await self.loop.run_in_executor(
+                    _INFERENCE_EXECUTOR,
+                    self._service._predict_many,
+                    requests,
+                    batch_size,
+                )
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(batch) > 1:
+                logger.debug(f"Re-ranked {len(batch)} requests in one batch")
+            for (*_, future), scores in zip(batch, results):
+                if not future.done():
+                    future.set_result(scores)
+
+
+_BATCHERS: dict[int, _PredictBatcher] = {}
+
 
 class RerankerService:
     """
@@ -29,27 +213,75 @@ class RerankerService:
 
     DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
-    def __init__(self, model_name: str = None):
+    def __init__(self, model_name: str = None, use_onnx: bool = None):
         self.model_name = model_name or self.DEFAULT_MODEL
-        self._model: Optional[CrossEncoder] = None
+        self.use_onnx = settings.RERANKER_USE_ONNX if use_onnx is None else use_onnx
+        self._model: Optional["CrossEncoder | OnnxCrossEncoder"] = None
         self._model_loaded = False
 
     def _load_model(self):
-        """Lazy load the model."""
-        if not CROSS_ENCODER_AVAILABLE:
+        """Load the shared model once per process, preferring int8 ONNX on CPU."""
+        if not CROSS_ENCODER_AVAILABLE or self._model_loaded:
             return
 
+        key = (self.model_name, self.use_onnx)
+        with _MODELS_LOCK:
+            if key not in _MODELS:
+                _MODELS[key] = self._create_model()
+        self._model = _MODELS[key]
+        self._model_loaded = True
+
+    def _create_model(self) -> "CrossEncoder | OnnxCrossEncoder":
+        """Build the cross-encoder backend for this service's settings."""
+        if self.use_onnx and ONNX_AVAILABLE:
+            try:
+                logger.info(f"Loading int8 ONNX cross-encoder: {self.model_name}")
+                model = OnnxCrossEncoder(
+                    self.model_name,
+                    settings.RERANKER_ONNX_DIR,
+                    max_length=settings.RERANKER_MAX_LENGTH,
+                    num_threads=settings.RERANKER_THREADS,
+                )
+                logger.info("ONNX cross-encoder loaded")
+                return model
+            except Exception as e:
+                logger.warning(f"ONNX reranker unavailable, using PyTorch: {e}")
+
+        logger.info(f"Loading cross-encoder model: {self.model_name}")
+        if settings.RERANKER_THREADS:
+            import torch
+
+            torch.set_num_threads(settings.RERANKER_THREADS)
+        model = CrossEncoder(self.model_name, max_length=settings.RERANKER_MAX_LENGTH)
+        logger.info("Cross-encoder model loaded")
+        return model
+
+    async def _ensure_model(self):
+        """Load the model in a worker thread so a cold load doesn't block the loop."""
         if not self._model_loaded:
-            logger.info(f"Loading cross-encoder model: {self.model_name}")
-            self._model = CrossEncoder(self.model_name)
-            self._model_loaded = True
-            logger.info("Cross-encoder model loaded")
+            await asyncio.to_thread(self._load_model)
+
+    @classmethod
+    async def warmup(cls, model_name: str = None):
+        """Load the default model and run one prediction to prime its kernels."""
+        if not CROSS_ENCODER_AVAILABLE:
+            return
+
+        service = cls(model_name)
+        try:
+            await service._ensure_model()
+            if service._model:
+                await asyncio.to_thread(service._model.predict, [("warm", "up")])
+                logger.info(f"Reranker warmed up: {service.model_name}")
+        except Exception as e:
+            logger.warning(f"Reranker warmup failed: {e}")
 
     async def rerank(
         self,
         query: str,
         results: list[dict],
         top_k: int = 10,
+        batch_size: int = 32,
     ) -> list[dict]:
         """
         Re-rank results using cross-encoder.
@@ -58,27 +290,32 @@ class RerankerService:
             query: Search query
             results: List of search results with 'text' field
             top_k: Number of results to return
+            batch_size: Number of pairs scored per forward pass
 
         Returns:
-            Re-ranked results sorted by relevance
+            Re-ranked results sorted by relevance (the input dicts, updated
+            in place with rerank_score/original_score)
         """
         if not results:
             return []
 
-        if not CROSS_ENCODER_AVAILABLE or len(results) <= 1:
+        if not CROSS_ENCODER_AVAILABLE or len(results) <= 2:
+            return results[:top_k]
+
+        if self._has_confident_top(results, settings.RERANKER_SKIP_GAP):
+            logger.debug("Skipping re-rank: top result is the clear semantic winner")
             return results[:top_k]
 
-        self._load_model()
+        await self._ensure_model()
 
         if not self._model:
             return results[:top_k]
 
         try:
-            # Create query-document pairs
-            pairs = [(query, r.get("text", "")) for r in results]
-
-            # Get relevance scores
-            scores = self._model.predict(pairs)
+            # Get relevance scores (padded per batch, not per pair) on the
+            # inference thread, batched with any concurrent requests
+            documents = [r.get("text", "") for r in results]
+            scores = await self._score(query, documents, batch_size)
 
             # Combine results with scores
             scored_results = list(zip(results, scores))
@@ -86,13 +323,13 @@ class RerankerService:
             # Sort by cross-encoder score (descending)
             scored_results.sort(key=lambda x: x[1], reverse=True)
 
-            # Update scores and return top-k
+            # Update scores in place and return top-k (callers hand over
+            # freshly fused dicts, so no defensive copy is needed)
             reranked = []
             for result, ce_score in scored_results[:top_k]:
-                result = result.copy()
-                result["rerank_score"] = float(ce_score)
+                ce_score = float(ce_score)
                 result["original_score"] = result.get("score", 0)
-                result["score"] = float(ce_score)  # Use rerank score as primary
+                result["rerank_score"] = result["score"] = ce_score
                 reranked.append(result)
 
             logger.debug(f"Re-ranked {len(results)} results to {len(reranked)}")
@@ -102,19 +339,112 @@ class RerankerService:
             logger.error(f"Re-ranking failed: {e}")
             return results[:top_k]
 
+    async def _score(self, query: str, documents: list[str], batch_size: int = 32):
+        """Score documents through the model's shared dynamic batcher."""
+        batcher = _BATCHERS.get(id(self._model))
+        if (
+            batcher is None
+            or batcher.model is not self._model
+            or batcher.loop is not asyncio.get_running_loop()
+        ):
+            batcher = _BATCHERS[id(self._model)] = _PredictBatcher(
+                self,
+                max_batch=settings.RERANKER_MAX_BATCH,
+            )
+        return await batcher.submit(query, documents, batch_size)
+
+    def _predict_many(
+        self, requests: list[tuple[str, list[str]]], batch_size: int = 32
+    ) -> list:
+        """
+        Score several (query, documents) requests with one ``predict`` call.
+
+        Each document is trimmed to the token budget for its own query; the
+        flat score array is split back into one slice per request.
+        """
+        pairs = []
+        for query, documents in requests:
+            documents = self._truncate_documents(query, documents)
+            pairs.extend((query, doc) for doc in documents)
+
+        scores = self._model.predict(pairs, batch_size=batch_size)
+
+        results, start = [], 0
+        for _, documents in requests:
+            results.append(scores[start : start + len(documents)])
+            start += len(documents)
+        return results
+
+    def _truncate_documents(self, query: str, documents: list[str]) -> list[str]:
+        """
+        Trim documents to fit RERANKER_MAX_LENGTH alongside the query.
+
+        The model would otherwise keep only each document's head. Instead we
+        keep the window of tokens with the most query-token hits, so the
+        part of a long chunk that matches the query is what gets scored.
+        """
+        tokenizer = getattr(self._model, "tokenizer", None)
+        if tokenizer is None:
+            return documents
+
+        query_ids = tokenizer(query, add_special_tokens=False)["input_ids"]
+        # [CLS] query [SEP] doc [SEP]
+        budget = settings.RERANKER_MAX_LENGTH - len(query_ids) - 3
+        if budget <= 0:
+            return documents
+
+        query_ids = np.array(sorted(set(query_ids)))
+        doc_ids = tokenizer(documents, add_special_tokens=False)["input_ids"]
+
+        truncated = []
+        for doc, ids in zip(documents, doc_ids):
+            if len(ids) <= budget:
+                truncated.append(doc)
+                continue
+            start = _best_window(np.array(ids), query_ids, budget)
+            truncated.append(tokenizer.decode(ids[start : start + budget]))
+        return truncated
+
+    @staticmethod
+    def _has_confident_top(results: list[dict], gap: float) -> bool:
+        """
+        Whether the top result is the clear semantic winner.
+
+        True when results[0] has the highest cosine ``semantic_score`` of
+        the candidates and leads the semantic runner-up by more than
+        ``gap``. Skipping then leaves results[0] first, where the
+        cross-encoder would almost certainly put it too.
+        """
+        if not gap:
+            return False
+        lead = results[0].get("semantic_score")
+        if lead is None:
+            return False
+        runner_up = max(
+            (
+                score
+                for r in results[1:]
+                if (score := r.get("semantic_score")) is not None
+            ),
+            default=None,
+        )
+        if runner_up is None:
+            return False
+        return lead - runner_up > gap
+
     async def score_pair(self, query: str, document: str) -> float:
         """Score a single query-document pair."""
         if not CROSS_ENCODER_AVAILABLE:
             return 0.0
 
-        self._load_model()
+        await self._ensure_model()
 
         if not self._model:
             return 0.0
 
         try:
-            score = self._model.predict([(query, document)])[0]
-            return float(score)
+            scores = await self._score(query, [document])
+            return float(scores[0])
         except Exception as e:
             logger.error(f"Scoring failed: {e}")
             return 0.0
@@ -128,14 +458,13 @@ class RerankerService:
         if not CROSS_ENCODER_AVAILABLE or not documents:
             return [0.0] * len(documents)
 
-        self._load_model()
+        await self._ensure_model()
 
         if not self._model:
             return [0.0] * len(documents)
 
         try:
-            pairs = [(query, doc) for doc in documents]
-            scores = self._model.predict(pairs)
+            scores = await self._score(query, documents)
             return [float(s) for s in scores]
         except Exception as e:
             logger.error(f"Batch scoring failed: {e}")
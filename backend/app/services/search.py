@@ -1,3 +1,4 @@
+import asyncio
 import time
 from datetime import datetime
 from uuid import UUID
@@ -37,6 +38,7 @@ class SearchService:
         date_to: datetime | None = None,
         include_context: bool = True,
         context_utterances: int = 3,
+        query_vector: list[float] | None = None,
     ) -> tuple[list[SearchResult], int]:
         """
         Semantic search with metadata filtering.
@@ -51,6 +53,7 @@ class SearchService:
             date_to: Filter by maximum published date
             include_context: Include surrounding utterances
             context_utterances: Number of utterances to include before/after
+            query_vector: Precomputed embedding of the query, if available
 
         Returns:
             Tuple of (results list, processing time in ms)
@@ -59,14 +62,14 @@ class SearchService:
 
         logger.info(f"Searching for: {query}")
 
-        # Resolve channel_slug to channel_id if needed
-        if channel_slug and not channel_id:
-            channel = await self._get_channel_by_slug(channel_slug)
-            if channel:
-                channel_id = channel.id
-
-        # Generate query embedding
-        query_vector = await self.embedding_service.embed_query(query)
+        # Resolve channel_slug and embed the query concurrently; they're
+        # independent round trips (Postgres and the embedding API)
+        channel, query_vector = await asyncio.gather(
+            self._resolve_channel(channel_slug if not channel_id else None),
+            self._resolve_query_vector(query, query_vector),
+        )
+        if channel:
+            channel_id = channel.id
 
         # Search Qdrant
         vector_results = await self.vector_store.search(
@@ -107,6 +110,20 @@ class SearchService:
             speaker=speaker,
         )
 
+    async def _resolve_channel(self, slug: str | None) -> Channel | None:
+        """Look up the channel for a slug filter, if one was given."""
+        if not slug:
+            return None
+        return await self._get_channel_by_slug(slug)
+
+    async def _resolve_query_vector(
+        self, query: str, query_vector: list[float] | None
+    ) -> list[float]:
+        """Embed the query unless the caller already has its vector."""
+        if query_vector is not None:
+            return query_vector
+        return await self.embedding_service.embed_query(query)
+
     async def _get_channel_by_slug(self, slug: str) -> Channel | None:
         """Get channel by slug."""
         result = await self.db.execute(select(Channel).where(Channel.slug == slug))
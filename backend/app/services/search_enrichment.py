@@ -4,14 +4,70 @@ Shared search result enrichment service.
 Fixes N+1 query problems by batch-loading episodes and channels.
 """
 
+from datetime import datetime
 from uuid import UUID
-from typing import Optional
-from sqlalchemy import select
+from typing import NamedTuple, Optional
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Integer,
+    any_,
+    bindparam,
+    case,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
+from app.config import settings
 from app.models import Episode, Channel, Utterance
-from app.schemas.search import SearchResult
+from app.schemas.search import ContextUtterance, SearchResult
+from app.services.cache import TTLCache
+
+# Episode/channel display fields, shared by every request in the process
+_episode_cache = TTLCache(
+    maxsize=settings.ENRICHMENT_CACHE_SIZE, ttl=settings.ENRICHMENT_CACHE_TTL
+)
+_channel_cache = TTLCache(
+    maxsize=settings.ENRICHMENT_CACHE_SIZE, ttl=settings.ENRICHMENT_CACHE_TTL
+)
+
+
+class EpisodeInfo(NamedTuple):
+    """Episode fields shown on a search result (detached from the session)."""
+
+    id: UUID
+    title: str
+    url: str | None
+    thumbnail_url: str | None
+    published_at: datetime | None
+
+    @staticmethod
+    def columns():
+        return (
+            Episode.id,
+            Episode.title,
+            Episode.url,
+            Episode.thumbnail_url,
+            Episode.published_at,
+        )
+
+
+class ChannelInfo(NamedTuple):
+    """Channel fields shown on a search result (detached from the session)."""
+
+    id: UUID
+    name: str
+    slug: str
+
+    @staticmethod
+    def columns():
+        return (Channel.id, Channel.name, Channel.slug)
 
 
 class SearchEnrichmentService:
@@ -19,15 +75,35 @@ class SearchEnrichmentService:
     Enriches search results with episode/channel data efficiently.
 
     Uses batch loading to avoid N+1 queries:
-    - Collects all unique episode_ids and channel_ids
-    - Loads all in 2 queries instead of 2*N queries
-    - Caches loaded entities for context fetching
+    - Collects all unique episode_ids
+    - Loads episodes joined to their channels in 1 query instead of 2*N
+    - Caches the display fields process-wide (TTL), so hot episodes
+      enrich without touching Postgres
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        episode_cache: TTLCache | None = None,
+        channel_cache: TTLCache | None = None,
+    ):
         self.db = db
-        self._episode_cache: dict[UUID, Episode] = {}
-        self._channel_cache: dict[UUID, Channel] = {}
+        # Shared across instances unless injected; values are plain tuples
+        # (no ORM state), so they outlive the request's session
+        self._episode_cache: TTLCache = (
+            _episode_cache if episode_cache is None else episode_cache
+        )
+        self._channel_cache: TTLCache = (
+            _channel_cache if channel_cache is None else channel_cache
+        )
+
+    @classmethod
+    def evict(cls, episode_id: UUID | None = None, channel_id: UUID | None = None):
+        """Drop cached entities after they change (e.g. channel renamed)."""
+        if episode_id:
+            _episode_cache.pop(episode_id)
+        if channel_id:
+            _channel_cache.pop(channel_id)
 
     async def preload_entities(self, vector_results: list[dict]) -> None:
         """
@@ -35,37 +111,66 @@ class SearchEnrichmentService:
 
         Call this ONCE before enriching multiple results.
         """
-        # Collect unique IDs
+        # Collect unique IDs not already cached (each episode belongs to
+        # exactly one channel, so the episode IDs are enough)
         episode_ids = set()
-        channel_ids = set()
+        cached = 0
 
         for result in vector_results:
-            try:
-                episode_ids.add(UUID(result.get("episode_id")))
-                channel_ids.add(UUID(result.get("channel_id")))
-            except (ValueError, TypeError):
+            ids = self._parse_ids(result)
+            if not ids:
                 continue
+            if ids[0] in self._episode_cache and ids[1] in self._channel_cache:
+                cached += 1
+            else:
+                episode_ids.add(ids[0])
 
-        # Batch load episodes (single query)
+        # Batch load missing episodes with their channels (single query)
         if episode_ids:
-            ep_result = await self.db.execute(
-                select(Episode).where(Episode.id.in_(episode_ids))
+            rows = await self.db.execute(
+                select(*EpisodeInfo.columns(), *ChannelInfo.columns())
+                .join(Channel, Episode.channel_id == Channel.id)
+                .where(self._any_of(Episode.id, episode_ids))
             )
-            for episode in ep_result.scalars():
+            split = len(EpisodeInfo._fields)
+            for row in rows:
+                episode = EpisodeInfo(*row[:split])
+                channel = ChannelInfo(*row[split:])
                 self._episode_cache[episode.id] = episode
-
-        # Batch load channels (single query)
-        if channel_ids:
-            ch_result = await self.db.execute(
-                select(Channel).where(Channel.id.in_(channel_ids))
-            )
-            for channel in ch_result.scalars():
                 self._channel_cache[channel.id] = channel
 
-        logger.debug(
-            f"Preloaded {len(self._episode_cache)} episodes, "
-            f"{len(self._channel_cache)} channels"
-        )
+        logger.debug(f"Preloaded {len(episode_ids)} episodes ({cached} results cached)")
+
+    def _any_of(self, column, values) -> ColumnElement[bool]:
+        """
+        Membership test that compiles to one statement for any list size.
+
+        On Postgres this is ``column = ANY(:array)``, so asyncpg reuses one
+        prepared statement instead of one per IN-list length. Other dialects
+        (SQLite in tests) get a plain IN list.
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            array = bindparam(None, list(values), type_=ARRAY(column.type))
+            return column == any_(array)
+        return column.in_(values)
+
+    @staticmethod
+    def _parse_ids(vector_result: dict) -> tuple[UUID, UUID] | None:
+        """
+        Parse (episode_id, channel_id) once per result.
+
+        The parsed UUIDs are cached on the dict under ``_ids`` so preloading,
+        context fetching and building don't each re-parse them.
+        """
+        if "_ids" not in vector_result:
+            try:
+                vector_result["_ids"] = (
+                    UUID(vector_result.get("episode_id")),
+                    UUID(vector_result.get("channel_id")),
+                )
+            except (ValueError, TypeError):
+                vector_result["_ids"] = None
+        return vector_result["_ids"]
 
     async def enrich_result(
         self,
@@ -78,12 +183,26 @@ class SearchEnrichmentService:
 
         Uses cached entities from preload_entities().
         """
-        try:
-            episode_id = UUID(vector_result.get("episode_id"))
-            channel_id = UUID(vector_result.get("channel_id"))
-        except (ValueError, TypeError):
+        context_before, context_after = [], []
+        if include_context:
+            [(context_before, context_after)] = await self._get_context_utterances(
+                [vector_result], count=context_count
+            )
+
+        return self._build_result(vector_result, context_before, context_after)
+
+    def _build_result(
+        self,
+        vector_result: dict,
+        context_before: list[ContextUtterance],
+        context_after: list[ContextUtterance],
+    ) -> Optional[SearchResult]:
+        """Build a SearchResult from a vector result and its fetched context."""
+        ids = self._parse_ids(vector_result)
+        if not ids:
             logger.warning(f"Invalid UUID in vector result: {vector_result}")
             return None
+        episode_id, channel_id = ids
 
         # Get from cache (already loaded)
         episode = self._episode_cache.get(episode_id)
@@ -93,20 +212,6 @@ class SearchEnrichmentService:
             logger.warning(f"Missing episode/channel: {episode_id}, {channel_id}")
             return None
 
-        # Get context if requested
-        context_before = []
-        context_after = []
-
-        if include_context:
-            start_ms = vector_result.get("start_ms", 0)
-            end_ms = vector_result.get("end_ms", 0)
-            context_before, context_after = await self._get_context_utterances(
-                episode_id=episode_id,
-                start_ms=start_ms,
-                end_ms=end_ms,
-                count=context_count,
-            )
-
         # Format timestamp
         start_ms = vector_result.get("start_ms", 0)
         total_seconds = start_ms // 1000
@@ -132,6 +237,7 @@ class SearchEnrichmentService:
             score=vector_result.get("score", 0),
             context_before=context_before,
             context_after=context_after,
+            text_preview=vector_result.get("text_preview"),
         )
 
     async def enrich_results(
@@ -148,17 +254,21 @@ class SearchEnrichmentService:
         if not vector_results:
             return []
 
-        # Preload all entities in 2 queries
+        # Preload all entities in 1 query
         await self.preload_entities(vector_results)
 
-        # Enrich each result (no more N+1 for episode/channel)
-        results = []
-        for vector_result in vector_results:
-            enriched = await self.enrich_result(
-                vector_result,
-                include_context=include_context,
-                context_count=context_count,
+        # Context windows for every result in 1 query
+        if include_context:
+            contexts = await self._get_context_utterances(
+                vector_results, count=context_count
             )
+        else:
+            contexts = [([], [])] * len(vector_results)
+
+        # Enrich each result (no more N+1 for episode/channel/context)
+        results = []
+        for vector_result, (before, after) in zip(vector_results, contexts):
+            enriched = self._build_result(vector_result, before, after)
             if enriched:
                 results.append(enriched)
 
@@ -166,56 +276,139 @@ class SearchEnrichmentService:
 
     async def _get_context_utterances(
         self,
-        episode_id: UUID,
-        start_ms: int,
-        end_ms: int,
+        vector_results: list[dict],
         count: int = 2,
-    ) -> tuple[list[dict], list[dict]]:
+    ) -> list[tuple[list[ContextUtterance], list[ContextUtterance]]]:
         """
-        Get surrounding utterances for context.
+        Get surrounding utterances for a batch of results in one query.
 
-        Optimized: Uses compound query with UNION instead of 2 separate queries.
+        Each result's (episode_id, start_ms, end_ms) window is joined against
+        its episode's utterances and the nearest ``count`` on each side are
+        kept. Returns (context_before, context_after) per input result.
         """
-        # Get before context (utterances ending before our start)
-        before_result = await self.db.execute(
-            select(Utterance)
-            .where(Utterance.episode_id == episode_id)
-            .where(Utterance.end_ms < start_ms)
-            .order_by(Utterance.end_ms.desc())
-            .limit(count)
-        )
-        before_utterances = list(reversed(before_result.scalars().all()))
-
-        # Get after context (utterances starting after our end)
-        after_result = await self.db.execute(
-            select(Utterance)
-            .where(Utterance.episode_id == episode_id)
-            .where(Utterance.start_ms > end_ms)
-            .order_by(Utterance.start_ms.asc())
-            .limit(count)
-        )
-        after_utterances = list(after_result.scalars().all())
+        # Inline the windows as a UNION ALL of literal rows (portable, unlike
+        # a VALUES alias with column names on SQLite)
+        windows = []
+        for idx, vector_result in enumerate(vector_results):
+            ids = self._parse_ids(vector_result)
+            if not ids:
+                continue
+            episode_id = ids[0]
+            windows.append(
+                select(
+                    literal(idx, Integer).label("idx"),
+                    literal(episode_id, Utterance.episode_id.type).label("episode_id"),
+                    literal(vector_result.get("start_ms", 0), Integer).label(
+                        "start_ms"
+                    ),
+                    literal(vector_result.get("end_ms", 0), Integer).label("end_ms"),
+                )
+            )
 
-        # Format as ContextUtterance objects
-        from app.schemas.search import ContextUtterance
+        before_by_idx: dict[int, list[ContextUtterance]] = {}
+        after_by_idx: dict[int, list[ContextUtterance]] = {}
 
-        context_before = [
-            ContextUtterance(
-                speaker=u.speaker,
-                text=u.text,
-                start_ms=u.start_ms,
-                end_ms=u.end_ms,
-            )
-            for u in before_utterances
+        if windows and count > 0:
+            w = (union_all(*windows) if len(windows) > 1 else windows[0]).cte("windows")
+
+            if self.db.get_bind().dialect.name == "postgresql":
+                stmt = self._lateral_context_stmt(w, count)
+            else:
+                stmt = self._ranked_context_stmt(w, count)
+            result = await self.db.execute(stmt)
+
+            for row in result:
+                bucket = before_by_idx if row.is_before else after_by_idx
+                bucket.setdefault(row.idx, []).append(self._to_context(row))
+
+        contexts = [
+            (before_by_idx.get(idx, []), after_by_idx.get(idx, []))
+            for idx in range(len(vector_results))
         ]
-        context_after = [
-            ContextUtterance(
-                speaker=u.speaker,
-                text=u.text,
-                start_ms=u.start_ms,
-                end_ms=u.end_ms,
+
+        return contexts
+
+    @staticmethod
+    def _lateral_context_stmt(w, count: int):
+        """
+        Context rows via one LATERAL ``ORDER BY ... LIMIT`` per side.
+
+        Each side reads at most ``count`` rows per window off the
+        (episode_id, start_ms, end_ms) index instead of every utterance of
+        the episode. Utterances don't overlap, so start_ms order is also
+        end_ms order.
+        """
+
+        def side(is_before: bool):
+            nearest = select(
+                Utterance.speaker, Utterance.text, Utterance.start_ms, Utterance.end_ms
+            ).where(Utterance.episode_id == w.c.episode_id)
+            if is_before:
+                nearest = nearest.where(
+                    Utterance.start_ms < w.c.start_ms, Utterance.end_ms < w.c.start_ms
+                ).order_by(Utterance.start_ms.desc(), Utterance.end_ms.desc())
+            else:
+                nearest = nearest.where(Utterance.start_ms > w.c.end_ms).order_by(
+                    Utterance.start_ms, Utterance.end_ms
+                )
+            nearest = nearest.limit(count).lateral()
+            return select(
+                w.c.idx,
+                literal(is_before).label("is_before"),
+                nearest.c.speaker,
+                nearest.c.text,
+                nearest.c.start_ms,
+                nearest.c.end_ms,
+            ).join(nearest, true())
+
+        rows = union_all(side(True), side(False)).subquery()
+        # Chronological order comes from SQL, so buckets need no sorting
+        return select(rows).order_by(rows.c.idx, rows.c.start_ms, rows.c.end_ms)
+
+    @staticmethod
+    def _ranked_context_stmt(w, count: int):
+        """
+        Portable context rows: row_number() keeps the nearest ``count`` per side.
+
+        Used off Postgres (SQLite in tests), which has no LATERAL.
+        """
+        # Before context ends before the window starts; after context
+        # starts after it ends. Rank each side by distance to the window.
+        is_before = Utterance.end_ms < w.c.start_ms
+        ranked = (
+            select(
+                w.c.idx,
+                is_before.label("is_before"),
+                Utterance.speaker,
+                Utterance.text,
+                Utterance.start_ms,
+                Utterance.end_ms,
+                func.row_number()
+                .over(
+                    partition_by=(w.c.idx, is_before),
+                    order_by=case(
+                        (is_before, -Utterance.end_ms), else_=Utterance.start_ms
+                    ),
+                )
+                .label("rn"),
             )
-            for u in after_utterances
-        ]
+            .join(Utterance, Utterance.episode_id == w.c.episode_id)
+            .where(or_(is_before, Utterance.start_ms > w.c.end_ms))
+            .subquery()
+        )
+        # Chronological order comes from SQL, so buckets need no sorting
+        return (
+            select(ranked)
+            .where(ranked.c.rn <= count)
+            .order_by(ranked.c.idx, ranked.c.start_ms, ranked.c.end_ms)
+        )
 
-        return context_before, context_after
+    @staticmethod
+    def _to_context(utterance) -> ContextUtterance:
+        """Format an utterance row as a ContextUtterance."""
+        return ContextUtterance(
+            speaker=utterance.speaker,
+            text=utterance.text,
+            start_ms=utterance.start_ms,
+            end_ms=utterance.end_ms,
+        )
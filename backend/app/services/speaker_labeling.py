@@ -1,9 +1,40 @@
-import json
+import re
+import orjson
+from functools import lru_cache
 from loguru import logger
 import anthropic
 
 from app.config import settings
-from app.services.transcription.base import Utterance
+from app.services.cache import SpeakerMappingCache
+from app.services.transcription.base import PREVIEW_CHARS, Utterance
+
+# The first JSON object in a reply (one level of nesting), wherever Claude
+# put it: bare, in a ``` / ```json fence, or after a sentence
+_JSON_OBJECT = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}")
+
+
+@lru_cache(maxsize=1024)
+def _format_prompt(
+    sample: tuple[tuple[str, str], ...],
+    unique_speakers: tuple[str, ...],
+    known_speakers: tuple[str, ...],
+    episode_title: str | None,
+) -> str:
+    """Format the identification prompt; cached so retries reuse the string."""
+    lines = ["Map these podcast speaker labels to names."]
+    if episode_title:
+        lines.append(f"Episode: {episode_title}")
+    if known_speakers:
+        lines.append(f"Hosts: {', '.join(known_speakers)}")
+    lines.append(f"Labels: {', '.join(unique_speakers)}")
+    lines.append("Excerpts:")
+    lines.extend(f"{speaker}: {text}" for speaker, text in sample)
+    lines.append(
+        'Reply with only a JSON object like {"A": "<name>"}. Use a host name '
+        'only if names or self-references make it clear; otherwise "Guest" '
+        '("Guest 2", "Guest 3" for more).'
+    )
+    return "\n".join(lines)
 
 
 class SpeakerLabelingService:
@@ -13,17 +44,35 @@ class SpeakerLabelingService:
     Maps generic speaker labels (A, B, C) to actual names (Sam Parr, Shaan Puri, Guest).
     """
 
-    def __init__(self):
+    # Evidence sent to Claude: a few lines per speaker, each capped, keeps
+    # the prompt (and so cost and time to first token) small while every
+    # speaker, even a guest heard for five minutes, is represented
+    MIN_SAMPLE_PER_SPEAKER = 3
+    SAMPLE_TEXT_CHARS = PREVIEW_CHARS
+
+    # A capitalized word mid-sentence is most likely a name or company
+    PROPER_NOUN = re.compile(r"(?<=[a-z,;:] )[A-Z][a-z]+")
+
+    def __init__(
+        self,
+        mapping_cache: SpeakerMappingCache | None = None,
+        model: str | None = None,
+    ):
         # Use async client to avoid blocking the event loop
         self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
-        self.model = settings.ANTHROPIC_MODEL
+        # Labeling is a small classification task: a fast model is enough,
+        # with the main model as a retry when its reply doesn't parse
+        self.model = model or settings.ANTHROPIC_MODEL_SPEAKER_ID
+        self.fallback_model = settings.ANTHROPIC_MODEL
+        self.mapping_cache = mapping_cache or SpeakerMappingCache()
 
     async def identify_speakers(
         self,
         utterances: list[Utterance],
         known_speakers: list[str],
-        sample_size: int = 30,
+        sample_size: int = 15,
         episode_title: str | None = None,
+        channel_id: str | None = None,
     ) -> dict[str, str]:
         """
         Identify which speaker label corresponds to which person.
@@ -31,8 +80,9 @@ class SpeakerLabelingService:
         Args:
             utterances: List of utterances with speaker labels (A, B, C, etc.)
             known_speakers: List of known host names ["Sam Parr", "Shaan Puri"]
-            sample_size: Number of utterances to sample for identification
+            sample_size: Utterances to sample, split evenly across speakers
             episode_title: Optional episode title for context
+            channel_id: Optional channel ID, scoping the mapping cache
 
         Returns:
             Mapping of speaker labels to names: {"A": "Sam Parr", "B": "Shaan Puri", "C": "Guest"}
@@ -47,8 +97,17 @@ class SpeakerLabelingService:
             # Only one speaker detected - could be an interview or solo episode
             return {unique_speakers[0]: known_speakers[0] if known_speakers else "Host"}
 
+        # Reprocessing the same episode reuses the earlier mapping
+        evidence = self._speaker_evidence(utterances, unique_speakers)
+        cached = await self.mapping_cache.get(channel_id, known_speakers, evidence)
+        if cached:
+            logger.info(f"Speaker mapping (cached): {cached}")
+            return cached
+
         # Sample utterances for context
-        sample = self._get_representative_sample(utterances, sample_size)
+        sample = self._get_representative_sample(
+            utterances, sample_size, known_speakers
+        )
 
         # Build prompt
         prompt = self._build_identification_prompt(
@@ -61,16 +120,22 @@ class SpeakerLabelingService:
         logger.info(f"Identifying {len(unique_speakers)} speakers using Claude")
 
         try:
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            content = response.content[0].text
-
-            # Parse JSON response
-            mapping = self._parse_response(content, unique_speakers, known_speakers)
+            mapping = await self._request_mapping(self.model, prompt, unique_speakers)
+            if mapping is None and self.fallback_model != self.model:
+                logger.info(
+                    f"Retrying speaker identification with {self.fallback_model}"
+                )
+                mapping = await self._request_mapping(
+                    self.fallback_model, prompt, unique_speakers
+                )
+
+            # Only mappings Claude produced are cached
+            if mapping is None:
+                mapping = self._fallback_mapping(unique_speakers, known_speakers)
+            else:
+                await self.mapping_cache.set(
+                    channel_id, known_speakers, evidence, mapping
+                )
 
             logger.info(f"Speaker mapping: {mapping}")
             return mapping
@@ -80,6 +145,17 @@ class SpeakerLabelingService:
             # Fallback: assign known speakers in order, rest as Guest
             return self._fallback_mapping(unique_speakers, known_speakers)
 
+    async def _request_mapping(
+        self, model: str, prompt: str, unique_speakers: list[str]
+    ) -> dict[str, str] | None:
+        """Ask ``model`` for the mapping; None if its reply doesn't parse."""
+        response = await self.client.messages.create(
+            model=model,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return self._load_mapping(response.content[0].text, unique_speakers)
+
     def apply_speaker_labels(
         self,
         utterances: list[Utterance],
@@ -97,53 +173,75 @@ class SpeakerLabelingService:
         Returns:
             List of utterance dicts with speaker names applied
         """
+        # Resolve every raw label once; unknown speakers become Guest,
+        # Guest 2, ... in order of first appearance
+        names = dict(speaker_mapping)
         guest_counter = 0
-        guest_mapping = {}  # Track unknown speakers to give consistent labels
+        for raw_speaker in dict.fromkeys(u.speaker for u in utterances):
+            if raw_speaker not in names:
+                guest_counter += 1
+                names[raw_speaker] = (
+                    default_label
+                    if guest_counter == 1
+                    else f"{default_label} {guest_counter}"
+                )
+
+        return [
+            {
+                "speaker": names[utt.speaker],
+                "speaker_raw": utt.speaker,
+                "text": utt.text,
+                "start_ms": utt.start_ms,
+                "end_ms": utt.end_ms,
+                "confidence": utt.confidence,
+            }
+            for utt in utterances
+        ]
 
-        result = []
-        for utt in utterances:
-            raw_speaker = utt.speaker
+    def _get_representative_sample(
+        self,
+        utterances: list[Utterance],
+        sample_size: int,
+        known_speakers: list[str] | None = None,
+    ) -> list[Utterance]:
+        """
+        Pick the most telling utterances for each speaker, in episode order.
 
-            if raw_speaker in speaker_mapping:
-                speaker_name = speaker_mapping[raw_speaker]
-            else:
-                # Unknown speaker - assign Guest label
-                if raw_speaker not in guest_mapping:
-                    guest_counter += 1
-                    if guest_counter == 1:
-                        guest_mapping[raw_speaker] = default_label
-                    else:
-                        guest_mapping[raw_speaker] = f"{default_label} {guest_counter}"
-                speaker_name = guest_mapping[raw_speaker]
-
-            result.append(
-                {
-                    "speaker": speaker_name,
-                    "speaker_raw": raw_speaker,
-                    "text": utt.text,
-                    "start_ms": utt.start_ms,
-                    "end_ms": utt.end_ms,
-                    "confidence": utt.confidence,
-                }
+        sample_size is split evenly across speakers, with at least
+        MIN_SAMPLE_PER_SPEAKER each. Lines that mention a known host's first
+        name ("Sam, what do you think?") come first, then lines naming
+        anyone or anything (a mid-sentence proper noun), then the longest.
+        """
+        first_names = [s.split()[0] for s in known_speakers or [] if s.strip()]
+        mentions = (
+            re.compile(
+                r"\b(" + "|".join(map(re.escape, first_names)) + r")\b",
+                re.IGNORECASE,
             )
+            if first_names
+            else None
+        )
 
-        return result
+        by_speaker: dict[str, list[int]] = {}
+        for i, utt in enumerate(utterances):
+            by_speaker.setdefault(utt.speaker, []).append(i)
 
-    def _get_representative_sample(
-        self, utterances: list[Utterance], sample_size: int
-    ) -> list[Utterance]:
-        """Get a representative sample of utterances from different parts of the episode."""
-        if len(utterances) <= sample_size:
-            return utterances
-
-        # Sample from beginning, middle, and end
-        section_size = sample_size // 3
-        beginning = utterances[:section_size]
-        middle_start = len(utterances) // 2 - section_size // 2
-        middle = utterances[middle_start : middle_start + section_size]
-        end = utterances[-section_size:]
+        per_speaker = max(
+            self.MIN_SAMPLE_PER_SPEAKER, sample_size // max(1, len(by_speaker))
+        )
+        picked = []
+        for indices in by_speaker.values():
+            indices.sort(
+                key=lambda i: (
+                    bool(mentions and mentions.search(utterances[i].text)),
+                    bool(self.PROPER_NOUN.search(utterances[i].text)),
+                    len(utterances[i].text),
+                ),
+                reverse=True,
+            )
+            picked.extend(indices[:per_speaker])
 
-        return beginning + middle + end
+        return [utterances[i] for i in sorted(picked)]
 
     def _build_identification_prompt(
         self,
@@ -152,87 +250,52 @@ class SpeakerLabelingService:
         known_speakers: list[str],
         episode_title: str | None,
     ) -> str:
-        """Build the Claude prompt for speaker identification."""
-        # Format sample utterances
-        sample_text = "\n".join(
-            [
-                f"[{u.speaker}]: {u.text[:200]}{'...' if len(u.text) > 200 else ''}"
-                for u in sample
-            ]
+        """Build the (deliberately terse) Claude prompt for speaker identification."""
+        sample_key = tuple((u.speaker, u.preview) for u in sample)
+        return _format_prompt(
+            sample_key,
+            tuple(sorted(unique_speakers)),
+            tuple(known_speakers),
+            episode_title,
         )
 
-        # Build speaker descriptions if we know them
-        speaker_hints = ""
-        if known_speakers:
-            speaker_hints = f"""
-Known hosts of this podcast:
-{chr(10).join(f'- {s}' for s in known_speakers)}
-
-Identification hints:
-- Listen for personal references (e.g., "I built Hampton" likely = Sam Parr)
-- Listen for names mentioned (e.g., "Sam, what do you think?" helps identify Sam)
-- Consider speaking patterns and topics they're known for
-"""
-
-        prompt = f"""Analyze this podcast transcript and identify which speaker label (A, B, C, etc.) corresponds to which person.
-
-{f'Episode Title: {episode_title}' if episode_title else ''}
-{speaker_hints}
-
-Speaker labels found: {', '.join(unique_speakers)}
-
-Transcript sample:
----
-{sample_text}
----
-
-Based on the content, speaking patterns, and any names/references mentioned, create a mapping from speaker labels to names.
-
-Return your answer as a JSON object mapping speaker labels to names.
-For speakers you cannot identify, use "Guest" (or "Guest 2", "Guest 3" for multiple unknown speakers).
-
-Example response format:
-{{"A": "Sam Parr", "B": "Shaan Puri", "C": "Guest"}}
-
-Important:
-- Only use names from the known hosts list if you're confident
-- If unsure, use "Guest" rather than guessing wrong
-- Return ONLY the JSON object, no other text
-"""
-        return prompt
-
-    def _parse_response(
-        self,
-        response: str,
-        unique_speakers: list[str],
-        known_speakers: list[str],
-    ) -> dict[str, str]:
-        """Parse Claude's response into a speaker mapping."""
-        # Try to extract JSON from response
-        response = response.strip()
+    def _speaker_evidence(
+        self, utterances: list[Utterance], unique_speakers: list[str]
+    ) -> dict[str, list[str]]:
+        """Each speaker's opening lines, fingerprinting the episode's diarization."""
+        limit = SpeakerMappingCache.EVIDENCE_PER_SPEAKER
+        evidence = {speaker: [] for speaker in unique_speakers}
+        for utt in utterances:
+            lines = evidence[utt.speaker]
+            if len(lines) < limit:
+                lines.append(utt.text)
+        return evidence
 
-        # Remove markdown code blocks if present
-        if response.startswith("```"):
-            lines = response.split("\n")
-            response = "\n".join(lines[1:-1])
+    def _load_mapping(
+        self, response: str, unique_speakers: list[str]
+    ) -> dict[str, str] | None:
+        """Extract the JSON mapping from Claude's response, or None if invalid."""
+        match = _JSON_OBJECT.search(response)
 
         try:
-            mapping = json.loads(response)
+            if not match:
+                raise ValueError("No JSON object in response")
+            mapping = orjson.loads(match.group(0))
 
             # Validate mapping
             if not isinstance(mapping, dict):
                 raise ValueError("Response is not a dict")
 
             # Ensure all unique speakers are mapped
-            for speaker in unique_speakers:
-                if speaker not in mapping:
-                    mapping[speaker] = "Guest"
+            if not mapping.keys() >= set(unique_speakers):
+                for speaker in unique_speakers:
+                    mapping.setdefault(speaker, "Guest")
 
             return mapping
 
-        except (json.JSONDecodeError, ValueError) as e:
+        except ValueError as e:
             logger.warning(f"Failed to parse speaker mapping: {e}")
-            return self._fallback_mapping(unique_speakers, known_speakers)
+            return None
 
     def _fallback_mapping(
         self,
@@ -1,25 +1,45 @@
+import importlib
+
 from app.services.transcription.base import (
     TranscriptionProvider,
     TranscriptionStatus,
     Utterance,
     TranscriptResult,
+    WordTimings,
 )
 from app.services.transcription.factory import (
     get_provider,
     get_available_providers,
     get_default_provider_name,
+    prewarm_provider,
+    refresh_providers,
 )
-from app.services.transcription.faster_whisper import FasterWhisperProvider
-from app.services.transcription.modal_cloud import ModalCloudProvider
 
 __all__ = [
     "TranscriptionProvider",
     "TranscriptionStatus",
     "Utterance",
     "TranscriptResult",
+    "WordTimings",
     "get_provider",
     "get_available_providers",
     "get_default_provider_name",
+    "prewarm_provider",
+    "refresh_providers",
     "FasterWhisperProvider",
     "ModalCloudProvider",
 ]
+
+
+# Providers load on first access so importing the package stays cheap
+_LAZY_PROVIDERS = {
+    "FasterWhisperProvider": "faster_whisper",
+    "ModalCloudProvider": "modal_cloud",
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROVIDERS:
+        module = importlib.import_module(f".{_LAZY_PROVIDERS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,27 @@
+"""
+Process-wide CUDA probes.
+
+The first torch.cuda call initializes the driver context (50-300ms), and
+torch itself is a heavy import, so both are paid at most once per process
+and only by callers that actually need a device answer.
+"""
+
+from functools import cache
+
+
+@cache
+def cuda_available() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+@cache
+def cuda_device_name() -> str | None:
+    if not cuda_available():
+        return None
+    import torch
+
+    return torch.cuda.get_device_name(0)
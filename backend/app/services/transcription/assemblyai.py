@@ -1,6 +1,5 @@
-import asyncio
+import orjson
 from pathlib import Path
-import assemblyai as aai
 from loguru import logger
 
 from app.services.transcription.base import (
@@ -8,17 +7,18 @@ from app.services.transcription.base import (
     TranscriptionStatus,
     Utterance,
     TranscriptResult,
+    iter_file_chunks,
 )
 
 
 class AssemblyAIProvider(TranscriptionProvider):
     """AssemblyAI transcription provider with speaker diarization."""
 
+    BASE_URL = "https://api.assemblyai.com/v2"
+
     def __init__(self, api_key: str, max_concurrent: int = 32):
         self._api_key = api_key
         self._max_concurrent = max_concurrent
-        aai.settings.api_key = api_key
-        self._transcriber = aai.Transcriber()
 
     @property
     def name(self) -> str:
@@ -36,33 +36,53 @@ class AssemblyAIProvider(TranscriptionProvider):
     def cost_per_hour_cents(self) -> int:
         return 37  # $0.37/hour
 
+    def _get_headers(self) -> dict:
+        return {"Authorization": self._api_key}
+
     async def submit_job(
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
     ) -> str:
-        """Submit audio to AssemblyAI for transcription."""
+        """Upload audio to AssemblyAI and submit it for transcription."""
         logger.info(f"Submitting {audio_path} to AssemblyAI")
 
-        config = aai.TranscriptionConfig(
-            speaker_labels=True,
-            speakers_expected=speakers_expected,
-            language_code=language,
+        # Talk to the REST API directly: the SDK is sync, and running it in
+        # the default executor capped concurrent jobs at its thread count
+        client = self._pooled_client(self.BASE_URL)
+        upload = await client.post(
+            "/upload",
+            headers={
+                **self._get_headers(),
+                "Content-Length": str(audio_path.stat().st_size),
+            },
+            content=iter_file_chunks(audio_path),
         )
-
-        # Run in thread pool since assemblyai SDK is sync
-        loop = asyncio.get_event_loop()
-        transcript = await loop.run_in_executor(
-            None, lambda: self._transcriber.submit(str(audio_path), config=config)
+        upload.raise_for_status()
+
+        response = await client.post(
+            "/transcript",
+            headers=self._get_headers(),
+            json={
+                "audio_url": upload.json()["upload_url"],
+                "speaker_labels": True,
+                "speakers_expected": speakers_expected,
+                "language_code": language,
+            },
         )
+        response.raise_for_status()
+        job_id = response.json()["id"]
 
-        logger.info(f"AssemblyAI job submitted: {transcript.id}")
-        return transcript.id
+        logger.info(f"AssemblyAI job submitted: {job_id}")
+        return job_id
 
     async def get_status(self, provider_job_id: str) -> TranscriptResult:
         """Check status of AssemblyAI transcription job."""
-        loop = asyncio.get_event_loop()
-        transcript = await loop.run_in_executor(
-            None, lambda: aai.Transcript.get_by_id(provider_job_id)
+        response = await self._pooled_client(self.BASE_URL).get(
+            f"/transcript/{provider_job_id}", headers=self._get_headers()
         )
+        response.raise_for_status()
+        # Completed transcripts carry every word with timings; orjson parses
+        # that payload several times faster than response.json()
+        transcript = orjson.loads(response.content)
 
         # Map AssemblyAI status to our status
         status_map = {
@@ -72,50 +92,47 @@ class AssemblyAIProvider(TranscriptionProvider):
             "error": TranscriptionStatus.FAILED,
         }
 
-        status = status_map.get(transcript.status, TranscriptionStatus.PENDING)
+        status = status_map.get(transcript.get("status"), TranscriptionStatus.PENDING)
 
         if status == TranscriptionStatus.FAILED:
             return TranscriptResult(
                 provider_job_id=provider_job_id,
                 status=status,
-                error_message=transcript.error or "Unknown error",
+                error_message=transcript.get("error") or "Unknown error",
             )
 
         if status != TranscriptionStatus.COMPLETED:
             return TranscriptResult(provider_job_id=provider_job_id, status=status)
 
         # Parse completed transcript
-        utterances = []
-        if transcript.utterances:
-            for utt in transcript.utterances:
-                utterances.append(
-                    Utterance(
-                        speaker=utt.speaker,
-                        text=utt.text,
-                        start_ms=utt.start,
-                        end_ms=utt.end,
-                        confidence=utt.confidence,
-                    )
-                )
+        utterances = [
+            Utterance(
+                speaker=utt["speaker"],
+                text=utt["text"],
+                start_ms=utt["start"],
+                end_ms=utt["end"],
+                confidence=utt.get("confidence"),
+            )
+            for utt in transcript.get("utterances") or []
+        ]
 
         # Calculate cost
-        duration_ms = (
-            transcript.audio_duration * 1000 if transcript.audio_duration else 0
-        )
-        cost_cents = self.estimate_cost(int(duration_ms / 1000))
+        audio_duration = transcript.get("audio_duration")
+        duration_seconds = audio_duration or 0.0
+        cost_cents = self.estimate_cost(duration_seconds)
 
         return TranscriptResult(
             provider_job_id=provider_job_id,
             status=status,
             utterances=utterances,
-            full_text=transcript.text,
-            duration_ms=int(duration_ms),
+            full_text=transcript.get("text"),
+            duration_ms=int(duration_seconds * 1000),
             cost_cents=cost_cents,
             raw_response={
-                "id": transcript.id,
-                "status": transcript.status,
-                "audio_duration": transcript.audio_duration,
-                "confidence": transcript.confidence,
+                "id": transcript.get("id"),
+                "status": transcript.get("status"),
+                "audio_duration": audio_duration,
+                "confidence": transcript.get("confidence"),
             },
         )
 
@@ -123,58 +140,20 @@ class AssemblyAIProvider(TranscriptionProvider):
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
     ) -> TranscriptResult:
         """Transcribe audio file and wait for result."""
-        logger.info(f"Starting AssemblyAI transcription for {audio_path}")
-
-        config = aai.TranscriptionConfig(
-            speaker_labels=True,
-            speakers_expected=speakers_expected,
-            language_code=language,
+        return await self._run_limited(
+            audio_path, speakers_expected, language, self._transcribe
         )
 
-        loop = asyncio.get_event_loop()
-        transcript = await loop.run_in_executor(
-            None, lambda: self._transcriber.transcribe(str(audio_path), config=config)
-        )
-
-        if transcript.status == "error":
-            return TranscriptResult(
-                provider_job_id=transcript.id,
-                status=TranscriptionStatus.FAILED,
-                error_message=transcript.error or "Unknown error",
-            )
-
-        # Parse utterances
-        utterances = []
-        if transcript.utterances:
-            for utt in transcript.utterances:
-                utterances.append(
-                    Utterance(
-                        speaker=utt.speaker,
-                        text=utt.text,
-                        start_ms=utt.start,
-                        end_ms=utt.end,
-                        confidence=utt.confidence,
-                    )
-                )
-
-        duration_ms = (
-            transcript.audio_duration * 1000 if transcript.audio_duration else 0
-        )
-        cost_cents = self.estimate_cost(int(duration_ms / 1000))
+    async def _transcribe(
+        self, audio_path: Path, speakers_expected: int, language: str
+    ) -> TranscriptResult:
+        logger.info(f"Starting AssemblyAI transcription for {audio_path}")
 
-        logger.info(f"AssemblyAI transcription complete: {len(utterances)} utterances")
+        job_id = await self.submit_job(audio_path, speakers_expected, language)
+        result = await self.wait_for_completion(job_id, initial_poll_interval=3.0)
 
-        return TranscriptResult(
-            provider_job_id=transcript.id,
-            status=TranscriptionStatus.COMPLETED,
-            utterances=utterances,
-            full_text=transcript.text,
-            duration_ms=int(duration_ms),
-            cost_cents=cost_cents,
-            raw_response={
-                "id": transcript.id,
-                "status": transcript.status,
-                "audio_duration": transcript.audio_duration,
-                "confidence": transcript.confidence,
-            },
-        )
+        if result.status == TranscriptionStatus.COMPLETED:
+            logger.info(
+                f"AssemblyAI transcription complete: {len(result.utterances)} utterances"
+            )
+        return result
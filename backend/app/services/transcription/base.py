@@ -1,8 +1,25 @@
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
 from pathlib import Path
 from enum import Enum
+from typing import AsyncIterator, Awaitable, Callable
 import asyncio
+import httpx
+
+# Excerpt length used when utterances are quoted in LLM prompts
+PREVIEW_CHARS = 120
+# Utterances longer than this are monologues; previews keep head and tail
+LONG_UTTERANCE_MS = 10 * 60 * 1000
+
+
+def _preview(text: str, duration_ms: int) -> str:
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    if duration_ms > LONG_UTTERANCE_MS:
+        half = PREVIEW_CHARS // 2
+        return f"{text[:half]} ... {text[-half:]}"
+    return text[:PREVIEW_CHARS] + "..."
 
 
 class TranscriptionStatus(Enum):
@@ -12,7 +29,44 @@ class TranscriptionStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
+class WordTimings:
+    """
+    Word-level timing for one utterance, stored column-wise.
+
+    An hour of audio has ~15k words; four arrays per utterance replace a
+    dict per word. Times are seconds, probabilities 0-1 (float32).
+    """
+
+    words: list[str]
+    starts: array
+    ends: array
+    probabilities: array
+
+    @classmethod
+    def from_words(cls, words) -> "WordTimings":
+        """Build from objects with word/start/end/probability attributes."""
+        return cls(
+            words=[w.word for w in words],
+            starts=array("f", [w.start for w in words]),
+            ends=array("f", [w.end for w in words]),
+            probabilities=array("f", [w.probability for w in words]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def as_dicts(self) -> list[dict]:
+        """Row-wise view, for callers that want one dict per word."""
+        return [
+            {"word": w, "start": s, "end": e, "probability": p}
+            for w, s, e, p in zip(
+                self.words, self.starts, self.ends, self.probabilities
+            )
+        ]
+
+
+@dataclass(slots=True)
 class Utterance:
     """A single speaker utterance from transcription."""
 
@@ -21,10 +75,16 @@ class Utterance:
     start_ms: int
     end_ms: int
     confidence: float | None = None
-    words: list[dict] | None = None  # Word-level timing if available
+    words: WordTimings | None = None  # Word-level timing if available
+    preview: str | None = field(default=None, repr=False)  # Truncated text
 
+    def __post_init__(self):
+        # Computed once at parse time; prompts reuse it on every build
+        if self.preview is None:
+            self.preview = _preview(self.text, self.end_ms - self.start_ms)
 
-@dataclass
+
+@dataclass(slots=True)
 class TranscriptResult:
     """Result of a transcription job."""
 
@@ -38,6 +98,33 @@ class TranscriptResult:
     raw_response: dict | None = field(default=None, repr=False)
 
 
+# Shared by every provider instance (the pipeline builds one per job):
+# per-provider job slots, bound to the loop they were created on, in-flight
+# transcriptions for single-flight by (provider, file, options), and pooled
+# HTTP clients by (base URL, loop) since connections are bound to their loop
+_job_slots: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+_inflight: dict[tuple, asyncio.Task] = {}
+_http_clients: dict[tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_file_chunks(
+    audio_path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a file in chunks, reading each off the event loop."""
+    with open(audio_path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
+
+async def close_http_clients():
+    """Close the running loop's pooled provider clients (call at shutdown)."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in _http_clients if key[1] is loop]:
+        await _http_clients.pop(key).aclose()
+
+
 class TranscriptionProvider(ABC):
     """Abstract base class for transcription providers."""
 
@@ -120,7 +207,64 @@ class TranscriptionProvider(ABC):
         job_id = await self.submit_job(audio_path, speakers_expected, language)
         return await self.wait_for_completion(job_id)
 
-    def estimate_cost(self, duration_seconds: int) -> int:
+    def _pooled_client(self, base_url: str) -> httpx.AsyncClient:
+        """The running loop's shared client for ``base_url``, created on first use."""
+        key = (base_url, asyncio.get_running_loop())
+        client = _http_clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            )
+            _http_clients[key] = client
+        return client
+
+    def _job_slot(self) -> asyncio.Semaphore:
+        """This provider's semaphore of max_concurrent_jobs slots."""
+        loop = asyncio.get_running_loop()
+        entry = _job_slots.get(self.name)
+        if entry is None or entry[0] is not loop:
+            entry = (loop, asyncio.Semaphore(self.max_concurrent_jobs))
+            _job_slots[self.name] = entry
+        return entry[1]
+
+    async def _run_limited(
+        self,
+        audio_path: Path,
+        speakers_expected: int,
+        language: str,
+        transcribe: Callable[[Path, int, str], Awaitable[TranscriptResult]],
+    ) -> TranscriptResult:
+        """
+        Run ``transcribe`` within this provider's concurrency limit.
+
+        At most max_concurrent_jobs transcriptions per provider run at once
+        in this process, and concurrent requests for the same file and
+        options share one job instead of paying for it twice.
+        """
+        key = (self.name, str(audio_path), speakers_expected, language)
+        task = _inflight.get(key)
+
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+
+            async def run() -> TranscriptResult:
+                async with self._job_slot():
+                    return await transcribe(audio_path, speakers_expected, language)
+
+            def forget(done: asyncio.Task):
+                if _inflight.get(key) is done:
+                    del _inflight[key]
+
+            task = _inflight[key] = asyncio.create_task(run())
+            task.add_done_callback(forget)
+
+        # One caller giving up must not cancel the job for the others
+        return await asyncio.shield(task)
+
+    async def prewarm(self) -> None:
+        """Load any local model ahead of the first job; API providers have none."""
+
+    def estimate_cost(self, duration_seconds: float) -> int:
         """Estimate cost in cents for given audio duration."""
-        hours = duration_seconds / 3600
-        return int(hours * self.cost_per_hour_cents)
+        return int(duration_seconds * self.cost_per_hour_cents / 3600)
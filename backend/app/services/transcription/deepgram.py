@@ -1,28 +1,72 @@
-import httpx
+import asyncio
+import uuid
+import orjson
 from pathlib import Path
+from urllib.parse import urlencode
 from loguru import logger
 
+from app.services.cache import CacheService
 from app.services.transcription.base import (
     TranscriptionProvider,
     TranscriptionStatus,
     Utterance,
     TranscriptResult,
+    iter_file_chunks,
 )
 
 
 class DeepgramProvider(TranscriptionProvider):
-    """Deepgram transcription provider with speaker diarization."""
+    """
+    Deepgram transcription provider with speaker diarization.
 
-    BASE_URL = "https://api.deepgram.com/v1"
+    With a callback URL configured, jobs run in Deepgram's callback mode:
+    the upload returns a request_id straight away, Deepgram POSTs the
+    transcript to /api/webhooks/deepgram, and the webhook parks it in Redis
+    for get_status. Without one, each file is transcribed in a single
+    long-lived request.
+    """
 
-    def __init__(self, api_key: str, max_concurrent: int = 50):
+    BASE_URL = "https://api.deepgram.com/v1"
+    CALLBACK_TTL = 86400  # 1 day to collect a delivered transcript
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrent: int = 50,
+        callback_url: str | None = None,
+        callback_secret: str | None = None,
+        cache: CacheService | None = None,
+    ):
         self._api_key = api_key
         self._max_concurrent = max_concurrent
+        if callback_url and not callback_secret:
+            # The webhook refuses unauthenticated deliveries, so waiting on
+            # one would never finish
+            logger.warning("Deepgram callback URL set without a secret; polling")
+            callback_url = None
+        self._callback_url = callback_url
+        self._callback_secret = callback_secret
+        self._injected_cache = cache
+        self._loop_cache: tuple[asyncio.AbstractEventLoop, CacheService] | None = None
 
     @property
     def name(self) -> str:
         return "deepgram"
 
+    def _cache(self) -> CacheService:
+        """
+        The running loop's CacheService.
+
+        The factory shares one provider per process, and Celery tasks each
+        run on a fresh loop, while a Redis client is bound to its first loop.
+        """
+        if self._injected_cache is not None:
+            return self._injected_cache
+        loop = asyncio.get_running_loop()
+        if self._loop_cache is None or self._loop_cache[0] is not loop:
+            self._loop_cache = (loop, CacheService())
+        return self._loop_cache[1]
+
     @property
     def max_concurrent_jobs(self) -> int:
         return self._max_concurrent
@@ -41,62 +85,149 @@ class DeepgramProvider(TranscriptionProvider):
             "Content-Type": "audio/mpeg",
         }
 
+    @staticmethod
+    def _result_key(request_id: str) -> str:
+        return f"deepgram:{request_id}"
+
+    @staticmethod
+    def _done_key(request_id: str) -> str:
+        return f"deepgram:{request_id}:done"
+
+    @classmethod
+    async def store_callback(
+        cls, request_id: str, body: bytes | str, cache: CacheService | None = None
+    ) -> None:
+        """Park a transcript delivered to the webhook and wake its waiter."""
+        r = await (cache or CacheService())._get_redis()
+        done_key = cls._done_key(request_id)
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.setex(cls._result_key(request_id), cls.CALLBACK_TTL, body)
+            pipe.rpush(done_key, 1)
+            pipe.expire(done_key, cls.CALLBACK_TTL)
+            await pipe.execute()
+
+    def _params(self, language: str) -> dict:
+        return {
+            "model": "nova-2",
+            "language": language,
+            "diarize": "true",
+            "punctuate": "true",
+            "utterances": "true",
+            "smart_format": "true",
+        }
+
+    async def _post_audio(self, audio_path: Path, params: dict):
+        # Stream the upload instead of holding the whole file in memory
+        headers = {
+            **self._get_headers(),
+            "Content-Length": str(audio_path.stat().st_size),
+        }
+        return await self._pooled_client(self.BASE_URL).post(
+            "/listen",
+            headers=headers,
+            params=params,
+            content=iter_file_chunks(audio_path),
+        )
+
+    async def _submit_callback_job(self, audio_path: Path, language: str) -> str:
+        callback = self._callback_url
+        if self._callback_secret:
+            callback += "?" + urlencode({"token": self._callback_secret})
+
+        response = await self._post_audio(
+            audio_path, {**self._params(language), "callback": callback}
+        )
+        response.raise_for_status()
+        request_id = orjson.loads(response.content)["request_id"]
+
+        logger.info(f"Deepgram job submitted: {request_id}")
+        return request_id
+
     async def submit_job(
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
     ) -> str:
         """
         Submit audio to Deepgram for transcription.
 
-        Note: Deepgram processes synchronously by default.
-        For async, we use the callback feature or just process inline.
+        In callback mode this returns Deepgram's request_id once the upload
+        is accepted; otherwise the file is transcribed inline.
         """
-        # For simplicity, we'll use sync transcription
-        # In production, you might want to use callbacks for very long files
+        if self._callback_url:
+            return await self._submit_callback_job(audio_path, language)
+
         result = await self.transcribe(audio_path, speakers_expected, language)
         return result.provider_job_id
 
     async def get_status(self, provider_job_id: str) -> TranscriptResult:
         """
-        Deepgram processes synchronously, so this returns completed result.
-        The provider_job_id is actually our local tracking ID.
+        Look up a transcript delivered by Deepgram's callback.
+
+        Inline jobs are complete by the time they have an ID, so without a
+        callback URL this is only here for API compatibility.
         """
-        # For sync processing, we don't have status checks
-        # This is mainly for API compatibility
-        return TranscriptResult(
-            provider_job_id=provider_job_id, status=TranscriptionStatus.COMPLETED
-        )
+        if not self._callback_url:
+            return TranscriptResult(
+                provider_job_id=provider_job_id, status=TranscriptionStatus.COMPLETED
+            )
+
+        payload = await self._cache().get(self._result_key(provider_job_id))
+        if payload is None:
+            return TranscriptResult(
+                provider_job_id=provider_job_id,
+                status=TranscriptionStatus.PROCESSING,
+            )
+        return self._to_result(provider_job_id, orjson.loads(payload))
+
+    async def wait_for_completion(
+        self,
+        provider_job_id: str,
+        initial_poll_interval: float = 5.0,
+        max_poll_interval: float = 30.0,
+        timeout: float = 3600.0,
+    ) -> TranscriptResult:
+        """Block on the webhook's wake-up signal rather than polling."""
+        if not self._callback_url:
+            return await super().wait_for_completion(
+                provider_job_id, initial_poll_interval, max_poll_interval, timeout
+            )
+
+        try:
+            r = await self._cache()._get_redis()
+            woke = await r.blpop([self._done_key(provider_job_id)], timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Deepgram callback wait failed, polling instead: {e}")
+            return await super().wait_for_completion(
+                provider_job_id, initial_poll_interval, max_poll_interval, timeout
+            )
+
+        if woke is None:
+            return TranscriptResult(
+                provider_job_id=provider_job_id,
+                status=TranscriptionStatus.FAILED,
+                error_message=f"Transcription timed out after {timeout} seconds",
+            )
+        return await self.get_status(provider_job_id)
 
     async def transcribe(
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
     ) -> TranscriptResult:
         """Transcribe audio file using Deepgram."""
-        import uuid
+        return await self._run_limited(
+            audio_path, speakers_expected, language, self._transcribe
+        )
 
+    async def _transcribe(
+        self, audio_path: Path, speakers_expected: int, language: str
+    ) -> TranscriptResult:
         logger.info(f"Starting Deepgram transcription for {audio_path}")
 
-        # Deepgram API parameters
-        params = {
-            "model": "nova-2",
-            "language": language,
-            "diarize": "true",
-            "punctuate": "true",
-            "utterances": "true",
-            "smart_format": "true",
-        }
-
         job_id = str(uuid.uuid4())
 
         try:
-            async with httpx.AsyncClient(timeout=600.0) as client:
-                with open(audio_path, "rb") as f:
-                    audio_data = f.read()
-
-                response = await client.post(
-                    f"{self.BASE_URL}/listen",
-                    headers=self._get_headers(),
-                    params=params,
-                    content=audio_data,
-                )
+            if self._callback_url:
+                job_id = await self._submit_callback_job(audio_path, language)
+            else:
+                response = await self._post_audio(audio_path, self._params(language))
 
                 if response.status_code != 200:
                     error_text = response.text
@@ -107,7 +238,8 @@ class DeepgramProvider(TranscriptionProvider):
                         error_message=f"Deepgram API error: {response.status_code} - {error_text}",
                     )
 
-                data = response.json()
+                # Long episodes return tens of MB of word-level JSON
+                data = orjson.loads(response.content)
 
         except Exception as e:
             logger.error(f"Deepgram transcription failed: {e}")
@@ -117,6 +249,21 @@ class DeepgramProvider(TranscriptionProvider):
                 error_message=str(e),
             )
 
+        if self._callback_url:
+            # No connection is held open while Deepgram works; the
+            # transcript arrives through the webhook
+            result = await self.wait_for_completion(job_id)
+        else:
+            result = self._to_result(job_id, data)
+
+        if result.status == TranscriptionStatus.COMPLETED:
+            logger.info(
+                f"Deepgram transcription complete: {len(result.utterances)} utterances"
+            )
+        return result
+
+    def _to_result(self, job_id: str, data: dict) -> TranscriptResult:
+        """Convert a Deepgram /listen response into a TranscriptResult."""
         # Parse response
         results = data.get("results", {})
         channels = results.get("channels", [])
@@ -156,9 +303,7 @@ class DeepgramProvider(TranscriptionProvider):
         duration_seconds = metadata.get("duration", 0)
         duration_ms = int(duration_seconds * 1000)
 
-        cost_cents = self.estimate_cost(int(duration_seconds))
-
-        logger.info(f"Deepgram transcription complete: {len(utterances)} utterances")
+        cost_cents = self.estimate_cost(duration_seconds)
 
         return TranscriptResult(
             provider_job_id=job_id,
@@ -167,5 +312,11 @@ class DeepgramProvider(TranscriptionProvider):
             full_text=full_text,
             duration_ms=duration_ms,
             cost_cents=cost_cents,
-            raw_response=data,
+            # Only the identifiers: the full payload would be copied into
+            # episodes.transcript_raw and the backup file for every episode
+            raw_response={
+                "id": job_id,
+                "request_id": metadata.get("request_id"),
+                "duration": duration_seconds,
+            },
         )
@@ -1,17 +1,46 @@
+import importlib.util
+import threading
+from loguru import logger
+
+from app.services.transcription._gpu import cuda_available
 from app.services.transcription.base import TranscriptionProvider
-from app.services.transcription.assemblyai import AssemblyAIProvider
-from app.services.transcription.deepgram import DeepgramProvider
-from app.services.transcription.whisper import WhisperProvider
-from app.services.transcription.faster_whisper import FasterWhisperProvider
-from app.services.transcription.modal_cloud import ModalCloudProvider, MODAL_AVAILABLE
-from app.services.transcription.modal_hybrid import ModalHybridProvider
 from app.config import settings
 
 
+def _has_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ImportError:  # parent package of a dotted name is missing
+        return False
+
+
+# Probed once at import, as find_spec stats sys.path on every call. Provider
+# modules themselves are imported inside _provider_spec so a deployment only
+# loads the SDKs it uses (importing modal alone takes most of a second)
+MODAL_AVAILABLE = _has_module("modal")
+WHISPER_AVAILABLE = _has_module("whisper")
+FASTER_WHISPER_AVAILABLE = _has_module("faster_whisper")
+DIARIZATION_AVAILABLE = _has_module("pyannote.audio")
+
+
+def _auto_device() -> str:
+    """The device faster-whisper's "auto" resolves to."""
+    return "GPU (CUDA)" if cuda_available() else "CPU"
+
+
+# One instance per provider configuration, so a loaded local model is
+# reused by every job instead of being reloaded for each one
+_instances: dict[tuple, TranscriptionProvider] = {}
+_instances_lock = threading.Lock()
+
+
 def get_provider(provider_name: str | None = None) -> TranscriptionProvider:
     """
     Factory to get transcription provider instance.
 
+    Instances are shared process-wide per name and settings; changing a
+    provider's settings yields a fresh instance.
+
     Args:
         provider_name: One of 'assemblyai', 'deepgram', 'whisper', 'faster-whisper', 'modal-cloud'.
                       If None, uses DEFAULT_TRANSCRIPTION_PROVIDER from settings.
@@ -23,12 +52,35 @@ def get_provider(provider_name: str | None = None) -> TranscriptionProvider:
         ValueError: If provider is not configured or unknown
     """
     name = provider_name or settings.DEFAULT_TRANSCRIPTION_PROVIDER
+    provider_cls, kwargs = _provider_spec(name)
+    key = (name, *sorted(kwargs.items()))
+
+    provider = _instances.get(key)
+    if provider is None:
+        with _instances_lock:
+            provider = _instances.get(key)
+            if provider is None:
+                provider = _instances[key] = provider_cls(**kwargs)
+    return provider
+
+
+async def prewarm_provider(provider_name: str | None = None) -> None:
+    """Load the provider's local model before its first job; errors are logged."""
+    try:
+        await get_provider(provider_name).prewarm()
+    except Exception as e:
+        logger.warning(f"Transcription provider prewarm failed: {e}")
 
+
+def _provider_spec(name: str) -> tuple[type[TranscriptionProvider], dict]:
+    """Resolve a provider name to its class and constructor arguments."""
     match name:
         case "assemblyai":
             if not settings.ASSEMBLYAI_API_KEY:
                 raise ValueError("ASSEMBLYAI_API_KEY not configured")
-            return AssemblyAIProvider(
+            from app.services.transcription.assemblyai import AssemblyAIProvider
+
+            return AssemblyAIProvider, dict(
                 api_key=settings.ASSEMBLYAI_API_KEY,
                 max_concurrent=settings.ASSEMBLYAI_MAX_CONCURRENT,
             )
@@ -36,52 +88,76 @@ def get_provider(provider_name: str | None = None) -> TranscriptionProvider:
         case "deepgram":
             if not settings.DEEPGRAM_API_KEY:
                 raise ValueError("DEEPGRAM_API_KEY not configured")
-            return DeepgramProvider(
+            from app.services.transcription.deepgram import DeepgramProvider
+
+            return DeepgramProvider, dict(
                 api_key=settings.DEEPGRAM_API_KEY,
                 max_concurrent=settings.DEEPGRAM_MAX_CONCURRENT,
+                callback_url=settings.DEEPGRAM_CALLBACK_URL,
+                callback_secret=settings.DEEPGRAM_CALLBACK_SECRET,
             )
 
         case "whisper":
-            return WhisperProvider(
+            from app.services.transcription.whisper import WhisperProvider
+
+            return WhisperProvider, dict(
                 model=settings.WHISPER_MODEL,
                 device=settings.WHISPER_DEVICE,
                 max_concurrent=settings.WHISPER_MAX_CONCURRENT,
             )
 
         case "faster-whisper":
-            return FasterWhisperProvider(
+            from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+            return FasterWhisperProvider, dict(
                 model=settings.FASTER_WHISPER_MODEL,
                 device=settings.FASTER_WHISPER_DEVICE,
                 compute_type=settings.FASTER_WHISPER_COMPUTE_TYPE,
                 max_concurrent=settings.FASTER_WHISPER_MAX_CONCURRENT,
+                batch_size=settings.FASTER_WHISPER_BATCH_SIZE,
+                beam_size=settings.FASTER_WHISPER_BEAM_SIZE,
             )
 
         case "modal-cloud":
             if not MODAL_AVAILABLE:
                 raise ValueError("Modal not installed. Run: pip install modal")
-            return ModalCloudProvider(
+            from app.services.transcription.modal_cloud import ModalCloudProvider
+
+            return ModalCloudProvider, dict(
                 model=settings.MODAL_WHISPER_MODEL,
                 gpu_type=settings.MODAL_GPU_TYPE,
                 max_concurrent=settings.MODAL_MAX_CONCURRENT,
+                compute_type=settings.MODAL_COMPUTE_TYPE,
             )
 
         case "modal-hybrid":
             if not MODAL_AVAILABLE:
                 raise ValueError("Modal not installed. Run: pip install modal")
-            return ModalHybridProvider(
+            from app.services.transcription.modal_hybrid import ModalHybridProvider
+
+            return ModalHybridProvider, dict(
                 model=settings.MODAL_WHISPER_MODEL,
                 gpu_type=settings.MODAL_GPU_TYPE,
                 max_concurrent=settings.MODAL_MAX_CONCURRENT,
+                compute_type=settings.MODAL_COMPUTE_TYPE,
             )
 
         case _:
             raise ValueError(f"Unknown transcription provider: {name}")
 
 
+# Provider listing only changes with settings or installed packages, so
+# it's probed once per process (see refresh_providers)
+_providers_info: list[dict] | None = None
+
+
 def get_available_providers() -> list[dict]:
     """
     Return list of available/configured providers with their capabilities.
 
+    Served from a per-process cache; each call gets its own copies, so
+    callers may modify the result.
+
     Returns:
         List of provider info dicts with:
         - name: Provider identifier
@@ -92,6 +168,20 @@ def get_available_providers() -> list[dict]:
         - available: Whether the provider is configured and ready
         - note: Optional additional info
     """
+    global _providers_info
+    if _providers_info is None:
+        _providers_info = _probe_providers()
+    return [dict(p) for p in _providers_info]
+
+
+def refresh_providers() -> list[dict]:
+    """Re-probe providers, e.g. after settings or installed packages change."""
+    global _providers_info
+    _providers_info = None
+    return get_available_providers()
+
+
+def _probe_providers() -> list[dict]:
     providers = []
 
     # AssemblyAI
@@ -121,17 +211,8 @@ def get_available_providers() -> list[dict]:
     )
 
     # Whisper (original OpenAI whisper)
-    whisper_available = True
-    whisper_note = None
-
-    try:
-        import importlib.util
-
-        if importlib.util.find_spec("whisper") is None:
-            raise ImportError()
-    except ImportError:
-        whisper_available = False
-        whisper_note = "openai-whisper not installed"
+    whisper_available = WHISPER_AVAILABLE
+    whisper_note = None if whisper_available else "openai-whisper not installed"
 
     providers.append(
         {
@@ -150,31 +231,16 @@ def get_available_providers() -> list[dict]:
     )
 
     # Faster-Whisper (4x faster than OpenAI Whisper)
-    faster_whisper_available = True
-    faster_whisper_note = None
-    diarization_available = False
-
-    try:
-        if importlib.util.find_spec("faster_whisper") is None:
-            raise ImportError()
-    except ImportError:
-        faster_whisper_available = False
-        faster_whisper_note = "faster-whisper not installed"
-
-    try:
-        if importlib.util.find_spec("pyannote.audio") is not None:
-            diarization_available = True
-    except ImportError:
-        pass
+    faster_whisper_available = FASTER_WHISPER_AVAILABLE
+    faster_whisper_note = (
+        None if faster_whisper_available else "faster-whisper not installed"
+    )
+    diarization_available = DIARIZATION_AVAILABLE
 
     device_info = settings.FASTER_WHISPER_DEVICE.upper()
     if device_info == "AUTO":
-        try:
-            import torch
-
-            device_info = "GPU (CUDA)" if torch.cuda.is_available() else "CPU"
-        except ImportError:
-            device_info = "CPU"
+        # Only worth waking the CUDA driver if the provider can run at all
+        device_info = _auto_device() if faster_whisper_available else "CPU"
 
     providers.append(
         {
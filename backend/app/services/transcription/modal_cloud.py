@@ -7,6 +7,7 @@ Cost: ~$0.03-0.05 per hour of audio (A10G GPU pricing).
 
 import asyncio
 import uuid
+from functools import cache
 from pathlib import Path
 from loguru import logger
 
@@ -27,6 +28,17 @@ except ImportError:
     logger.warning("Modal not installed, cloud GPU transcription unavailable")
 
 
+# Where the audio volume is mounted in the GPU containers
+AUDIO_MOUNT = "/audio"
+
+# Concurrent calls per GPU container
+MAX_INPUTS = 4
+
+# Reload attempts before an uploaded file is reported missing (~1 min with
+# backoff when reloads keep being refused)
+VOLUME_RELOAD_ATTEMPTS = 20
+
+
 # Modal app definition - only created if modal is available
 if MODAL_AVAILABLE:
     # Define the Modal app
@@ -37,34 +49,55 @@ if MODAL_AVAILABLE:
         modal.Image.debian_slim(python_version="3.11")
         .apt_install("ffmpeg")
         .pip_install(
-            "faster-whisper>=1.0.0",
+            "faster-whisper>=1.1.0",  # BatchedInferencePipeline
             "torch>=2.0.0",
             "torchaudio>=2.0.0",
         )
     )
 
+    # Batch audio is uploaded here from disk and read in place by the GPU
+    # containers, instead of travelling as bytes in each call's arguments
+    audio_volume = modal.Volume.from_name("podcast-audio", create_if_missing=True)
+
     @modal_app.cls(
         image=transcriber_image,
+        volumes={AUDIO_MOUNT: audio_volume},
         gpu="A10G",  # Good balance of speed and cost
         timeout=600,
         retries=2,
         scaledown_window=60,  # Previously container_idle_timeout
     )
+    # A container serves several calls at once, each on its own thread and
+    # CTranslate2 worker; at int8_float16 four decodes fit in the A10G's 24GB
+    @modal.concurrent(max_inputs=MAX_INPUTS)
     class ModalWhisperTranscriber:
         """Modal class for GPU transcription."""
 
+        # int8 weights with float16 activations: ~1.5GB less VRAM than
+        # float16 on an A10G with no measurable WER change on large-v3.
+        # Each value gets its own container pool
+        compute_type: str = modal.parameter(default="int8_float16")
+
+        # VAD chunks decoded together; int8 weights leave room for 16 on
+        # an A10G's 24GB
+        BATCH_SIZE = 16
+
         @modal.enter()
         def load_model(self):
             """Load model once when container starts."""
-            from faster_whisper import WhisperModel
+            from faster_whisper import BatchedInferencePipeline, WhisperModel
 
-            logger.info("Loading faster-whisper model on Modal GPU...")
+            logger.info(
+                f"Loading faster-whisper model on Modal GPU ({self.compute_type})..."
+            )
             self.model = WhisperModel(
                 "large-v3",
                 device="cuda",
-                compute_type="float16",
-                num_workers=4,
+                compute_type=self.compute_type,
+                num_workers=MAX_INPUTS,  # one per concurrent call
             )
+            # One 30s window at a time leaves the GPU mostly idle
+            self.batched_model = BatchedInferencePipeline(model=self.model)
             logger.info("Model loaded successfully")
 
         @modal.method()
@@ -72,6 +105,50 @@ if MODAL_AVAILABLE:
             self, audio_bytes: bytes, language: str = "en", job_id: str = None
         ) -> dict:
             """Transcribe audio bytes on GPU."""
+            return self._transcribe(audio_bytes, language, job_id)
+
+        @modal.method()
+        def transcribe_key(
+            self, audio_key: str, language: str = "en", job_id: str = None
+        ) -> dict:
+            """Transcribe a file uploaded to the audio volume."""
+            try:
+                audio_path = self._volume_path(audio_key)
+            except FileNotFoundError as e:
+                return {"status": "failed", "job_id": job_id, "error": str(e)}
+            return self._transcribe_path(audio_path, language, job_id)
+
+        def _volume_path(self, audio_key: str) -> str:
+            """
+            Local path of an uploaded file, reloading the volume until it shows.
+
+            Files committed after this container mounted the volume need a
+            reload, which Modal refuses while a concurrent call has a file
+            open. Calls only hold their file while decoding it into memory,
+            so retrying with backoff gets through.
+            """
+            import time
+            from pathlib import Path
+
+            path = Path(AUDIO_MOUNT) / audio_key
+            delay = 0.25
+            for _ in range(VOLUME_RELOAD_ATTEMPTS):
+                if path.exists():
+                    return str(path)
+                try:
+                    audio_volume.reload()
+                    continue  # check again straight away
+                except Exception as e:
+                    logger.debug(f"Audio volume reload refused: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 4.0)
+            if path.exists():
+                return str(path)
+            raise FileNotFoundError(f"{audio_key} not found on the audio volume")
+
+        def _transcribe(
+            self, audio_bytes: bytes, language: str = "en", job_id: str = None
+        ) -> dict:
             import tempfile
             from pathlib import Path
 
@@ -81,8 +158,18 @@ if MODAL_AVAILABLE:
                 audio_path = f.name
 
             try:
-                segments, info = self.model.transcribe(
+                return self._transcribe_path(audio_path, language, job_id)
+            finally:
+                # Cleanup temp file
+                Path(audio_path).unlink(missing_ok=True)
+
+        def _transcribe_path(
+            self, audio_path: str, language: str = "en", job_id: str = None
+        ) -> dict:
+            try:
+                segments, info = self.batched_model.transcribe(
                     audio_path,
+                    batch_size=self.BATCH_SIZE,
                     language=language if language else None,
                     task="transcribe",
                     vad_filter=True,
@@ -91,33 +178,27 @@ if MODAL_AVAILABLE:
                     beam_size=5,
                 )
 
-                # Process segments
-                utterances = []
-                full_text_parts = []
-
+                # Columns rather than a dict per segment: cheaper to pickle
+                # back, and the client zips them straight into Utterances
+                texts, starts, ends, confidences = [], [], [], []
                 for segment in segments:
                     text = segment.text.strip()
                     if text:
-                        utterances.append(
-                            {
-                                "speaker": "A",
-                                "text": text,
-                                "start_ms": int(segment.start * 1000),
-                                "end_ms": int(segment.end * 1000),
-                                "confidence": (
-                                    segment.avg_logprob
-                                    if hasattr(segment, "avg_logprob")
-                                    else None
-                                ),
-                            }
-                        )
-                        full_text_parts.append(text)
+                        texts.append(text)
+                        starts.append(int(segment.start * 1000))
+                        ends.append(int(segment.end * 1000))
+                        confidences.append(segment.avg_logprob)
 
                 return {
                     "status": "completed",
                     "job_id": job_id,
-                    "utterances": utterances,
-                    "full_text": " ".join(full_text_parts),
+                    "utterances": {
+                        "text": texts,
+                        "start_ms": starts,
+                        "end_ms": ends,
+                        "confidence": confidences,
+                    },
+                    "full_text": " ".join(texts),
                     "duration_ms": int(info.duration * 1000),
                     "language": info.language,
                     "language_probability": info.language_probability,
@@ -129,9 +210,60 @@ if MODAL_AVAILABLE:
                     "job_id": job_id,
                     "error": str(e),
                 }
-            finally:
-                # Cleanup temp file
-                Path(audio_path).unlink(missing_ok=True)
+
+
+@cache
+def get_transcriber(compute_type: str = "int8_float16"):
+    """
+    The Modal transcriber for ``compute_type``, shared process-wide.
+
+    Both Modal providers, and every instance of them, reuse one handle, so
+    its method lookups are resolved once rather than per provider.
+    """
+    return ModalWhisperTranscriber(compute_type=compute_type)
+
+
+def to_utterances(result: dict) -> list[Utterance]:
+    """Build Utterances from a worker result's utterance columns."""
+    columns = result.get("utterances") or {}
+    return [
+        Utterance(
+            speaker="A",  # Single speaker, no diarization on Modal
+            text=text,
+            start_ms=start_ms,
+            end_ms=end_ms,
+            confidence=confidence,
+        )
+        for text, start_ms, end_ms, confidence in zip(
+            columns.get("text", ()),
+            columns.get("start_ms", ()),
+            columns.get("end_ms", ()),
+            columns.get("confidence", ()),
+        )
+    ]
+
+
+def upload_audio(paths: list[Path]) -> list[str]:
+    """
+    Upload local files to the audio volume; returns their keys.
+
+    Files stream from disk in parallel within one commit, so no file is
+    ever held in memory here.
+    """
+    keys = [f"{uuid.uuid4()}{path.suffix}" for path in paths]
+    with audio_volume.batch_upload() as batch:
+        for path, key in zip(paths, keys):
+            batch.put_file(path, f"/{key}")
+    return keys
+
+
+def remove_audio(keys: list[str]) -> None:
+    """Delete uploaded audio once transcribed; failures only leave litter."""
+    for key in keys:
+        try:
+            audio_volume.remove_file(f"/{key}")
+        except Exception as e:
+            logger.debug(f"Could not remove {key} from audio volume: {e}")
 
 
 class ModalCloudProvider(TranscriptionProvider):
@@ -155,6 +287,7 @@ class ModalCloudProvider(TranscriptionProvider):
         model: str = "large-v3",
         gpu_type: str = "A10G",
         max_concurrent: int = 10,
+        compute_type: str = "int8_float16",
     ):
         """
         Initialize Modal cloud provider.
@@ -163,11 +296,12 @@ class ModalCloudProvider(TranscriptionProvider):
             model: Whisper model to use
             gpu_type: Modal GPU type (T4, A10G, A100)
             max_concurrent: Max parallel jobs (Modal handles scaling)
+            compute_type: faster-whisper precision on the GPU container
         """
         self._model_name = model
         self._gpu_type = gpu_type
         self._max_concurrent = max_concurrent
-        self._transcriber = None
+        self._compute_type = compute_type
 
     @property
     def name(self) -> str:
@@ -196,11 +330,9 @@ class ModalCloudProvider(TranscriptionProvider):
             raise RuntimeError("MODAL_TOKEN_ID not set. Run: modal token new")
 
     def _get_transcriber(self):
-        """Get or create Modal transcriber instance."""
-        if self._transcriber is None:
-            self._check_modal_available()
-            self._transcriber = ModalWhisperTranscriber()
-        return self._transcriber
+        """Get the shared Modal transcriber instance."""
+        self._check_modal_available()
+        return get_transcriber(self._compute_type)
 
     async def submit_job(
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
@@ -231,16 +363,13 @@ class ModalCloudProvider(TranscriptionProvider):
             logger.info(f"Uploading {audio_size_mb:.1f}MB audio to Modal")
 
             # Run transcription on Modal (this handles the remote call)
-            loop = asyncio.get_event_loop()
             transcriber = self._get_transcriber()
 
-            result = await loop.run_in_executor(
-                None,
-                lambda: transcriber.transcribe.remote(
-                    audio_bytes=audio_bytes,
-                    language=language,
-                    job_id=job_id,
-                ),
+            result = await asyncio.to_thread(
+                transcriber.transcribe.remote,
+                audio_bytes=audio_bytes,
+                language=language,
+                job_id=job_id,
             )
 
             if result.get("status") == "failed":
@@ -251,16 +380,7 @@ class ModalCloudProvider(TranscriptionProvider):
                 )
 
             # Convert utterance dicts to Utterance objects
-            utterances = [
-                Utterance(
-                    speaker=u["speaker"],
-                    text=u["text"],
-                    start_ms=u["start_ms"],
-                    end_ms=u["end_ms"],
-                    confidence=u.get("confidence"),
-                )
-                for u in result.get("utterances", [])
-            ]
+            utterances = to_utterances(result)
 
             # Estimate cost
             duration_hours = result.get("duration_ms", 0) / 1000 / 3600
@@ -311,31 +431,25 @@ class ModalCloudProvider(TranscriptionProvider):
         self._check_modal_available()
         transcriber = self._get_transcriber()
 
-        # Prepare all audio data
-        batch_data = []
-        for i, path in enumerate(audio_paths):
-            batch_data.append(
-                {
-                    "audio_bytes": path.read_bytes(),
-                    "language": language,
-                    "job_id": str(uuid.uuid4()),
-                }
-            )
+        job_ids = [str(uuid.uuid4()) for _ in audio_paths]
 
-        # Run all transcriptions in parallel using Modal's map
-        loop = asyncio.get_event_loop()
+        keys = await asyncio.to_thread(upload_audio, audio_paths)
 
-        results = await loop.run_in_executor(
-            None,
-            lambda: list(
-                transcriber.transcribe.map(
-                    [d["audio_bytes"] for d in batch_data],
-                    kwargs={
-                        "language": language,
-                    },
-                )
-            ),
-        )
+        # One call per file: concurrent inputs already share a warm
+        # container's model, and each call stays well inside the timeout
+        try:
+            results = await asyncio.to_thread(
+                lambda: list(
+                    transcriber.transcribe_key.map(
+                        keys,
+                        kwargs={
+                            "language": language,
+                        },
+                    )
+                ),
+            )
+        finally:
+            await asyncio.to_thread(remove_audio, keys)
 
         # Convert results
         transcript_results = []
@@ -343,29 +457,20 @@ class ModalCloudProvider(TranscriptionProvider):
             if result.get("status") == "failed":
                 transcript_results.append(
                     TranscriptResult(
-                        provider_job_id=batch_data[i]["job_id"],
+                        provider_job_id=job_ids[i],
                         status=TranscriptionStatus.FAILED,
                         error_message=result.get("error", "Unknown error"),
                     )
                 )
             else:
-                utterances = [
-                    Utterance(
-                        speaker=u["speaker"],
-                        text=u["text"],
-                        start_ms=u["start_ms"],
-                        end_ms=u["end_ms"],
-                        confidence=u.get("confidence"),
-                    )
-                    for u in result.get("utterances", [])
-                ]
+                utterances = to_utterances(result)
 
                 duration_hours = result.get("duration_ms", 0) / 1000 / 3600
                 estimated_cost = int(duration_hours * self.COST_PER_HOUR_CENTS)
 
                 transcript_results.append(
                     TranscriptResult(
-                        provider_job_id=batch_data[i]["job_id"],
+                        provider_job_id=job_ids[i],
                         status=TranscriptionStatus.COMPLETED,
                         utterances=utterances,
                         full_text=result.get("full_text", ""),
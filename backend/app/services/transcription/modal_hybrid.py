@@ -16,21 +16,21 @@ Performance: ~8-15 minutes for 100 videos vs 25+ hours on local GPU
 import asyncio
 import uuid
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Callable
 from loguru import logger
 
 from app.services.transcription.base import (
     TranscriptionProvider,
     TranscriptionStatus,
-    Utterance,
     TranscriptResult,
 )
-from app.services.transcription.modal_cloud import MODAL_AVAILABLE
+from app.services.transcription.modal_cloud import MODAL_AVAILABLE, to_utterances
 
 if MODAL_AVAILABLE:
     from app.services.transcription.modal_cloud import (
-        ModalWhisperTranscriber,
+        get_transcriber,
+        remove_audio,
+        upload_audio,
     )
 
 
@@ -58,6 +58,7 @@ class ModalHybridProvider(TranscriptionProvider):
         gpu_type: str = "A10G",
         max_concurrent: int = 50,
         max_upload_workers: int = 10,
+        compute_type: str = "int8_float16",
     ):
         """
         Initialize Modal hybrid provider.
@@ -66,13 +67,14 @@ class ModalHybridProvider(TranscriptionProvider):
             model: Whisper model to use
             gpu_type: Modal GPU type (T4, A10G, A100)
             max_concurrent: Max parallel Modal workers
-            max_upload_workers: Max parallel upload threads
+            max_upload_workers: Max files uploading at once
+            compute_type: faster-whisper precision on the GPU container
         """
         self._model_name = model
         self._gpu_type = gpu_type
         self._max_concurrent = max_concurrent
         self._max_upload_workers = max_upload_workers
-        self._transcriber = None
+        self._compute_type = compute_type
 
     @property
     def name(self) -> str:
@@ -101,11 +103,9 @@ class ModalHybridProvider(TranscriptionProvider):
             raise RuntimeError("MODAL_TOKEN_ID not set. Run: modal token new")
 
     def _get_transcriber(self):
-        """Get or create Modal transcriber instance."""
-        if self._transcriber is None:
-            self._check_modal_available()
-            self._transcriber = ModalWhisperTranscriber()
-        return self._transcriber
+        """Get the shared Modal transcriber instance."""
+        self._check_modal_available()
+        return get_transcriber(self._compute_type)
 
     async def submit_job(
         self, audio_path: Path, speakers_expected: int = 2, language: str = "en"
@@ -140,16 +140,13 @@ class ModalHybridProvider(TranscriptionProvider):
             logger.info(f"Uploading {audio_size_mb:.1f}MB audio to Modal")
 
             # Run transcription
-            loop = asyncio.get_event_loop()
             transcriber = self._get_transcriber()
 
-            result = await loop.run_in_executor(
-                None,
-                lambda: transcriber.transcribe.remote(
-                    audio_bytes=audio_bytes,
-                    language=language,
-                    job_id=job_id,
-                ),
+            result = await asyncio.to_thread(
+                transcriber.transcribe.remote,
+                audio_bytes=audio_bytes,
+                language=language,
+                job_id=job_id,
             )
 
             return self._process_result(result, job_id)
@@ -194,88 +191,42 @@ class ModalHybridProvider(TranscriptionProvider):
         self._check_modal_available()
         transcriber = self._get_transcriber()
 
-        # Prepare batch data with progress tracking
-        batch_data = []
-        if on_progress:
-            on_progress(0, total, "Preparing audio files...")
-
-        # Read all audio files in parallel
-        def read_audio(path: Path) -> tuple[Path, bytes]:
-            return (path, path.read_bytes())
-
-        with ThreadPoolExecutor(max_workers=self._max_upload_workers) as executor:
-            audio_data = list(executor.map(read_audio, audio_paths))
-
-        for i, (path, audio_bytes) in enumerate(audio_data):
-            batch_data.append(
-                {
-                    "path": path,
-                    "audio_bytes": audio_bytes,
-                    "job_id": str(uuid.uuid4()),
-                }
-            )
-
         if on_progress:
             on_progress(0, total, f"Uploading {total} files to Modal...")
 
-        # Use Modal's spawn for parallel execution with streaming results
-        loop = asyncio.get_event_loop()
-
-        def run_batch():
-            """Run batch transcription on Modal."""
-            # Spawn all jobs
-            handles = []
-            for data in batch_data:
-                handle = transcriber.transcribe.spawn(
-                    audio_bytes=data["audio_bytes"],
-                    language=language,
-                    job_id=data["job_id"],
+        # Each file is spawned as soon as its upload lands, so later uploads
+        # overlap earlier transcriptions; the semaphore bounds uploads only
+        upload_slots = asyncio.Semaphore(self._max_upload_workers)
+        keys: list[str] = []
+        completed = 0
+
+        async def run(path: Path) -> TranscriptResult:
+            nonlocal completed
+            job_id = str(uuid.uuid4())
+            try:
+                async with upload_slots:
+                    (key,) = await asyncio.to_thread(upload_audio, [path])
+                keys.append(key)
+                # Files stream from disk to the audio volume; the call carries
+                # only the key and the GPU container reads the file in place
+                handle = await transcriber.transcribe_key.spawn.aio(
+                    audio_key=key, language=language, job_id=job_id
                 )
-                handles.append((data, handle))
-
-            # Collect results as they complete
-            results = []
-            completed = 0
-            for data, handle in handles:
-                try:
-                    result = handle.get()
-                    results.append((data, result))
-                    completed += 1
-                    if on_progress:
-                        on_progress(
-                            completed, total, f"Transcribed {completed}/{total}"
-                        )
-                except Exception as e:
-                    results.append((data, {"status": "failed", "error": str(e)}))
-                    completed += 1
-                    if on_progress:
-                        on_progress(
-                            completed,
-                            total,
-                            f"Transcribed {completed}/{total} (1 failed)",
-                        )
-
-            return results
-
-        results = await loop.run_in_executor(None, run_batch)
-
-        # Convert to TranscriptResults maintaining order
-        path_to_result = {
-            str(data["path"]): self._process_result(result, data["job_id"])
-            for data, result in results
-        }
-
-        transcript_results = [
-            path_to_result.get(
-                str(path),
-                TranscriptResult(
-                    provider_job_id="unknown",
-                    status=TranscriptionStatus.FAILED,
-                    error_message="Result not found",
-                ),
+                result = await handle.get.aio()
+            except Exception as e:
+                result = {"status": "failed", "error": str(e)}
+
+            completed += 1
+            if on_progress:
+                on_progress(completed, total, f"Transcribed {completed}/{total}")
+            return self._process_result(result, job_id)
+
+        try:
+            transcript_results = await asyncio.gather(
+                *(run(path) for path in audio_paths)
             )
-            for path in audio_paths
-        ]
+        finally:
+            await asyncio.to_thread(remove_audio, keys)
 
         completed_count = sum(
             1 for r in transcript_results if r.status == TranscriptionStatus.COMPLETED
@@ -299,16 +250,7 @@ class ModalHybridProvider(TranscriptionProvider):
                 error_message=result.get("error", "Unknown error"),
             )
 
-        utterances = [
-            Utterance(
-                speaker=u["speaker"],
-                text=u["text"],
-                start_ms=u["start_ms"],
-                end_ms=u["end_ms"],
-                confidence=u.get("confidence"),
-            )
-            for u in result.get("utterances", [])
-        ]
+        utterances = to_utterances(result)
 
         duration_hours = result.get("duration_ms", 0) / 1000 / 3600
         estimated_cost = int(duration_hours * self.COST_PER_HOUR_CENTS)
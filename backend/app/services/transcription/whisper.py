@@ -124,15 +124,14 @@ class WhisperProvider(TranscriptionProvider):
 
         try:
             # Run CPU-intensive transcription in thread pool
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, lambda: self._transcribe_sync(audio_path, language)
+            result = await asyncio.to_thread(
+                self._transcribe_sync, audio_path, language
             )
 
             # Try diarization if available
             if self.supports_diarization:
-                diarization_result = await loop.run_in_executor(
-                    None, lambda: self._diarize_sync(audio_path, result)
+                diarization_result = await asyncio.to_thread(
+                    self._diarize_sync, audio_path, result
                 )
                 if diarization_result:
                     result = diarization_result
@@ -15,11 +15,14 @@ from qdrant_client.models import (
 )
 
 from app.config import settings
+from app.schemas.search import text_preview
 
 
 class VectorStoreService:
     """Service for managing vector embeddings in Qdrant."""
 
+    SEARCH_PARAMS = SearchParams(hnsw_ef=128, exact=False)
+
     def __init__(self, client: QdrantClient | None = None):
         self.client = client or QdrantClient(
             host=settings.QDRANT_HOST,
@@ -110,6 +113,7 @@ class VectorStoreService:
                 "speaker": chunk.get("primary_speaker"),
                 "speakers": chunk.get("speakers", []),
                 "text": chunk["text"],
+                "text_preview": text_preview(chunk["text"]),
                 "episode_title": chunk.get("episode_title", ""),
                 "channel_name": chunk.get("channel_name", ""),
                 "channel_slug": chunk.get("channel_slug", ""),
@@ -173,7 +177,25 @@ class VectorStoreService:
         Returns:
             List of result dicts with payload and score
         """
-        # Build filter conditions
+        results = self.client.search(
+            collection_name=self.collection_name,
+            query_vector=query_vector,
+            limit=limit,
+            query_filter=self._build_filter(speaker, channel_id, date_from, date_to),
+            score_threshold=score_threshold,
+            search_params=self.SEARCH_PARAMS,
+        )
+
+        return [self._to_result(r) for r in results]
+
+    @staticmethod
+    def _build_filter(
+        speaker: str | None = None,
+        channel_id: str | None = None,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> Filter | None:
+        """Build the payload filter for search()."""
         conditions = []
 
         if speaker:
@@ -206,28 +228,16 @@ class VectorStoreService:
                 )
             )
 
-        query_filter = Filter(must=conditions) if conditions else None
+        return Filter(must=conditions) if conditions else None
 
-        results = self.client.search(
-            collection_name=self.collection_name,
-            query_vector=query_vector,
-            limit=limit,
-            query_filter=query_filter,
-            score_threshold=score_threshold,
-            search_params=SearchParams(
-                hnsw_ef=128,
-                exact=False,
-            ),
-        )
-
-        return [
-            {
-                "id": str(r.id),
-                "score": r.score,
-                **r.payload,
-            }
-            for r in results
-        ]
+    @staticmethod
+    def _to_result(point) -> dict:
+        """Flatten a scored point into a result dict."""
+        return {
+            "id": str(point.id),
+            "score": point.score,
+            **point.payload,
+        }
 
     async def delete_by_episode(self, episode_id: str) -> int:
         """
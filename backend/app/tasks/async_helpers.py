@@ -9,6 +9,14 @@ import asyncio
 import threading
 from typing import Coroutine, TypeVar
 
+# uvloop is optional (no Windows support); uvicorn already serves the API on it
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 T = TypeVar("T")
 
 # Thread-local storage for event loops (one per Celery worker thread)
@@ -20,14 +28,17 @@ def get_event_loop() -> asyncio.AbstractEventLoop:
     Get or create an event loop for the current thread.
 
     Reuses the same loop for all tasks in a worker thread,
-    avoiding the overhead of creating new loops per task.
+    avoiding the overhead of creating new loops per task. Uses uvloop
+    when installed, which is markedly faster for socket-heavy provider calls.
     """
     if (
         not hasattr(_thread_local, "loop")
         or _thread_local.loop is None
         or _thread_local.loop.is_closed()
     ):
-        _thread_local.loop = asyncio.new_event_loop()
+        _thread_local.loop = (
+            uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        )
         asyncio.set_event_loop(_thread_local.loop)
     return _thread_local.loop
 
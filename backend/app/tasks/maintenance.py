@@ -272,6 +272,7 @@ def reindex_episode(self, episode_id: str):
             for chunk in chunk_data:
                 db_chunk = Chunk(
                     episode_id=chunk["episode_id"],
+                    channel_id=episode.channel_id,
                     text=chunk["text"],
                     start_ms=chunk["start_ms"],
                     end_ms=chunk["end_ms"],
@@ -14,6 +14,7 @@ from app.services.speaker_labeling import SpeakerLabelingService
 from app.services.chunking import ChunkingService
 from app.services.embedding import EmbeddingService
 from app.services.vector_store import VectorStoreService
+from app.services.cache import SemanticResponseCache
 from app.services.websocket_manager import publish_job_update
 
 
@@ -110,6 +111,7 @@ class TranscriptionPipeline:
                 transcript.utterances or [],
                 speakers,
                 episode.title,
+                channel_id=str(episode.channel_id),
             )
             await self._log(job, "info", "Speaker labeling complete")
 
@@ -178,6 +180,9 @@ class TranscriptionPipeline:
 
             await self.db.commit()
 
+            # New content may answer questions differently: drop cached answers
+            await SemanticResponseCache.bump_generation()
+
             logger.info(f"Successfully processed episode: {episode.title}")
             return True
 
@@ -302,6 +307,7 @@ class TranscriptionPipeline:
         utterances: list,
         known_speakers: list[str],
         episode_title: str,
+        channel_id: str | None = None,
     ) -> list[dict]:
         if not utterances:
             return []
@@ -311,6 +317,7 @@ class TranscriptionPipeline:
             utterances=utterances,
             known_speakers=known_speakers,
             episode_title=episode_title,
+            channel_id=channel_id,
         )
 
         # Apply labels
@@ -398,6 +405,7 @@ class TranscriptionPipeline:
         for chunk_dict, point_id in zip(chunk_data, point_ids):
             db_chunk = Chunk(
                 episode_id=episode.id,
+                channel_id=episode.channel_id,
                 qdrant_point_id=uuid.UUID(point_id),
                 text=chunk_dict["text"],
                 primary_speaker=chunk_dict["primary_speaker"],
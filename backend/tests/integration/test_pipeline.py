@@ -422,3 +422,82 @@ class TestSearchEnrichmentIntegration:
         assert len(results) == 1
         assert results[0].episode_title == "Enrichment Test Episode"
         assert results[0].channel_name == "Enrichment Test Channel"
+
+    @pytest.mark.asyncio
+    async def test_enrichment_fetches_context_windows(self, db_session):
+        """Each result should get its nearest utterances on each side, in order."""
+        from app.models import Channel, Episode, Utterance
+        from app.services.search_enrichment import SearchEnrichmentService
+
+        channel = Channel(
+            id=uuid4(),
+            slug="context-test",
+            name="Context Test Channel",
+            youtube_channel_id="UC790",
+        )
+        db_session.add(channel)
+
+        episode = Episode(
+            id=uuid4(),
+            channel_id=channel.id,
+            youtube_id="context123",
+            title="Context Test Episode",
+            status="done",
+        )
+        db_session.add(episode)
+
+        for i in range(8):
+            db_session.add(
+                Utterance(
+                    episode_id=episode.id,
+                    speaker="Host",
+                    text=f"utterance {i}",
+                    start_ms=i * 1000,
+                    end_ms=i * 1000 + 900,
+                )
+            )
+        await db_session.commit()
+
+        service = SearchEnrichmentService(db_session)
+        vector_results = [
+            {
+                "chunk_id": str(uuid4()),
+                "episode_id": str(episode.id),
+                "channel_id": str(channel.id),
+                "text": "utterance 4",
+                "speaker": "Host",
+                "speakers": ["Host"],
+                "start_ms": 4000,
+                "end_ms": 4900,
+                "score": 0.9,
+            },
+            {
+                "chunk_id": str(uuid4()),
+                "episode_id": str(episode.id),
+                "channel_id": str(channel.id),
+                "text": "utterance 0",
+                "speaker": "Host",
+                "speakers": ["Host"],
+                "start_ms": 0,
+                "end_ms": 900,
+                "score": 0.8,
+            },
+        ]
+
+        results = await service.enrich_results(
+            vector_results, include_context=True, context_count=2
+        )
+
+        assert [u.text for u in results[0].context_before] == [
+            "utterance 2",
+            "utterance 3",
+        ]
+        assert [u.text for u in results[0].context_after] == [
+            "utterance 5",
+            "utterance 6",
+        ]
+        assert results[1].context_before == []
+        assert [u.text for u in results[1].context_after] == [
+            "utterance 1",
+            "utterance 2",
+        ]
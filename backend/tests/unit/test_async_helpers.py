@@ -81,6 +81,26 @@ class TestAsyncHelpers:
 
         cleanup_loop()
 
+    def test_get_event_loop_prefers_uvloop(self):
+        """Test that worker loops come from uvloop when it is installed."""
+        from unittest.mock import MagicMock, patch
+
+        from app.tasks import async_helpers
+
+        cleanup_loop()
+        fake_uvloop = MagicMock()
+        fake_uvloop.new_event_loop.side_effect = asyncio.new_event_loop
+
+        with patch.object(async_helpers, "UVLOOP_AVAILABLE", True), patch.object(
+            async_helpers, "uvloop", fake_uvloop, create=True
+        ):
+            loop = get_event_loop()
+
+        fake_uvloop.new_event_loop.assert_called_once()
+        assert loop is get_event_loop()
+
+        cleanup_loop()
+
     def test_multiple_run_async_calls_same_loop(self):
         """Test that multiple run_async calls use the same event loop."""
         cleanup_loop()
@@ -121,6 +141,26 @@ class TestProviderFactory:
             assert "max_concurrent" in provider
             assert "cost_per_hour_cents" in provider
 
+    def test_get_available_providers_is_cached(self):
+        """Test that providers are probed once and callers get copies."""
+        from unittest.mock import patch
+
+        from app.services.transcription import factory
+
+        factory.refresh_providers()
+        with patch.object(
+            factory, "_probe_providers", wraps=factory._probe_providers
+        ) as probe:
+            first = factory.get_available_providers()
+            first[0]["available"] = "mutated"
+            second = factory.get_available_providers()
+            probe.assert_not_called()
+
+            factory.refresh_providers()
+            probe.assert_called_once()
+
+        assert second[0]["available"] != "mutated"
+
     def test_faster_whisper_is_available(self):
         """Test that faster-whisper is available in the container."""
         from app.services.transcription.factory import get_available_providers
@@ -142,6 +182,98 @@ class TestProviderFactory:
         provider = get_provider("faster-whisper")
         assert isinstance(provider, FasterWhisperProvider)
 
+    def test_package_import_skips_provider_modules(self):
+        """Importing the package should not load any provider SDK."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, app.services.transcription as t; "
+            "assert 'app.services.transcription.modal_cloud' not in sys.modules; "
+            "assert 'app.services.transcription.faster_whisper' not in sys.modules; "
+            "t.FasterWhisperProvider"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_get_provider_reuses_instance_per_config(self):
+        """Test that the same settings give the same provider instance."""
+        from unittest.mock import patch
+
+        from app.config import settings
+        from app.services.transcription.factory import get_provider
+
+        provider = get_provider("faster-whisper")
+        assert get_provider("faster-whisper") is provider
+
+        with patch.object(settings, "FASTER_WHISPER_MODEL", "tiny"):
+            assert get_provider("faster-whisper") is not provider
+
+    def test_prewarm_loads_model_once(self):
+        """Test that prewarm and a racing first job share one model load."""
+        import time
+        from unittest.mock import patch
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        provider = FasterWhisperProvider(model="tiny")
+        loads = []
+
+        def fake_load():
+            time.sleep(0.05)
+            loads.append(1)
+            provider._model = object()
+
+        async def race():
+            await asyncio.gather(
+                provider.prewarm(), asyncio.to_thread(provider._load_model)
+            )
+
+        with patch.object(provider, "_load_model_locked", fake_load), patch.object(
+            FasterWhisperProvider, "supports_diarization", False
+        ):
+            run_async(race())
+
+        assert loads == [1]
+
+    def test_device_detection_is_memoized(self):
+        """Test that device probing and the diarization check run once."""
+        from unittest.mock import patch
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        provider = FasterWhisperProvider(model="tiny")
+
+        with patch.object(
+            provider, "_probe_device_and_compute", return_value=("cpu", "int8")
+        ) as probe, patch(
+            "app.services.transcription.faster_whisper.importlib.util.find_spec",
+            return_value=None,
+        ) as find_spec:
+            provider.get_model_info()
+            provider.get_model_info()
+
+        probe.assert_called_once()
+        find_spec.assert_called_once()
+
+    def test_cuda_probe_runs_once_per_process(self):
+        """Test that the CUDA availability probe is cached process-wide."""
+        import sys
+        from unittest.mock import MagicMock, patch
+
+        from app.services.transcription import _gpu
+
+        torch = MagicMock()
+        torch.cuda.is_available.return_value = True
+        _gpu.cuda_available.cache_clear()
+        try:
+            with patch.dict(sys.modules, {"torch": torch}):
+                assert _gpu.cuda_available() is True
+                assert _gpu.cuda_available() is True
+        finally:
+            _gpu.cuda_available.cache_clear()
+
+        torch.cuda.is_available.assert_called_once()
+
     def test_get_provider_raises_for_unknown(self):
         """Test that get_provider raises ValueError for unknown provider."""
         from app.services.transcription.factory import get_provider
@@ -1,9 +1,18 @@
 """Unit tests for cache service."""
 
+import json
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.services.cache import CacheService, EmbeddingCache, SearchCache
+from app.services.cache import (
+    BloomFilter,
+    CacheService,
+    EmbeddingCache,
+    QueryEmbeddingCache,
+    SearchCache,
+    SemanticResponseCache,
+    TTLCache,
+)
 
 
 class TestCacheService:
@@ -86,6 +95,133 @@ class TestEmbeddingCache:
         assert key1 != key2
 
 
+class TestQueryEmbeddingCache:
+    """Tests for the quantized query embedding cache."""
+
+    def test_round_trip_is_close(self):
+        """Quantized vectors should decode close to the original."""
+        import random
+
+        vec = [random.uniform(-0.1, 0.1) for _ in range(1536)]
+
+        payload = QueryEmbeddingCache._encode(vec)
+        decoded = QueryEmbeddingCache._decode(payload)
+
+        assert len(decoded) == len(vec)
+        max_err = max(abs(a - b) for a, b in zip(vec, decoded))
+        assert max_err <= max(abs(v) for v in vec) / 127
+        assert len(payload) < len(json.dumps(vec)) / 5
+
+    def test_zero_vector(self):
+        """All-zero vectors should survive the round trip."""
+        decoded = QueryEmbeddingCache._decode(QueryEmbeddingCache._encode([0.0] * 8))
+
+        assert decoded == [0.0] * 8
+
+    @pytest.mark.asyncio
+    async def test_bloom_miss_skips_redis(self):
+        """Once the bloom filter is warm, unknown keys shouldn't hit Redis."""
+        mock_cache = AsyncMock()
+        mock_cache.set.return_value = True
+        cache = QueryEmbeddingCache(mock_cache)
+
+        with patch.object(
+            QueryEmbeddingCache, "_bloom", BloomFilter(1000)
+        ), patch.object(QueryEmbeddingCache, "_bloom_ready", True):
+            assert await cache.get("never cached") is None
+            mock_cache.get.assert_not_called()
+
+            await cache.set("cached", [0.5, -0.5])
+            mock_cache.get.return_value = QueryEmbeddingCache._encode([0.5, -0.5])
+            assert await cache.get("cached") is not None
+            mock_cache.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_batch_methods_use_the_quantized_format(self):
+        """set_many/get_many should round-trip through _encode/_decode."""
+        stored = {}
+        pipe = MagicMock()
+        pipe.setex.side_effect = lambda key, ttl, value: stored.__setitem__(key, value)
+        pipe.execute = AsyncMock()
+        redis_client = MagicMock(pipeline=MagicMock(return_value=pipe))
+        redis_client.mget = AsyncMock(
+            side_effect=lambda keys: [stored.get(k) for k in keys]
+        )
+        mock_cache = MagicMock(_get_redis=AsyncMock(return_value=redis_client))
+        cache = QueryEmbeddingCache(mock_cache)
+
+        with patch.object(
+            QueryEmbeddingCache, "_bloom", BloomFilter(1000)
+        ), patch.object(QueryEmbeddingCache, "_bloom_ready", True):
+            assert await cache.set_many({"a": [0.5, -0.5]}) == 1
+            assert cache._key("a") in QueryEmbeddingCache._bloom
+            results = await cache.get_many(["a", "b"])
+
+        assert list(results) == ["a"]
+        assert results["a"] == pytest.approx([0.5, -0.5], abs=0.01)
+        assert redis_client.mget.call_args.args[0] == [cache._key("a")]
+
+    @pytest.mark.asyncio
+    async def test_rewarm_picks_up_keys_written_elsewhere(self):
+        """A refresh should admit keys another process wrote to Redis."""
+        cache = QueryEmbeddingCache(AsyncMock())
+        remote_keys = []
+
+        async def scan_iter(match, count):
+            for key in list(remote_keys):
+                yield key
+
+        redis_client = MagicMock(scan_iter=scan_iter)
+        mock_cache = MagicMock(_get_redis=AsyncMock(return_value=redis_client))
+
+        with patch.object(QueryEmbeddingCache, "_bloom", None), patch.object(
+            QueryEmbeddingCache, "_bloom_ready", False
+        ):
+            await QueryEmbeddingCache.warm_bloom(mock_cache)
+            assert cache._key("elsewhere") not in QueryEmbeddingCache._bloom
+
+            remote_keys.append(cache._key("elsewhere"))
+            assert await QueryEmbeddingCache.warm_bloom(mock_cache) == 1
+            assert cache._key("elsewhere") in QueryEmbeddingCache._bloom
+
+            mock_cache._get_redis.side_effect = ConnectionError("down")
+            await QueryEmbeddingCache.warm_bloom(mock_cache)
+            assert QueryEmbeddingCache._bloom_ready is False
+
+
+class TestBloomFilter:
+    """Tests for the in-process bloom filter."""
+
+    def test_added_keys_are_present(self):
+        """Added keys are always reported present; few false positives."""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"key:{i}")
+
+        assert all(f"key:{i}" in bloom for i in range(1000))
+        false_positives = sum(f"other:{i}" in bloom for i in range(1000))
+        assert false_positives < 50
+
+
+class TestTTLCache:
+    """Tests for the in-process TTL cache."""
+
+    def test_entries_expire_and_oldest_is_evicted(self):
+        """Entries past their TTL miss; the oldest goes when full."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["c"] = 3
+
+        assert "a" not in cache
+        assert cache["c"] == 3
+        assert len(cache) == 2
+
+        with patch("app.services.cache.time.monotonic", return_value=1e12):
+            assert "b" not in cache
+            assert cache.get("c") is None
+
+
 class TestSearchCache:
     """Tests for search cache."""
 
@@ -108,3 +244,43 @@ class TestSearchCache:
         key2 = cache._key("query", None, 20)
 
         assert key1 != key2
+
+    def test_key_normalizes_query_and_filter_order(self):
+        """Equivalent queries and filter dicts should share a versioned key."""
+        cache = SearchCache.__new__(SearchCache)
+        cache.prefix = "search"
+
+        key1 = cache._key("  Startup  Advice ", {"a": 1, "b": 2}, 10)
+        key2 = cache._key("startup advice", {"b": 2, "a": 1}, 10)
+
+        assert key1 == key2
+        assert key1.startswith(f"search:{SearchCache.VERSION}:")
+
+
+class TestSemanticResponseCache:
+    """Tests for the semantic RAG answer cache."""
+
+    @pytest.mark.asyncio
+    async def test_similar_query_hits_and_filters_isolate(self):
+        """Near-duplicate vectors hit; other filters or distant vectors miss."""
+        cache = SemanticResponseCache(threshold=0.9, cache=AsyncMock())
+        fp = SemanticResponseCache.fingerprint(speaker="Host")
+
+        await cache.set([1.0, 0.0, 0.0], fp, "answer")
+
+        assert await cache.get([0.98, 0.05, 0.0], fp) == "answer"
+        assert await cache.get([0.0, 1.0, 0.0], fp) is None
+        other = SemanticResponseCache.fingerprint(speaker="Guest")
+        assert await cache.get([1.0, 0.0, 0.0], other) is None
+
+    @pytest.mark.asyncio
+    async def test_evicts_oldest_entry(self):
+        """Should keep at most max_entries, dropping the oldest first."""
+        cache = SemanticResponseCache(max_entries=2, cache=AsyncMock())
+
+        await cache.set([1.0, 0.0], "fp", "first")
+        await cache.set([0.0, 1.0], "fp", "second")
+        await cache.set([-1.0, 0.0], "fp", "third")
+
+        assert await cache.get([1.0, 0.0], "fp") is None
+        assert await cache.get([0.0, 1.0], "fp") == "second"
@@ -5,7 +5,7 @@ Tests router logic with mocked dependencies.
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 
@@ -520,6 +520,93 @@ class TestJobRouter:
         assert data["progress"] == 50
 
 
+class TestChatRouter:
+    """Tests for chat endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_searches_on_its_own_open_session(self, client):
+        """The stream should search on a session it holds open until the end."""
+        from contextlib import asynccontextmanager
+
+        session = MagicMock()
+        state = []
+
+        @asynccontextmanager
+        async def session_factory():
+            state.append("open")
+            yield session
+            state.append("closed")
+
+        async def chat_stream(**kwargs):
+            state.append("searching")
+            yield "Hel"
+            yield "lo"
+            done = MagicMock()
+            done.model_dump_json.return_value = '{"answer": "Hello"}'
+            yield done
+
+        with patch("app.routers.chat.AsyncSessionLocal", session_factory), patch(
+            "app.routers.chat.EmbeddingService"
+        ), patch("app.routers.chat.VectorStoreService"), patch(
+            "app.routers.chat.SearchService"
+        ) as search_service, patch(
+            "app.routers.chat.RAGService"
+        ) as rag_service:
+            rag_service.return_value.chat_stream = chat_stream
+            response = await client.post(
+                "/api/chat/stream", json={"message": "What is a moat?"}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert 'event: delta\ndata: {"text": "Hel"}' in response.text
+        assert 'event: done\ndata: {"answer": "Hello"}' in response.text
+        assert search_service.call_args.kwargs["db"] is session
+        assert state == ["open", "searching", "closed"]
+
+
+class TestWebhookRouter:
+    """Tests for provider webhook endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_deepgram_callback_checks_token_and_stores(self, client):
+        """Should reject a bad token and store the body under its request_id."""
+        from app.config import settings
+
+        body = b'{"metadata": {"request_id": "req-1"}, "results": {}}'
+
+        with patch.object(
+            settings, "DEEPGRAM_CALLBACK_URL", "https://example.com/hook"
+        ), patch.object(settings, "DEEPGRAM_CALLBACK_SECRET", "s3cret"), patch(
+            "app.routers.webhooks.DeepgramProvider.store_callback",
+            new_callable=AsyncMock,
+        ) as store:
+            bad = await client.post("/api/webhooks/deepgram?token=wrong", content=body)
+            ok = await client.post("/api/webhooks/deepgram?token=s3cret", content=body)
+
+        assert bad.status_code == 401
+        assert ok.status_code == 204
+        store.assert_awaited_once_with("req-1", body)
+
+    @pytest.mark.asyncio
+    async def test_deepgram_callback_requires_a_secret(self, client):
+        """Without a configured secret, even a tokenless post is refused."""
+        from app.config import settings
+
+        body = b'{"metadata": {"request_id": "req-1"}, "results": {}}'
+
+        with patch.object(
+            settings, "DEEPGRAM_CALLBACK_URL", "https://example.com/hook"
+        ), patch.object(settings, "DEEPGRAM_CALLBACK_SECRET", None), patch(
+            "app.routers.webhooks.DeepgramProvider.store_callback",
+            new_callable=AsyncMock,
+        ) as store:
+            response = await client.post("/api/webhooks/deepgram", content=body)
+
+        assert response.status_code == 503
+        store.assert_not_awaited()
+
+
 class TestHealthEndpoints:
     """Tests for health check endpoints."""
 
@@ -88,6 +88,35 @@ class TestSearchService:
         call_kwargs = mock_vector_store.search.call_args.kwargs
         assert call_kwargs["limit"] == 5
 
+    @pytest.mark.asyncio
+    async def test_search_resolves_slug_alongside_embedding(
+        self, db_session, mock_embedding_service, mock_vector_store
+    ):
+        """Slug lookup and embedding should both feed the vector search."""
+        from types import SimpleNamespace
+
+        service = SearchService(
+            db=db_session,
+            embedding_service=mock_embedding_service,
+            vector_store=mock_vector_store,
+        )
+
+        channel_id = uuid4()
+        mock_vector_store.search.return_value = []
+
+        with patch.object(
+            service,
+            "_get_channel_by_slug",
+            new_callable=AsyncMock,
+            return_value=SimpleNamespace(id=channel_id),
+        ) as mock_lookup:
+            await service.search(query="test", channel_slug="test-channel")
+
+        mock_lookup.assert_awaited_once_with("test-channel")
+        mock_embedding_service.embed_query.assert_called_once_with("test")
+        call_kwargs = mock_vector_store.search.call_args.kwargs
+        assert call_kwargs["channel_id"] == str(channel_id)
+
 
 class TestHybridSearchService:
     """Tests for hybrid search service."""
@@ -190,3 +219,76 @@ class TestPostgresSearchService:
         assert "!" not in result
         assert "@" not in result
         assert "#" not in result
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_filters_min_rank_after_ranking(self):
+        """Rows below min_rank should be dropped after the ranked LIMIT."""
+        from types import SimpleNamespace
+        from unittest.mock import MagicMock
+
+        def row(rank):
+            return SimpleNamespace(
+                id=uuid4(),
+                episode_id=uuid4(),
+                channel_id=uuid4(),
+                text="text",
+                primary_speaker="Host",
+                speakers=None,
+                start_ms=0,
+                end_ms=1000,
+                rank=rank,
+            )
+
+        service = PostgresSearchService.__new__(PostgresSearchService)
+        service.db = AsyncMock()
+        service.db.execute.return_value = MagicMock(
+            all=MagicMock(return_value=[row(0.5), row(0.02), row(0.001)])
+        )
+
+        results = await service.keyword_search("hello", min_rank=0.01)
+
+        assert [r.rank for r in results] == [0.5, 0.02]
+        assert results[0].speakers == []
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_ranks_every_match_before_limit(self):
+        """No cap should cut the match set before ts_rank_cd orders it."""
+        from unittest.mock import MagicMock
+        from sqlalchemy.dialects import postgresql
+
+        service = PostgresSearchService.__new__(PostgresSearchService)
+        service.db = AsyncMock()
+        service.db.execute.return_value = MagicMock(all=MagicMock(return_value=[]))
+
+        await service.keyword_search("hello", limit=20)
+
+        stmt = service.db.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.count("LIMIT") == 1
+        assert sql.index("ORDER BY rank DESC") < sql.index("LIMIT")
+
+
+class TestSearchEnrichmentService:
+    """Tests for result enrichment queries."""
+
+    def test_postgres_context_reads_a_bounded_slice_per_side(self):
+        """Each side should be a LATERAL ORDER BY ... LIMIT, not a full join."""
+        from sqlalchemy import Integer, literal, select
+        from sqlalchemy.dialects import postgresql
+
+        from app.models import Utterance
+        from app.services.search_enrichment import SearchEnrichmentService
+
+        windows = select(
+            literal(0, Integer).label("idx"),
+            literal(uuid4(), Utterance.episode_id.type).label("episode_id"),
+            literal(4000, Integer).label("start_ms"),
+            literal(4900, Integer).label("end_ms"),
+        ).cte("windows")
+
+        stmt = SearchEnrichmentService._lateral_context_stmt(windows, 2)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("JOIN LATERAL") == 2
+        assert sql.count("LIMIT") == 2
+        assert "row_number" not in sql
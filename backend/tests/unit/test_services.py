@@ -259,6 +259,29 @@ class TestSpeakerLabelingService:
         assert labeled[0]["speaker_raw"] == "SPEAKER_99"
         assert labeled[0]["speaker"] == "Guest"  # Default label
 
+    def test_apply_speaker_labels_numbers_guests_by_first_appearance(self):
+        """Unknown speakers should be Guest, Guest 2, ... in speaking order."""
+        from app.services.speaker_labeling import SpeakerLabelingService
+        from app.services.transcription.base import Utterance
+
+        with patch("app.services.speaker_labeling.anthropic"):
+            service = SpeakerLabelingService()
+
+        utterances = [
+            Utterance(speaker=s, text="Hi", start_ms=i, end_ms=i + 1)
+            for i, s in enumerate("CADCA")
+        ]
+
+        labeled = service.apply_speaker_labels(utterances, {"A": "Sam"})
+
+        assert [u["speaker"] for u in labeled] == [
+            "Guest",
+            "Sam",
+            "Guest 2",
+            "Guest",
+            "Sam",
+        ]
+
     @pytest.mark.asyncio
     async def test_identify_speakers_empty_utterances(self):
         """Should return empty mapping for empty utterances."""
@@ -274,6 +297,700 @@ class TestSpeakerLabelingService:
 
         assert mapping == {}
 
+    def test_sample_covers_every_speaker_and_prefers_names(self):
+        """Should sample each speaker, favouring name mentions and proper nouns."""
+        from app.services.speaker_labeling import SpeakerLabelingService
+        from app.services.transcription.base import Utterance
+
+        with patch("app.services.speaker_labeling.anthropic"):
+            service = SpeakerLabelingService()
+
+        def utt(speaker, text, at):
+            return Utterance(speaker=speaker, text=text, start_ms=at, end_ms=at + 1)
+
+        utterances = [utt("A", "x" * (50 + i), i) for i in range(20)]
+        utterances[5] = utt("A", "we sold it to Hubspot", 5)
+        utterances += [
+            utt("C", "Thanks for having me.", 20),
+            utt("B", "Sam, what do you think?", 21),
+            utt("B", "y" * 300, 22),
+        ]
+
+        sample = service._get_representative_sample(utterances, 6, ["Sam Parr"])
+
+        speakers = [u.speaker for u in sample]
+        assert speakers.count("A") == service.MIN_SAMPLE_PER_SPEAKER
+        assert "C" in speakers
+        assert "we sold it to Hubspot" in [u.text for u in sample]
+        assert "Sam, what do you think?" in [u.text for u in sample]
+        assert sample == sorted(sample, key=lambda u: u.start_ms)
+
+        prompt = service._build_identification_prompt(
+            sample, ["A", "B", "C"], ["Sam Parr"], None
+        )
+        assert "y" * service.SAMPLE_TEXT_CHARS + "..." in prompt
+        assert len(prompt) < 1200
+        assert prompt is service._build_identification_prompt(
+            sample, ["C", "B", "A"], ["Sam Parr"], None
+        )
+
+    def test_preview_keeps_head_and_tail_of_monologues(self):
+        """Previews are truncated once; long monologues keep both ends."""
+        from app.services.transcription.base import PREVIEW_CHARS, Utterance
+
+        text = "start " + "x" * 1000 + " end"
+        short = Utterance(speaker="A", text=text, start_ms=0, end_ms=60_000)
+        monologue = Utterance(speaker="A", text=text, start_ms=0, end_ms=900_000)
+
+        assert short.preview == text[:PREVIEW_CHARS] + "..."
+        assert monologue.preview.startswith("start ")
+        assert monologue.preview.endswith(" end")
+        assert len(monologue.preview) <= PREVIEW_CHARS + 5
+
+    def test_load_mapping_finds_json_in_fences_and_prose(self):
+        """Should pull the mapping out of fenced or chatty replies."""
+        from app.services.speaker_labeling import SpeakerLabelingService
+
+        with patch("app.services.speaker_labeling.anthropic"):
+            service = SpeakerLabelingService()
+
+        for reply in (
+            '```json\n{"A": "Sam Parr"}```',
+            'Sure! {"A": "Sam Parr", "B": "Guest"}',
+        ):
+            mapping = service._load_mapping(reply, ["A", "B"])
+            assert mapping == {"A": "Sam Parr", "B": "Guest"}
+
+        assert service._load_mapping("no idea", ["A", "B"]) is None
+        fallback = service._fallback_mapping(["A", "B"], ["Sam Parr"])
+        assert fallback == {"A": "Sam Parr", "B": "Guest"}
+
+    @pytest.mark.asyncio
+    async def test_identify_speakers_retries_main_model_on_bad_reply(self):
+        """An unparseable fast-model reply should get one main-model retry."""
+        from app.services.speaker_labeling import SpeakerLabelingService
+        from app.services.transcription.base import Utterance
+
+        mapping_cache = AsyncMock()
+        mapping_cache.get.return_value = None
+        with patch("app.services.speaker_labeling.anthropic"):
+            service = SpeakerLabelingService(mapping_cache=mapping_cache, model="fast")
+        service.fallback_model = "main"
+
+        def reply(text):
+            response = MagicMock()
+            response.content[0].text = text
+            return response
+
+        service.client.messages.create = AsyncMock(
+            side_effect=[reply("I think A is Sam."), reply('{"A": "Sam Parr"}')]
+        )
+        utterances = [
+            Utterance(speaker=s, text="Hi", start_ms=i, end_ms=i + 1)
+            for i, s in enumerate("AB")
+        ]
+
+        mapping = await service.identify_speakers(utterances, ["Sam Parr"])
+
+        models = [
+            c.kwargs["model"] for c in service.client.messages.create.call_args_list
+        ]
+        assert models == ["fast", "main"]
+        assert mapping == {"A": "Sam Parr", "B": "Guest"}
+
+    @pytest.mark.asyncio
+    async def test_identify_speakers_uses_mapping_cache(self):
+        """A cached mapping skips Claude; a fresh Claude mapping is cached."""
+        from app.services.speaker_labeling import SpeakerLabelingService
+        from app.services.transcription.base import Utterance
+
+        mapping_cache = AsyncMock()
+        mapping_cache.get.return_value = None
+        with patch("app.services.speaker_labeling.anthropic"):
+            service = SpeakerLabelingService(mapping_cache=mapping_cache)
+        response = MagicMock()
+        response.content[0].text = '{"A": "Sam Parr", "B": "Shaan Puri"}'
+        service.client.messages.create = AsyncMock(return_value=response)
+
+        utterances = [
+            Utterance(speaker=s, text=f"line {i}", start_ms=i, end_ms=i + 1)
+            for i, s in enumerate("ABABAB")
+        ]
+        hosts = ["Sam Parr", "Shaan Puri"]
+
+        mapping = await service.identify_speakers(utterances, hosts, channel_id="c1")
+
+        assert mapping == {"A": "Sam Parr", "B": "Shaan Puri"}
+        channel_id, known, evidence, cached = mapping_cache.set.call_args.args
+        assert (channel_id, known, cached) == ("c1", hosts, mapping)
+        assert evidence == {
+            "A": ["line 0", "line 2", "line 4"],
+            "B": ["line 1", "line 3", "line 5"],
+        }
+
+        mapping_cache.get.return_value = mapping
+        service.client.messages.create.reset_mock()
+
+        assert await service.identify_speakers(utterances, hosts) == mapping
+        service.client.messages.create.assert_not_called()
+
+
+class TestDeepgramProvider:
+    """Tests for DeepgramProvider."""
+
+    @pytest.mark.asyncio
+    async def test_transcribe_streams_audio_upload(self, tmp_path):
+        """Should stream the file on a pooled client with a Content-Length."""
+        import httpx
+
+        from app.services.transcription import base
+        from app.services.transcription.base import TranscriptionStatus
+        from app.services.transcription.deepgram import DeepgramProvider
+
+        audio = tmp_path / "episode.mp3"
+        audio.write_bytes(b"\x01" * (base.UPLOAD_CHUNK_SIZE * 2 + 10))
+        seen = {}
+
+        def handler(request):
+            seen["body"] = request.content
+            seen["length"] = request.headers["Content-Length"]
+            return httpx.Response(
+                200,
+                json={
+                    "results": {
+                        "channels": [{"alternatives": [{"transcript": "hi"}]}],
+                        "utterances": [{"speaker": 1, "transcript": "hi"}],
+                    },
+                    "metadata": {"duration": 1.0},
+                },
+            )
+
+        real_client = httpx.AsyncClient
+        clients = []
+
+        def make_client(**kw):
+            clients.append(real_client(transport=httpx.MockTransport(handler), **kw))
+            return clients[-1]
+
+        with patch.object(base.httpx, "AsyncClient", make_client):
+            result = await DeepgramProvider("key").transcribe(audio)
+            await DeepgramProvider("key").transcribe(audio)
+            await base.close_http_clients()
+
+        assert len(clients) == 1 and clients[0].is_closed
+        assert result.status == TranscriptionStatus.COMPLETED
+        assert result.utterances[0].speaker == "B"
+        assert result.raw_response["duration"] == 1.0
+        assert "results" not in result.raw_response
+        assert seen["body"] == audio.read_bytes()
+        assert seen["length"] == str(audio.stat().st_size)
+
+    @pytest.mark.asyncio
+    async def test_callback_mode_waits_for_webhook(self, tmp_path):
+        """Should submit with a callback URL and read the stored transcript."""
+        import httpx
+        import orjson
+
+        from app.services.transcription import base
+        from app.services.transcription.base import TranscriptionStatus
+        from app.services.transcription.deepgram import DeepgramProvider
+
+        audio = tmp_path / "episode.mp3"
+        audio.write_bytes(b"\x01" * 10)
+        seen = {}
+        delivered = orjson.dumps(
+            {
+                "metadata": {"request_id": "req-1", "duration": 2.0},
+                "results": {
+                    "channels": [{"alternatives": [{"transcript": "hi"}]}],
+                    "utterances": [{"speaker": 0, "transcript": "hi"}],
+                },
+            }
+        )
+
+        def handler(request):
+            seen["callback"] = request.url.params["callback"]
+            return httpx.Response(200, json={"request_id": "req-1"})
+
+        redis = MagicMock()
+        redis.blpop = AsyncMock(return_value=("deepgram:req-1:done", "1"))
+        cache = MagicMock()
+        cache._get_redis = AsyncMock(return_value=redis)
+        cache.get = AsyncMock(return_value=delivered.decode())
+
+        provider = DeepgramProvider(
+            "key",
+            callback_url="https://api.example.com/api/webhooks/deepgram",
+            callback_secret="s3cret",
+            cache=cache,
+        )
+        real_client = httpx.AsyncClient
+
+        def make_client(**kw):
+            return real_client(transport=httpx.MockTransport(handler), **kw)
+
+        with patch.object(base.httpx, "AsyncClient", make_client):
+            result = await provider.transcribe(audio)
+            await base.close_http_clients()
+
+        assert seen["callback"].endswith("/api/webhooks/deepgram?token=s3cret")
+        redis.blpop.assert_awaited_once()
+        assert redis.blpop.call_args.args[0] == ["deepgram:req-1:done"]
+        cache.get.assert_awaited_once_with("deepgram:req-1")
+        assert result.status == TranscriptionStatus.COMPLETED
+        assert result.provider_job_id == "req-1"
+        assert result.utterances[0].speaker == "A"
+
+    def test_cache_client_is_per_event_loop(self):
+        """A shared provider should not reuse a Redis client across loops."""
+        import asyncio
+
+        from app.services.transcription.deepgram import DeepgramProvider
+
+        provider = DeepgramProvider("key")
+
+        async def caches():
+            return provider._cache(), provider._cache()
+
+        first, again = asyncio.run(caches())
+        second, _ = asyncio.run(caches())
+
+        assert first is again
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_transcribe_limits_and_coalesces_jobs(self):
+        """Should cap concurrent jobs and share one job per file."""
+        import asyncio
+        from pathlib import Path
+
+        from app.services.transcription.deepgram import DeepgramProvider
+
+        running, peak, calls = 0, 0, []
+
+        async def fake_transcribe(audio_path, speakers_expected, language):
+            nonlocal running, peak
+            calls.append(audio_path)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return audio_path
+
+        providers = [DeepgramProvider("key", max_concurrent=2) for _ in range(4)]
+        for provider in providers:
+            provider._transcribe = fake_transcribe
+        paths = [Path("a.mp3"), Path("a.mp3"), Path("b.mp3"), Path("c.mp3")]
+
+        results = await asyncio.gather(
+            *(p.transcribe(path) for p, path in zip(providers, paths))
+        )
+
+        assert results == paths
+        assert sorted(calls) == [Path("a.mp3"), Path("b.mp3"), Path("c.mp3")]
+        assert peak == 2
+
+
+class TestAssemblyAIProvider:
+    """Tests for AssemblyAIProvider."""
+
+    def test_estimate_cost_keeps_fractional_seconds(self):
+        """Cost should come from the exact duration, not a truncated one."""
+        from app.services.transcription.assemblyai import AssemblyAIProvider
+
+        provider = AssemblyAIProvider("key")
+
+        assert provider.estimate_cost(10 * 3600) == 370
+        assert provider.estimate_cost(9729.9) == 100
+
+    @pytest.mark.asyncio
+    async def test_transcribe_uploads_submits_and_polls(self, tmp_path):
+        """Should upload, create the transcript, and poll it over REST."""
+        import json
+
+        import httpx
+
+        from app.services.transcription import base
+        from app.services.transcription.assemblyai import AssemblyAIProvider
+        from app.services.transcription.base import TranscriptionStatus
+
+        audio = tmp_path / "episode.mp3"
+        audio.write_bytes(b"audio")
+        polls = iter(["queued", "completed"])
+        requests = []
+
+        def handler(request):
+            requests.append((request.method, request.url.path))
+            assert request.headers["Authorization"] == "key"
+            if request.url.path == "/v2/upload":
+                assert request.content == b"audio"
+                return httpx.Response(200, json={"upload_url": "https://cdn/a"})
+            if request.method == "POST":
+                assert json.loads(request.content)["audio_url"] == "https://cdn/a"
+                return httpx.Response(200, json={"id": "t1", "status": "queued"})
+            return httpx.Response(
+                200,
+                json={
+                    "id": "t1",
+                    "status": next(polls),
+                    "text": "Hello",
+                    "audio_duration": 60,
+                    "utterances": [
+                        {"speaker": "A", "text": "Hello", "start": 0, "end": 900}
+                    ],
+                },
+            )
+
+        real_client = httpx.AsyncClient
+        with patch.object(
+            base.httpx,
+            "AsyncClient",
+            lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+        ), patch("app.services.transcription.base.asyncio.sleep", new=AsyncMock()):
+            result = await AssemblyAIProvider("key").transcribe(audio)
+            await base.close_http_clients()
+
+        assert result.status == TranscriptionStatus.COMPLETED
+        assert result.utterances[0].end_ms == 900
+        assert result.duration_ms == 60_000
+        assert requests == [
+            ("POST", "/v2/upload"),
+            ("POST", "/v2/transcript"),
+            ("GET", "/v2/transcript/t1"),
+            ("GET", "/v2/transcript/t1"),
+        ]
+
+
+class TestFasterWhisperProvider:
+    """Tests for FasterWhisperProvider."""
+
+    def test_gpu_compute_type_follows_capability(self):
+        """Turing+ GPUs should get int8_float16, older ones float16."""
+        import sys
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        torch = MagicMock()
+        with patch.dict(sys.modules, {"torch": torch}):
+            torch.cuda.get_device_capability.return_value = (8, 6)
+            ampere = FasterWhisperProvider(device="cuda")._detect_device_and_compute()
+            torch.cuda.get_device_capability.return_value = (7, 0)
+            volta = FasterWhisperProvider(device="cuda")._detect_device_and_compute()
+            pinned = FasterWhisperProvider(
+                device="cuda", compute_type="float16"
+            )._detect_device_and_compute()
+
+        assert ampere == ("cuda", "int8_float16")
+        assert volta == ("cuda", "float16")
+        assert pinned == ("cuda", "float16")
+
+    def test_decode_uses_batched_pipeline_when_loaded(self):
+        """GPU loads decode through the batched pipeline, CPU sequentially."""
+        from pathlib import Path
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        provider = FasterWhisperProvider(model="tiny", batch_size=8)
+        provider._model = MagicMock()
+
+        provider._decode(Path("episode.mp3"), "en")
+        provider._model.transcribe.assert_called_once()
+
+        provider._batched = MagicMock()
+        provider._decode(Path("episode.mp3"), "en")
+        assert provider._batched.transcribe.call_args.kwargs["batch_size"] == 8
+        provider._model.transcribe.assert_called_once()
+
+    def test_decode_is_greedy_with_temperature_fallback(self):
+        """Default decoding is greedy; beam search is opt-in."""
+        from pathlib import Path
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        fast = FasterWhisperProvider(model="tiny")
+        fast._model = MagicMock()
+        fast._decode(Path("episode.mp3"), "en")
+        options = fast._model.transcribe.call_args.kwargs
+
+        accurate = FasterWhisperProvider(model="tiny", beam_size=5)
+        accurate._model = MagicMock()
+        accurate._decode(Path("episode.mp3"), "en")
+
+        assert options["beam_size"] == 1
+        assert options["temperature"][0] == 0.0
+        assert len(options["temperature"]) > 1
+        assert accurate._model.transcribe.call_args.kwargs["beam_size"] == 5
+
+    def test_diarization_input_is_pinned_on_gpu(self):
+        """pyannote should get a page-locked in-memory waveform on GPU hosts."""
+        import sys
+        from pathlib import Path
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        torch, faster_whisper = MagicMock(), MagicMock()
+        with patch.dict(
+            sys.modules, {"torch": torch, "faster_whisper": faster_whisper}
+        ), patch(
+            "app.services.transcription.faster_whisper.cuda_available",
+            return_value=True,
+        ):
+            audio = FasterWhisperProvider._diarization_input(Path("episode.mp3"))
+
+        faster_whisper.decode_audio.assert_called_once_with(
+            "episode.mp3", sampling_rate=16000
+        )
+        waveform = torch.from_numpy.return_value.unsqueeze.return_value
+        assert audio == {
+            "waveform": waveform.pin_memory.return_value,
+            "sample_rate": 16000,
+        }
+
+    def test_word_timings_are_stored_column_wise(self):
+        """Word timings keep parallel arrays and expand back to dicts."""
+        from types import SimpleNamespace
+
+        from app.services.transcription.base import WordTimings
+
+        words = [
+            SimpleNamespace(word=" Hi", start=0.5, end=0.75, probability=0.875),
+            SimpleNamespace(word=" there", start=0.75, end=1.25, probability=0.5),
+        ]
+        timings = WordTimings.from_words(words)
+
+        assert len(timings) == 2
+        assert timings.starts.typecode == "f"
+        assert timings.as_dicts()[1] == {
+            "word": " there",
+            "start": 0.75,
+            "end": 1.25,
+            "probability": 0.5,
+        }
+
+    @pytest.mark.asyncio
+    async def test_transcribe_runs_whisper_and_diarization_together(self):
+        """Both passes should share one decode, run at once, then be merged."""
+        import threading
+        from pathlib import Path
+
+        from app.services.transcription.base import TranscriptionStatus, Utterance
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        both_running = threading.Barrier(2, timeout=5)
+        whisper = {
+            "utterances": [Utterance(speaker="A", text="x", start_ms=0, end_ms=1)],
+            "full_text": "x",
+            "duration_ms": 1,
+        }
+
+        seen, threads = [], set()
+
+        def fake_transcribe(audio, language):
+            seen.append(audio)
+            threads.add(threading.current_thread().name)
+            both_running.wait()
+            return whisper
+
+        def fake_diarize(audio, num_speakers):
+            seen.append(audio)
+            threads.add(threading.current_thread().name)
+            both_running.wait()
+            return "turns"
+
+        provider = FasterWhisperProvider(model="tiny")
+        with patch.object(
+            FasterWhisperProvider, "supports_diarization", True
+        ), patch.object(
+            provider, "_decode_audio", return_value="samples"
+        ) as decode_audio, patch.object(
+            provider, "_transcribe_sync", side_effect=fake_transcribe
+        ), patch.object(
+            provider, "_run_diarization", side_effect=fake_diarize
+        ), patch.object(
+            provider, "_assign_speakers", return_value={**whisper, "raw": {"n": 2}}
+        ) as assign:
+            result = await provider.transcribe(Path("episode.mp3"))
+
+        assert result.status == TranscriptionStatus.COMPLETED
+        assign.assert_called_once_with(whisper, "turns")
+        assert result.raw_response == {"n": 2}
+        decode_audio.assert_called_once()
+        assert seen == ["samples", "samples"]
+        # On the provider's own pool, not the shared default executor
+        assert all(name.startswith("fw-") for name in threads)
+
+    @pytest.mark.asyncio
+    async def test_transcribe_stream_yields_segments_as_decoded(self):
+        """Should yield utterances one by one and stop decoding on exit."""
+        import asyncio
+        import time
+        from pathlib import Path
+        from types import SimpleNamespace
+
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        decoded = []
+
+        def segments():
+            for i in range(100):
+                time.sleep(0.01)
+                decoded.append(i)
+                yield SimpleNamespace(
+                    text=f" line {i} ",
+                    start=i,
+                    end=i + 1,
+                    avg_logprob=-0.25,
+                    words=None,
+                )
+
+        provider = FasterWhisperProvider(model="tiny")
+        with patch.object(provider, "_decode", return_value=(segments(), None)):
+            stream = provider.transcribe_stream(Path("episode.mp3"))
+            first = [await anext(stream) for _ in range(2)]
+            await stream.aclose()
+
+        assert [u.text for u in first] == ["line 0", "line 1"]
+        assert first[1].start_ms == 1000
+        assert first[1].confidence == -0.25
+        await asyncio.sleep(0.05)
+        assert len(decoded) < 100
+
+    def test_diarize_assigns_speaker_at_midpoint(self):
+        """Should label each segment by the turn covering its midpoint."""
+        from types import SimpleNamespace
+
+        from app.services.transcription.base import Utterance
+        from app.services.transcription.faster_whisper import FasterWhisperProvider
+
+        turns = [(0.0, 10.0, "SPK_1"), (9.0, 20.0, "SPK_0"), (25.0, 30.0, "SPK_1")]
+        diarization = MagicMock()
+        diarization.itertracks.return_value = [
+            (SimpleNamespace(start=a, end=b), None, spk) for a, b, spk in turns
+        ]
+        provider = FasterWhisperProvider(model="tiny")
+
+        def utt(start, end):
+            return Utterance(speaker="A", text="x", start_ms=start, end_ms=end)
+
+        segments = [utt(0, 4000), utt(8000, 11000), utt(12000, 18000)]
+        segments += [utt(21000, 23000), utt(26000, 28000)]
+        result = provider._assign_speakers(
+            {"utterances": segments, "full_text": "", "duration_ms": 30000},
+            diarization,
+        )
+
+        labels = [u.speaker for u in result["utterances"]]
+        assert labels == ["A", "A", "B", "A", "A"]
+        assert result["raw"]["speaker_map"] == {"SPK_1": "A", "SPK_0": "B"}
+
+
+class TestModalCloudProvider:
+    """Tests for the Modal cloud GPU provider."""
+
+    @pytest.mark.asyncio
+    async def test_batch_maps_one_call_per_file(self):
+        """Each file is its own call, so no call runs several episodes."""
+        from pathlib import Path
+
+        from app.services.transcription.modal_cloud import ModalCloudProvider
+
+        paths = [Path("a.mp3"), Path("b.mp3")]
+        keys = ["key-a", "key-b"]
+
+        def transcribe(key, language):
+            return {
+                "status": "completed",
+                "utterances": {
+                    "text": [key],
+                    "start_ms": [0],
+                    "end_ms": [1000],
+                    "confidence": [-0.25],
+                },
+            }
+
+        transcriber = MagicMock()
+        transcriber.transcribe_key.map.side_effect = lambda keys, kwargs: [
+            transcribe(key, **kwargs) for key in keys
+        ]
+        provider = ModalCloudProvider()
+
+        with patch.object(provider, "_check_modal_available"), patch.object(
+            provider, "_get_transcriber", return_value=transcriber
+        ), patch(
+            "app.services.transcription.modal_cloud.upload_audio",
+            return_value=keys,
+            create=True,
+        ), patch(
+            "app.services.transcription.modal_cloud.remove_audio", create=True
+        ) as remove:
+            results = await provider.transcribe_batch(paths)
+
+        assert transcriber.transcribe_key.map.call_args.args == (keys,)
+        assert [r.utterances[0].text for r in results] == keys
+        remove.assert_called_once_with(keys)
+
+
+class TestModalHybridProvider:
+    """Tests for the local-download + Modal transcription provider."""
+
+    @pytest.mark.asyncio
+    async def test_batch_spawns_per_upload_and_keeps_order(self):
+        """Each file spawns once uploaded; results keep input order."""
+        import asyncio
+        from pathlib import Path
+
+        from app.services.transcription.base import TranscriptionStatus
+        from app.services.transcription.modal_hybrid import ModalHybridProvider
+
+        paths = [Path("slow.mp3"), Path("fast.mp3"), Path("broken.mp3")]
+
+        def upload(batch):
+            if batch[0].name == "broken.mp3":
+                raise OSError("disk error")
+            return [f"key-{batch[0].name}"]
+
+        async def spawn(audio_key, language, job_id):
+            async def get():
+                await asyncio.sleep(0.02 if audio_key == "key-slow.mp3" else 0)
+                return {
+                    "status": "completed",
+                    "utterances": {
+                        "text": [audio_key],
+                        "start_ms": [0],
+                        "end_ms": [1000],
+                        "confidence": [-0.25],
+                    },
+                }
+
+            return MagicMock(get=MagicMock(aio=get))
+
+        transcriber = MagicMock()
+        transcriber.transcribe_key.spawn.aio = spawn
+        progress = []
+        provider = ModalHybridProvider(max_upload_workers=1)
+
+        with patch.object(provider, "_check_modal_available"), patch.object(
+            provider, "_get_transcriber", return_value=transcriber
+        ), patch(
+            "app.services.transcription.modal_hybrid.upload_audio",
+            side_effect=upload,
+            create=True,
+        ), patch(
+            "app.services.transcription.modal_hybrid.remove_audio", create=True
+        ) as remove:
+            results = await provider.transcribe_batch(
+                paths, on_progress=lambda *args: progress.append(args)
+            )
+
+        assert [r.utterances[0].text for r in results[:2]] == [
+            "key-slow.mp3",
+            "key-fast.mp3",
+        ]
+        assert results[0].utterances[0].end_ms == 1000
+        assert results[2].status == TranscriptionStatus.FAILED
+        assert sorted(remove.call_args.args[0]) == ["key-fast.mp3", "key-slow.mp3"]
+        assert progress[-1][:2] == (3, 3)
+
 
 class TestEmbeddingService:
     """Tests for EmbeddingService."""
@@ -281,9 +998,14 @@ class TestEmbeddingService:
     @pytest.mark.asyncio
     async def test_embed_query(self):
         """Should embed single query text."""
+        from collections import OrderedDict
         from app.services.embedding import EmbeddingService
 
-        with patch("app.services.embedding.openai.AsyncOpenAI") as MockAsyncOpenAI:
+        with patch(
+            "app.services.embedding.openai.AsyncOpenAI"
+        ) as MockAsyncOpenAI, patch(
+            "app.services.embedding._query_embeddings", OrderedDict()
+        ):
             mock_client = AsyncMock()
             mock_response = MagicMock()
             mock_response.data = [MagicMock(embedding=[0.1] * 1536)]
@@ -296,6 +1018,35 @@ class TestEmbeddingService:
             assert len(embedding) == 1536
             mock_client.embeddings.create.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_embed_query_reuses_normalized_repeats(self):
+        """Repeats differing only in case/whitespace should skip the API."""
+        from collections import OrderedDict
+        from app.services.embedding import EmbeddingService
+
+        with patch(
+            "app.services.embedding.openai.AsyncOpenAI"
+        ) as MockAsyncOpenAI, patch(
+            "app.services.embedding._query_embeddings", OrderedDict()
+        ) as lru, patch(
+            "app.services.embedding.settings.QUERY_EMBEDDING_LRU_SIZE", 1
+        ):
+            mock_client = AsyncMock()
+            mock_client.embeddings.create.return_value = MagicMock(
+                data=[MagicMock(embedding=[0.5, -0.25])]
+            )
+            MockAsyncOpenAI.return_value = mock_client
+
+            service = EmbeddingService()
+            first = await service.embed_query("Index Funds")
+            second = await service.embed_query("  index funds ")
+
+            assert first == second == [0.5, -0.25]
+            mock_client.embeddings.create.assert_called_once()
+
+            await service.embed_query("something else")
+            assert list(lru) == ["something else"]
+
     @pytest.mark.asyncio
     async def test_embed_texts_batching(self):
         """Should batch multiple texts for embedding."""
@@ -552,6 +1303,232 @@ class TestRerankerService:
             assert all("episode_id" in r for r in reranked)
             assert all("speaker" in r for r in reranked)
 
+    @pytest.mark.asyncio
+    async def test_rerank_scores_pairs_in_batches(self):
+        """Should score all pairs in one batched predict call."""
+        from app.services.reranker import RerankerService
+
+        with patch("app.services.reranker.CROSS_ENCODER_AVAILABLE", True):
+            service = RerankerService()
+            service._model = MagicMock()
+            service._model.predict.return_value = [0.1, 0.9, 0.5]
+            service._model.tokenizer = None
+            service._model_loaded = True
+
+            results = [{"text": t, "score": 0.5} for t in ("a", "b", "c")]
+            reranked = await service.rerank("q", results, top_k=2, batch_size=16)
+
+            service._model.predict.assert_called_once()
+            assert service._model.predict.call_args.kwargs["batch_size"] == 16
+            assert [r["text"] for r in reranked] == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_rerank_skips_confident_vector_top(self):
+        """Should skip the cross-encoder when top cosine clears the cut."""
+        from app.services.reranker import RerankerService
+
+        with patch("app.services.reranker.CROSS_ENCODER_AVAILABLE", True):
+            service = RerankerService()
+            service._model = MagicMock()
+            service._model_loaded = True
+
+            results = [
+                {"text": t, "semantic_score": s}
+                for t, s in (("a", 0.9), ("b", 0.6), ("c", 0.72))
+            ]
+            reranked = await service.rerank("q", results, top_k=2)
+
+            service._model.predict.assert_not_called()
+            assert [r["text"] for r in reranked] == ["a", "b"]
+
+    def test_confident_top_needs_the_semantic_lead(self):
+        """The gate should use the semantic runner-up, not the RRF order."""
+        from app.services.reranker import RerankerService
+
+        def results(*scores):
+            return [{"semantic_score": s} for s in scores]
+
+        gate = RerankerService._has_confident_top
+        assert gate(results(0.9, 0.6, 0.8), gap=0.15) is False
+        assert gate(results(0.6, 0.9, 0.3), gap=0.15) is False
+        assert gate(results(0.9, None, 0.7), gap=0.15) is True
+        assert gate(results(0.9, None), gap=0.15) is False
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reranks_share_one_predict(self):
+        """Concurrent rerank calls should be coalesced into one forward pass."""
+        import asyncio
+
+        from app.services.reranker import RerankerService
+
+        model = MagicMock(tokenizer=None)
+        model.predict.side_effect = lambda pairs, batch_size: [
+            float(doc == "hit") for _, doc in pairs
+        ]
+
+        with patch("app.services.reranker.CROSS_ENCODER_AVAILABLE", True), patch(
+            "app.services.reranker._BATCHERS", {}
+        ):
+            services = [RerankerService() for _ in range(2)]
+            for service in services:
+                service._model = model
+                service._model_loaded = True
+
+            first, second = await asyncio.gather(
+                services[0].rerank("q1", [{"text": t} for t in ("a", "hit", "b")]),
+                services[1].rerank("q2", [{"text": t} for t in ("hit", "c", "d")]),
+            )
+
+        model.predict.assert_called_once()
+        assert len(model.predict.call_args.args[0]) == 6
+        assert first[0]["text"] == second[0]["text"] == "hit"
+
+    @pytest.mark.asyncio
+    async def test_reranks_batch_only_behind_an_inflight_predict(self):
+        """A lone call runs at once; calls arriving meanwhile share the next."""
+        import asyncio
+        import threading
+
+        from app.services.reranker import RerankerService
+
+        started, release = threading.Event(), threading.Event()
+
+        def predict(pairs, batch_size):
+            started.set()
+            release.wait(5)
+            return [float(doc == "hit") for _, doc in pairs]
+
+        model = MagicMock(tokenizer=None)
+        model.predict.side_effect = predict
+
+        with patch("app.services.reranker.CROSS_ENCODER_AVAILABLE", True), patch(
+            "app.services.reranker._BATCHERS", {}
+        ):
+            service = RerankerService()
+            service._model = model
+            service._model_loaded = True
+
+            def rerank(query):
+                return asyncio.create_task(
+                    service.rerank(query, [{"text": t} for t in ("a", "hit", "b")])
+                )
+
+            first = rerank("q1")
+            await asyncio.to_thread(started.wait, 5)
+            later = [rerank("q2"), rerank("q3")]
+            await asyncio.sleep(0)
+            release.set()
+            await asyncio.gather(first, *later)
+
+        assert [len(c.args[0]) for c in model.predict.call_args_list] == [3, 6]
+
+    def test_truncation_keeps_query_matching_window(self):
+        """Long documents should be cut to the window richest in query tokens."""
+        from app.services.reranker import RerankerService
+
+        vocab = {}
+
+        def encode(text):
+            return [vocab.setdefault(w, len(vocab)) for w in text.split()]
+
+        def tokenize(text, add_special_tokens=False):
+            if isinstance(text, list):
+                return {"input_ids": [encode(t) for t in text]}
+            return {"input_ids": encode(text)}
+
+        tokenizer = MagicMock(side_effect=tokenize)
+        tokenizer.decode = lambda ids: " ".join(
+            {v: k for k, v in vocab.items()}[i] for i in ids
+        )
+        service = RerankerService()
+        service._model = MagicMock(tokenizer=tokenizer)
+
+        filler = " ".join(f"w{i}" for i in range(20))
+        long_doc = f"{filler} index funds beat stock picking {filler}"
+
+        with patch("app.services.reranker.settings.RERANKER_MAX_LENGTH", 12):
+            short, trimmed = service._truncate_documents(
+                "index funds", ["short doc", long_doc]
+            )
+
+        assert short == "short doc"
+        assert len(trimmed.split()) == 12 - 2 - 3
+        assert "index funds" in trimmed
+
+    @pytest.mark.asyncio
+    async def test_model_is_shared_across_instances(self):
+        """Should load each model once per process, not once per service."""
+        from app.services.reranker import RerankerService
+
+        mock_model = MagicMock()
+        with patch("app.services.reranker.CROSS_ENCODER_AVAILABLE", True), patch(
+            "app.services.reranker._MODELS", {}
+        ), patch.object(
+            RerankerService, "_create_model", return_value=mock_model
+        ) as mock_create:
+            first = RerankerService(use_onnx=False)
+            second = RerankerService(use_onnx=False)
+            await first._ensure_model()
+            await second._ensure_model()
+
+            mock_create.assert_called_once()
+            assert first._model is second._model is mock_model
+
+    def test_onnx_cross_encoder_batches_and_squashes_logits(self):
+        """Should run one session call per batch and return sigmoid scores."""
+        import numpy as np
+        from app.services.reranker import OnnxCrossEncoder
+
+        encoder = OnnxCrossEncoder.__new__(OnnxCrossEncoder)
+        encoder.max_length = 512
+        encoder._input_names = {"input_ids", "attention_mask"}
+        encoder.tokenizer = MagicMock(
+            side_effect=lambda qs, ds, **kw: {
+                "input_ids": np.zeros((len(qs), 4), dtype=np.int32),
+                "attention_mask": np.ones((len(qs), 4), dtype=np.int32),
+                "token_type_ids": np.zeros((len(qs), 4), dtype=np.int32),
+            }
+        )
+        encoder.session = MagicMock()
+        encoder.session.run.side_effect = [
+            [np.array([[0.0], [2.0]])],
+            [np.array([[-2.0]])],
+        ]
+
+        scores = encoder.predict([("q", "a"), ("q", "b"), ("q", "c")], batch_size=2)
+
+        assert encoder.session.run.call_count == 2
+        feeds = encoder.session.run.call_args_list[0].args[1]
+        assert set(feeds) == {"input_ids", "attention_mask"}
+        assert feeds["input_ids"].dtype == np.int64
+        assert scores[0] == pytest.approx(0.5)
+        assert scores[1] > scores[0] > scores[2]
+
+    def test_onnx_cross_encoder_prefers_cuda_with_fp32_graph(self, tmp_path):
+        """Should run the unquantized graph when a CUDA provider is available."""
+        from app.services.reranker import OnnxCrossEncoder
+
+        model_dir = tmp_path / "org__model"
+        model_dir.mkdir()
+        (model_dir / OnnxCrossEncoder.QUANTIZED_FILE).touch()
+
+        mock_ort = MagicMock()
+        mock_ort.get_available_providers.return_value = [
+            "CUDAExecutionProvider",
+            "CPUExecutionProvider",
+        ]
+        with patch("app.services.reranker.ort", mock_ort, create=True), patch(
+            "app.services.reranker.AutoTokenizer", MagicMock(), create=True
+        ):
+            OnnxCrossEncoder("org/model", str(tmp_path), num_threads=4)
+
+        path = mock_ort.InferenceSession.call_args.args[0]
+        assert path.endswith(OnnxCrossEncoder.MODEL_FILE)
+        assert mock_ort.InferenceSession.call_args.kwargs["providers"][0] == (
+            "CUDAExecutionProvider"
+        )
+        assert mock_ort.SessionOptions.return_value.intra_op_num_threads == 4
+
 
 class TestHybridSearchService:
     """Tests for HybridSearchService."""
@@ -580,6 +1557,22 @@ class TestHybridSearchService:
         chunk_ids = [r["chunk_id"] for r in fused[:2]]
         assert "a" in chunk_ids or "b" in chunk_ids
 
+    def test_mmr_diversity_demotes_same_minute_results(self):
+        """Results from the same minute of an episode should be spread out."""
+        from app.services.hybrid_search import HybridSearchService
+
+        service = HybridSearchService.__new__(HybridSearchService)
+
+        results = [
+            {"chunk_id": "a", "episode_id": "ep1", "start_ms": 0, "score": 0.9},
+            {"chunk_id": "b", "episode_id": "ep1", "start_ms": 5000, "score": 0.85},
+            {"chunk_id": "c", "episode_id": "ep2", "start_ms": 0, "score": 0.6},
+        ]
+
+        diversified = service._apply_mmr_diversity(results, lambda_param=0.7)
+
+        assert [r["chunk_id"] for r in diversified] == ["a", "c", "b"]
+
     @pytest.mark.asyncio
     async def test_search_combines_vector_and_keyword(self):
         """Should combine vector and keyword search."""
@@ -613,6 +1606,371 @@ class TestHybridSearchService:
             # Should have results from both sources
             assert len(results) >= 1
 
+    @pytest.mark.asyncio
+    async def test_semantic_search_uses_given_query_vector(self):
+        """A precomputed query vector should skip the embedding lookup."""
+        from app.services.hybrid_search import HybridSearchService
+
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.embedding_cache = AsyncMock()
+        service.embedding_service = AsyncMock()
+        service.vector_store = AsyncMock()
+        service.vector_store.search.return_value = []
+
+        await service._semantic_search("q", limit=5, query_vector=[0.3, 0.4])
+
+        service.embedding_cache.get.assert_not_called()
+        service.embedding_service.embed_query.assert_not_called()
+        assert service.vector_store.search.call_args.kwargs["query_vector"] == [
+            0.3,
+            0.4,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_survives_keyword_failure(self):
+        """A failing keyword branch should not sink the semantic results."""
+        from app.services.hybrid_search import HybridSearchService
+
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.search_cache = None
+        service._semantic_search = AsyncMock(
+            return_value=[{"chunk_id": "1", "text": "Result 1", "score": 0.9}]
+        )
+        service._keyword_search = AsyncMock(side_effect=RuntimeError("db down"))
+        service.db = AsyncMock()
+        service.enrichment = AsyncMock()
+        service.enrichment.enrich_results.side_effect = lambda combined, **kw: combined
+
+        results, _ = await service.search("test query", use_reranking=False)
+
+        assert [r["chunk_id"] for r in results] == ["1"]
+        service.db.rollback.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_search_propagates_cancellation(self):
+        """A cancelled branch should cancel the search, not read as empty."""
+        import asyncio
+
+        from app.services.hybrid_search import HybridSearchService
+
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.search_cache = None
+        service._semantic_search = AsyncMock(side_effect=asyncio.CancelledError())
+        service._keyword_search = AsyncMock(return_value=[])
+        service.db = AsyncMock()
+        service.enrichment = AsyncMock()
+
+        with pytest.raises(asyncio.CancelledError):
+            await service.search("test query", use_reranking=False)
+
+        service.enrichment.enrich_results.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sql_fusion_merges_semantic_and_keyword_rows(self):
+        """With SQL fusion on, Postgres ordering and scores should be used."""
+        from app.services.hybrid_search import HybridSearchService
+        from app.services.postgres_search import FusedSearchResult
+
+        sem_id, kw_id = uuid4(), uuid4()
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.search_cache = None
+        service._semantic_search = AsyncMock(
+            return_value=[{"chunk_id": str(sem_id), "text": "Semantic", "score": 0.9}]
+        )
+        service._keyword_search = AsyncMock()
+        service.postgres_search = AsyncMock()
+        service.postgres_search.fused_search.return_value = [
+            FusedSearchResult(
+                chunk_id=kw_id,
+                episode_id=uuid4(),
+                channel_id=uuid4(),
+                text="Keyword",
+                primary_speaker="Host",
+                speakers=["Host"],
+                start_ms=0,
+                end_ms=1000,
+                rrf_score=0.02,
+                semantic_rank=None,
+                keyword_rank=1,
+                keyword_score=0.4,
+            ),
+            FusedSearchResult(
+                chunk_id=sem_id,
+                episode_id=uuid4(),
+                channel_id=uuid4(),
+                text="Semantic",
+                primary_speaker="Guest",
+                speakers=["Guest"],
+                start_ms=0,
+                end_ms=1000,
+                rrf_score=0.01,
+                semantic_rank=1,
+                keyword_rank=None,
+                keyword_score=None,
+            ),
+        ]
+        service.enrichment = AsyncMock()
+        service.enrichment.enrich_results.side_effect = lambda combined, **kw: combined
+
+        with patch("app.services.hybrid_search.settings.SEARCH_SQL_FUSION", True):
+            results, _ = await service.search("test query", use_reranking=False)
+
+        service._keyword_search.assert_not_called()
+        kwargs = service.postgres_search.fused_search.call_args.kwargs
+        assert kwargs["semantic_ranks"] == [(sem_id, 1)]
+        assert [r["text"] for r in results] == ["Keyword", "Semantic"]
+        assert results[0]["search_type"] == "keyword"
+        assert results[1]["semantic_rank"] == 1
+        assert results[1]["score"] == 0.01
+
+    @pytest.mark.asyncio
+    async def test_concurrent_embedding_misses_share_one_call(self):
+        """Concurrent cache misses for one query should embed it only once."""
+        import asyncio
+        from app.services.hybrid_search import HybridSearchService
+
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.embedding_cache = None
+
+        async def slow_embed(query):
+            await asyncio.sleep(0.01)
+            return [0.1] * 4
+
+        service.embedding_service = AsyncMock()
+        service.embedding_service.embed_query.side_effect = slow_embed
+
+        vectors = await asyncio.gather(
+            *(service._embed_query_single_flight("same query") for _ in range(5))
+        )
+
+        assert all(v == [0.1] * 4 for v in vectors)
+        service.embedding_service.embed_query.assert_called_once_with("same query")
+
+    @pytest.mark.asyncio
+    async def test_search_cache_round_trip(self, sample_search_result):
+        """Cached results should be stored as JSON and come back as models."""
+        from app.services.hybrid_search import HybridSearchService
+        from app.schemas.search import SearchResult
+
+        result = SearchResult(
+            **sample_search_result,
+            episode_title="Test Episode",
+            episode_url=None,
+            episode_thumbnail=None,
+            channel_name="Test Channel",
+            channel_slug="test-channel",
+            timestamp="0:00",
+            timestamp_ms=0,
+            published_at=datetime(2024, 6, 15),
+        )
+
+        service = HybridSearchService.__new__(HybridSearchService)
+        service.search_cache = AsyncMock()
+        service.search_cache.get_raw.return_value = None
+        service._semantic_search = AsyncMock(return_value=[])
+        service._keyword_search = AsyncMock(return_value=[])
+        service.enrichment = AsyncMock()
+        service.enrichment.enrich_results.return_value = [result]
+
+        await service.search("test query", use_reranking=False)
+        payload = service.search_cache.set_raw.call_args.args[1]
+
+        service.search_cache.get_raw.return_value = payload
+        cached, _ = await service.search("test query", use_reranking=False)
+
+        assert cached == [result]
+
+
+class TestRAGService:
+    """Tests for RAGService prompt assembly."""
+
+    def test_system_prompt_is_cacheable(self):
+        """System prompt should be a single ephemeral-cached text block."""
+        from app.services.rag import RAGService, SYSTEM_PROMPT
+
+        service = RAGService.__new__(RAGService)
+        system = service._get_system_prompt()
+
+        assert system == [
+            {
+                "type": "text",
+                "text": SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    def test_current_turn_is_not_a_cache_breakpoint(self):
+        """Per-query context should be plain text after the cached prefix."""
+        from app.services.rag import RAGService
+
+        service = RAGService.__new__(RAGService)
+        messages = service._build_messages(
+            message="What is compounding?",
+            context="[Source 1] ...",
+            conversation_history=[],
+        )
+
+        content = messages[-1]["content"]
+        assert isinstance(content, str)
+        assert content.index("[Source 1]") < content.index("What is compounding?")
+
+    @pytest.mark.asyncio
+    async def test_claude_call_awaits_async_client(self):
+        """Should await the async client directly with the cached prompt."""
+        from app.services.rag import PROMPT_CACHING_HEADERS, RAGService
+
+        service = RAGService.__new__(RAGService)
+        service.model = "claude-test"
+        service.client = MagicMock()
+        service.client.messages.create = AsyncMock(
+            return_value=MagicMock(content=[MagicMock(text="Answer")])
+        )
+
+        answer = await service._call_claude_with_retry(
+            [{"role": "user", "content": "Q"}]
+        )
+
+        assert answer == "Answer"
+        kwargs = service.client.messages.create.call_args.kwargs
+        assert kwargs["extra_headers"] == PROMPT_CACHING_HEADERS
+
+    @pytest.mark.asyncio
+    async def test_chat_stream_yields_deltas_then_response(self):
+        """Streaming should forward text deltas, then the full response."""
+        from contextlib import asynccontextmanager
+        from app.schemas.chat import ChatResponse
+        from app.services.rag import RAGService
+
+        async def text_stream():
+            for text in ("Compounding ", "is ", "patience."):
+                yield text
+
+        @asynccontextmanager
+        async def fake_stream(**kwargs):
+            yield MagicMock(text_stream=text_stream())
+
+        service = RAGService.__new__(RAGService)
+        service.model = "claude-test"
+        service.response_cache = None
+        service.client = MagicMock()
+        service.client.messages.stream = fake_stream
+        service.search_service = AsyncMock()
+        service.search_service.search.return_value = ([MagicMock()], 5)
+
+        with patch.object(service, "_build_context", return_value="ctx"), patch.object(
+            service, "_build_citations", return_value=[]
+        ):
+            events = [event async for event in service.chat_stream("Q?")]
+
+        assert events[:3] == ["Compounding ", "is ", "patience."]
+        assert isinstance(events[-1], ChatResponse)
+        assert events[-1].answer == "Compounding is patience."
+
+    @pytest.mark.asyncio
+    async def test_chat_returns_semantically_cached_answer(self):
+        """A cached first-turn answer should skip search and generation."""
+        from app.schemas.chat import ChatResponse
+        from app.services.cache import SemanticResponseCache
+        from app.services.rag import RAGService
+
+        response_cache = SemanticResponseCache(cache=AsyncMock())
+        fingerprint = SemanticResponseCache.fingerprint(
+            speaker=None,
+            channel_id=None,
+            channel_slug=None,
+            date_from=None,
+            date_to=None,
+            max_context_chunks=10,
+        )
+        cached = ChatResponse(
+            answer="Cached answer",
+            citations=[],
+            conversation_id=uuid4(),
+            search_results_used=3,
+            processing_time_ms=1500,
+        )
+        await response_cache.set([0.6, 0.8], fingerprint, cached.model_dump_json())
+
+        service = RAGService.__new__(RAGService)
+        service.response_cache = response_cache
+        service.search_service = AsyncMock()
+        service.search_service.embedding_service.embed_query.return_value = [0.6, 0.8]
+
+        conversation_id = uuid4()
+        response = await service.chat("Paraphrased?", conversation_id=conversation_id)
+
+        assert response.answer == "Cached answer"
+        assert response.conversation_id == conversation_id
+        service.search_service.search.assert_not_called()
+
+    def test_citations_prefer_ingest_preview(self):
+        """Citations should reuse the stored preview, slicing only without one."""
+        from app.schemas.search import SearchResult
+        from app.services.rag import RAGService
+
+        base = dict(
+            chunk_id=uuid4(),
+            episode_id=uuid4(),
+            channel_id=uuid4(),
+            episode_title="Ep",
+            episode_url=None,
+            episode_thumbnail=None,
+            channel_name="Ch",
+            channel_slug="ch",
+            speaker="Host",
+            speakers=["Host"],
+            text="x" * 600,
+            timestamp="0:00",
+            timestamp_ms=0,
+            published_at=None,
+            score=0.9,
+        )
+        with_preview = SearchResult(**base, text_preview="stored preview")
+        without_preview = SearchResult(**base)
+
+        service = RAGService.__new__(RAGService)
+        first, second = service._build_citations([with_preview, without_preview])
+
+        assert first.text == "stored preview"
+        assert second.text == "x" * 500 + "..."
+        assert "text_preview" not in with_preview.model_dump()
+
+    def test_history_window_keeps_prefix_stable(self):
+        """History prefix should only move in fixed compaction steps."""
+        from app.services.rag import RAGService
+
+        history = [
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"m{i}"}
+            for i in range(40)
+        ]
+
+        assert RAGService._history_window(history[:20]) == history[:20]
+        # Consecutive turns past the limit replay the same first message
+        first = {
+            RAGService._history_window(history[:n])[0]["content"]
+            for n in range(21, 30, 2)
+        }
+        assert first == {"m10"}
+        assert RAGService._history_window(history[:30])[0]["content"] == "m20"
+
+    def test_history_tail_is_cache_breakpoint(self):
+        """Last replayed history message should carry the cache marker."""
+        from app.services.rag import RAGService
+
+        service = RAGService.__new__(RAGService)
+        messages = service._build_messages(
+            message="Follow-up?",
+            context="ctx",
+            conversation_history=[
+                {"role": "user", "content": "First?"},
+                {"role": "assistant", "content": "Answer."},
+            ],
+        )
+
+        assert messages[0] == {"role": "user", "content": "First?"}
+        assert messages[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert messages[1]["content"][0]["text"] == "Answer."
+
 
 class TestRateLimitCache:
     """Tests for the LRU rate limit cache."""